@@ -1,15 +1,17 @@
 from types import MappingProxyType
 from typing import Mapping, cast
 
+import numpy as np
 from manim import Mobject, RIGHT
-from manim.typing import Vector3D, Point3D
+from manim.typing import Vector3D, Point3D, MatrixMN
 
 from instant_insanity.animators.animorph import Animorph
 from instant_insanity.animators.cube_animators import CubeExplosionAnimorph
 from instant_insanity.core.cube import FacePlane, FACE_PLANE_TO_VERTEX_PATH
 from instant_insanity.core.geometry_types import PolygonKeyToVertexPathMapping, Point3D_Array
 from instant_insanity.core.puzzle import PuzzleCubeNumber, FaceLabel, INITIAL_FACE_LABEL_TO_PLANE
-from instant_insanity.core.transformation import transform_vertex_path
+from instant_insanity.core.transformation import apply_homogeneous_matrix, mk_rigid_motion_matrix, \
+    mk_translation_matrix
 from instant_insanity.mobjects.puzzle_3d import Puzzle3D, Puzzle3DPolygonName
 
 DEFAULT_MASK: Mapping[PuzzleCubeNumber, bool] = MappingProxyType(
@@ -105,18 +107,14 @@ class Puzzle3DCubeRotationAnimorph(Puzzle3DAnimorph):
             if not self.mask[cube_number]:
                 continue
             cube_centre: Point3D = puzzle3d.mk_cube_centre(cube_number, puzzle_centre, cube_delta)
-            # rotate each face of the cube
+            # translate the cube back to the origin, rotate it, and then translate it back to the cube centre,
+            # as a single matrix applied to the vertex paths of all its faces at once
+            motion: MatrixMN = mk_rigid_motion_matrix(rotation_alpha, cube_centre) @ mk_translation_matrix(-cube_centre)
             face_label: FaceLabel
-            for face_label in FaceLabel:
-                # get the initial vertex paths for the face
-                polygon_name: Puzzle3DPolygonName = (cube_number, face_label)
-                model_path: Point3D_Array = key_to_model_path[polygon_name]
-                # translate the vertex paths back to the origin
-                model_path = model_path - cube_centre
-                # rotate the vertex paths and then translate back to cube centre
-                model_path = transform_vertex_path(rotation_alpha, cube_centre, model_path)
-                # save the rotated face
-                key_to_model_path[polygon_name] = model_path
+            polygon_names: list[Puzzle3DPolygonName] = [(cube_number, face_label) for face_label in FaceLabel]
+            model_paths: np.ndarray = np.stack([key_to_model_path[polygon_name] for polygon_name in polygon_names])
+            # save the rotated faces
+            key_to_model_path.update(zip(polygon_names, apply_homogeneous_matrix(motion, model_paths)))
 
         # set the new vertex paths
         # this triggers an update to the polygon depth-sort order
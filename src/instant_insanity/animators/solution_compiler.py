@@ -0,0 +1,256 @@
+"""
+This module compiles a solution grid into the cube rotations that animate a Puzzle3D into the solution.
+
+A grid only says which axis of each cube is on the front and back faces and which is on the top and bottom faces.
+The orientations of the cubes that show it are the solving orientation combinations found by BruteForceSolver
+whose front and top axes match the grid. The rows may match either way round, since a quarter turn
+of the whole stack about the RIGHT axis swaps them, so every grid is shown by at least 8 combinations.
+
+A Puzzle3DCubeRotationAnimorph turns the cubes selected by its mask about one axis, so a schedule of
+quarter-turn morphs is a sequence of axes, and each cube makes the quarter turns of some subsequence of it.
+After a sequence of axes, each cube can be in the orientations reached by the subsequences,
+which are kept as a bit set of orientation indices. A breadth-first search over sequences of axes
+finds the shortest one after which some target combination is reachable by every cube at once,
+so the solution is animated with the fewest morphs. The orientation tables of cube_rotations
+make each step of the search a few table lookups.
+"""
+from collections.abc import Mapping, Sequence
+from dataclasses import dataclass
+from itertools import combinations
+from typing import cast
+
+import numpy as np
+from manim import PI
+from manim.typing import Vector3D
+
+from instant_insanity.animators.puzzle_3d_animators import Puzzle3DCubeRotationAnimorph
+from instant_insanity.core.cube_rotations import IDENTITY_INDEX, QUARTER_TURN_AXES, QUARTER_TURN_TABLE
+from instant_insanity.core.puzzle import Puzzle, PuzzleCubeNumber, WINNING_MOVES_PUZZLE
+from instant_insanity.mobjects.puzzle_3d import Puzzle3D
+from instant_insanity.solvers.bitmask_solver import AXIS_LABELS
+from instant_insanity.solvers.brute_force_solver import BruteForceSolver, ORIENTATION_AXES
+from instant_insanity.solvers.graph_solver import Grid, GridColumn, GridRow, GridValue, GRID_ROWS, GRID_COLUMNS, \
+    GraphSolver
+
+# the orientation reached by each quarter turn from each orientation
+_TURNS: list[list[int]] = QUARTER_TURN_TABLE.tolist()
+
+# the orientation index of each cube, in PuzzleCubeNumber order
+type OrientationCombination = tuple[int, ...]
+
+# the orientations that a cube can reach, as a bit set of orientation indices
+type ReachableSet = int
+
+
+@dataclass(frozen=True)
+class RotationSegment:
+    """
+    A quarter turn of some of the cubes about one axis, which is animated by one morph.
+
+    Attributes:
+        axis: the axis of the quarter turn, a Manim direction constant.
+        mask: dict of cube number to flag (True to rotate).
+    """
+    axis: Vector3D
+    mask: Mapping[PuzzleCubeNumber, bool]
+
+
+@dataclass(frozen=True)
+class CompiledSolution:
+    """
+    The rotations that take the cubes from their current orientations into a solution.
+
+    Attributes:
+        target_orientations: the orientation index of each cube in the solution, in PuzzleCubeNumber order.
+        segments: the quarter turns in the order they are applied.
+    """
+    target_orientations: OrientationCombination
+    segments: list[RotationSegment]
+
+
+def find_solution_orientations(puzzle: Puzzle, grid: Grid) -> list[OrientationCombination]:
+    """
+    Finds the orientation combinations that show a solution grid.
+
+    Args:
+        puzzle: the puzzle.
+        grid: a solution grid of the puzzle.
+
+    Returns:
+        the combinations in increasing order.
+
+    Raises:
+        ValueError: if the grid is not a complete solution or the puzzle does not have four colours.
+    """
+    axis_indices: list[list[int]] = []
+    grid_row: GridRow
+    for grid_row in GRID_ROWS:
+        row_indices: list[int] = []
+        grid_column: GridColumn
+        for grid_column in GRID_COLUMNS:
+            axis_label: GridValue = grid[(grid_row, grid_column)]
+            if axis_label is None:
+                raise ValueError(f'grid is not a complete solution: {grid}')
+            row_indices.append(AXIS_LABELS.index(axis_label))
+        axis_indices.append(row_indices)
+    rows: np.ndarray = np.array(axis_indices)
+    orientations: np.ndarray = BruteForceSolver(puzzle).find_orientations(reduced=False)
+    # the front and top axes of each cube of each combination, with shape (n, 2, 4)
+    axes: np.ndarray = np.swapaxes(ORIENTATION_AXES[orientations], 1, 2)
+    is_match: np.ndarray = np.all(axes == rows, axis=(1, 2)) | np.all(axes == rows[::-1], axis=(1, 2))
+    return sorted(tuple(int(index) for index in combination) for combination in orientations[is_match])
+
+
+def turn_reachable_set(reachable: ReachableSet, turn: int) -> ReachableSet:
+    """
+    Adds the orientations reached by one more quarter turn to a reachable set.
+
+    Args:
+        reachable: the orientations that a cube can reach.
+        turn: the index of the quarter turn in QUARTER_TURN_AXES.
+
+    Returns:
+        the orientations that the cube can reach by making the quarter turn or not.
+    """
+    turned: ReachableSet = reachable
+    orientation_index: int
+    for orientation_index, turns in enumerate(_TURNS):
+        if reachable >> orientation_index & 1:
+            turned |= 1 << turns[turn]
+    return turned
+
+
+def find_shortest_schedule(start_orientations: OrientationCombination,
+                           targets: Sequence[OrientationCombination]) -> tuple[list[int], OrientationCombination]:
+    """
+    Finds the shortest sequence of quarter turns after which every cube can be in a target combination.
+
+    Args:
+        start_orientations: the orientation index of each cube before the turns.
+        targets: the target combinations.
+
+    Returns:
+        the indices in QUARTER_TURN_AXES of the turns, and the first target combination that they reach.
+
+    Raises:
+        ValueError: if there are no targets.
+    """
+    if not targets:
+        raise ValueError('Expected at least one target orientation combination')
+
+    start: tuple[ReachableSet, ...] = tuple(1 << orientation_index for orientation_index in start_orientations)
+    visited: set[tuple[ReachableSet, ...]] = {start}
+    frontier: list[tuple[tuple[ReachableSet, ...], list[int]]] = [(start, [])]
+    while True:
+        state: tuple[ReachableSet, ...]
+        turns: list[int]
+        for state, turns in frontier:
+            target: OrientationCombination
+            for target in targets:
+                if all(reachable >> orientation_index & 1 for reachable, orientation_index in zip(state, target)):
+                    return turns, target
+
+        next_frontier: list[tuple[tuple[ReachableSet, ...], list[int]]] = []
+        for state, turns in frontier:
+            turn: int
+            for turn in range(len(QUARTER_TURN_AXES)):
+                next_state: tuple[ReachableSet, ...] = tuple(turn_reachable_set(reachable, turn)
+                                                             for reachable in state)
+                if next_state not in visited:
+                    visited.add(next_state)
+                    next_frontier.append((next_state, turns + [turn]))
+        frontier = next_frontier
+
+
+def find_subsequence(turns: list[int], start_index: int, target_index: int) -> tuple[int, ...]:
+    """
+    Finds the fewest of a sequence of quarter turns that take a cube from one orientation to another.
+
+    Args:
+        turns: the indices in QUARTER_TURN_AXES of the turns.
+        start_index: the index of the orientation before the turns.
+        target_index: the index of the orientation after the turns.
+
+    Returns:
+        the positions in the sequence of the turns to make.
+
+    Raises:
+        ValueError: if no subsequence of the turns reaches the target.
+    """
+    size: int
+    for size in range(len(turns) + 1):
+        positions: tuple[int, ...]
+        for positions in combinations(range(len(turns)), size):
+            orientation_index: int = start_index
+            position: int
+            for position in positions:
+                orientation_index = _TURNS[orientation_index][turns[position]]
+            if orientation_index == target_index:
+                return positions
+    raise ValueError(f'No subsequence of {turns} turns orientation {start_index} to {target_index}')
+
+
+def compile_solution(puzzle: Puzzle, grid: Grid,
+                     start_orientations: Sequence[int] | None = None) -> CompiledSolution:
+    """
+    Compiles a solution grid into the fewest quarter-turn morphs that rotate the cubes into it.
+
+    Args:
+        puzzle: the puzzle.
+        grid: a solution grid of the puzzle.
+        start_orientations: the orientation index of each cube in PuzzleCubeNumber order,
+            or None if every cube is in its initial position.
+
+    Returns:
+        the target orientations and the quarter turns, each of which turns the cubes selected by its mask.
+
+    Raises:
+        ValueError: if the puzzle does not have four colours or the grid is not a solution of it.
+    """
+    start: OrientationCombination = tuple(start_orientations) if start_orientations is not None \
+        else (IDENTITY_INDEX,) * len(PuzzleCubeNumber)
+    if len(start) != len(PuzzleCubeNumber):
+        raise ValueError(f'Expected {len(PuzzleCubeNumber)} start orientations, got: {len(start)}')
+    targets: list[OrientationCombination] = find_solution_orientations(puzzle, grid)
+    if not targets:
+        raise ValueError(f'Expected a solution of the puzzle, got: {grid}')
+
+    turns: list[int]
+    target: OrientationCombination
+    turns, target = find_shortest_schedule(start, targets)
+    cube_positions: list[tuple[int, ...]] = [find_subsequence(turns, start_index, target_index)
+                                             for start_index, target_index in zip(start, target)]
+    segments: list[RotationSegment] = [
+        RotationSegment(axis=QUARTER_TURN_AXES[turn],
+                        mask={cube_number: position in positions
+                              for cube_number, positions in zip(PuzzleCubeNumber, cube_positions)})
+        for position, turn in enumerate(turns)
+    ]
+    return CompiledSolution(target_orientations=target, segments=segments)
+
+
+def mk_rotation_animorphs(puzzle3d: Puzzle3D, segments: Sequence[RotationSegment]) -> list[Puzzle3DCubeRotationAnimorph]:
+    """
+    Makes the morphs that animate quarter turns of a Puzzle3D.
+
+    Args:
+        puzzle3d: the Puzzle3D.
+        segments: the quarter turns.
+
+    Returns:
+        one morph per quarter turn, to be played and checkpointed in order.
+    """
+    segment: RotationSegment
+    return [Puzzle3DCubeRotationAnimorph(puzzle3d, cast(Vector3D, segment.axis * PI / 2.0), segment.mask)
+            for segment in segments]
+
+
+if __name__ == "__main__":
+    solver: GraphSolver = GraphSolver(WINNING_MOVES_PUZZLE)
+    solver.solve()
+    compiled_solution: CompiledSolution = compile_solution(WINNING_MOVES_PUZZLE, solver.solutions[0])
+    print(f'Target orientations: {compiled_solution.target_orientations}')
+    rotation_segment: RotationSegment
+    for rotation_segment in compiled_solution.segments:
+        cubes: list[int] = [cube_number.value for cube_number, flag in rotation_segment.mask.items() if flag]
+        print(f'Turn cubes {cubes} about {rotation_segment.axis}')
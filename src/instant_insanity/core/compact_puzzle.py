@@ -0,0 +1,256 @@
+"""
+This module contains a compact representation of a puzzle for code that handles many puzzles at once.
+
+A Puzzle keeps a PuzzleCube for each cube, and each PuzzleCube keeps a dict that maps face labels to colours.
+A CompactPuzzle keeps a single bytes object instead, holding the colour code of each face,
+cube by cube, in the face label order x, x', y, y', z, z' of a PuzzleCubeSpec.
+The colour code of a face is the index of its colour in FaceColour.
+The bytes object doubles as the key for equality and hashing, so both are as cheap as they are for bytes,
+and the colour codes are exposed as a read-only uint8 array of shape (4, 6) that shares its memory.
+
+Puzzle specifications are converted to colour codes with a 256-entry lookup table that maps
+every byte to a colour code, so a whole batch of specifications is encoded with one NumPy indexing operation
+and no per-character enum lookups.
+The conversions to and from Puzzle are lossless, except that the colour initials are written in upper case.
+"""
+from collections.abc import Sequence
+
+import numpy as np
+
+from instant_insanity.core.puzzle import FaceColour, FaceLabel, Puzzle, PuzzleCubeNumber, PuzzleSpec, \
+    WINNING_MOVES_PUZZLE_SPEC
+
+# the number of cubes in a puzzle
+N_CUBES: int = len(PuzzleCubeNumber)
+
+# the number of faces of a cube
+N_FACES: int = len(FaceLabel)
+
+# the number of colours
+N_COLOURS: int = len(FaceColour)
+
+# the code of an invalid colour initial
+INVALID_COLOUR_CODE: int = 255
+
+# the upper case initial of each colour, indexed by colour code
+COLOUR_INITIALS: str = ''.join(colour.name[0] for colour in FaceColour)
+
+
+def mk_colour_code_table() -> np.ndarray:
+    """
+    Makes the table that maps each byte to a colour code.
+
+    Returns:
+        the colour code of each upper and lower case colour initial, and INVALID_COLOUR_CODE for any other byte.
+    """
+    table: np.ndarray = np.full(256, INVALID_COLOUR_CODE, dtype=np.uint8)
+    colour_code: int
+    initial: str
+    for colour_code, initial in enumerate(COLOUR_INITIALS):
+        table[ord(initial.upper())] = colour_code
+        table[ord(initial.lower())] = colour_code
+    return table
+
+
+COLOUR_CODE_TABLE: np.ndarray = mk_colour_code_table()
+
+
+def encode_puzzle_specs(puzzle_specs: Sequence[PuzzleSpec]) -> np.ndarray:
+    """
+    Encodes puzzle specifications as colour codes.
+
+    Args:
+        puzzle_specs: the puzzle specifications.
+
+    Returns:
+        the colour code of each face of each cube of each puzzle, with shape (n, 4, 6).
+
+    Raises:
+        ValueError: if any specification is not a list of 4 6-letter strings of valid face colour initials.
+    """
+    puzzle_spec: PuzzleSpec
+    for puzzle_spec in puzzle_specs:
+        if len(puzzle_spec) != N_CUBES:
+            raise ValueError(f'Expected {N_CUBES} cubes, got: {len(puzzle_spec)}')
+        cube_spec: str
+        for cube_spec in puzzle_spec:
+            if len(cube_spec) != N_FACES:
+                raise ValueError(f'Expected string of length {N_FACES}, got length {len(cube_spec)}')
+
+    text: str = ''.join(''.join(puzzle_spec) for puzzle_spec in puzzle_specs)
+    try:
+        data: bytes = text.encode('ascii')
+    except UnicodeEncodeError as error:
+        raise ValueError(f'Expected face colour initials, got: {text!r}') from error
+
+    colour_codes: np.ndarray = COLOUR_CODE_TABLE[np.frombuffer(data, dtype=np.uint8)]
+    if np.any(colour_codes == INVALID_COLOUR_CODE):
+        raise ValueError(f'Expected face colour initials, got: {text!r}')
+    return colour_codes.reshape(len(puzzle_specs), N_CUBES, N_FACES)
+
+
+class CompactPuzzle:
+    """
+    An Instant Insanity puzzle stored as the colour codes of its faces.
+
+    Attributes:
+        codes: the colour code of each face, cube by cube, in face label order, one byte per face.
+    """
+    __slots__ = ('codes',)
+    codes: bytes
+
+    def __init__(self, codes: bytes) -> None:
+        """
+        Args:
+            codes: the colour code of each face, cube by cube, in face label order, one byte per face.
+
+        Raises:
+            ValueError: if there are not 24 codes or any code is not a colour code.
+        """
+        if len(codes) != N_CUBES * N_FACES:
+            raise ValueError(f'Expected {N_CUBES * N_FACES} colour codes, got: {len(codes)}')
+        if max(codes) >= N_COLOURS:
+            raise ValueError(f'Expected colour codes less than {N_COLOURS}, got: {list(codes)}')
+        self.codes = bytes(codes)
+
+    @staticmethod
+    def from_spec(puzzle_spec: PuzzleSpec) -> 'CompactPuzzle':
+        """
+        Creates a compact puzzle from a specification.
+
+        Args:
+            puzzle_spec: the puzzle specification.
+
+        Returns:
+            the compact puzzle.
+
+        Raises:
+            ValueError: if the specification is not a list of 4 6-letter strings of valid face colour initials.
+        """
+        return CompactPuzzle(encode_puzzle_specs([puzzle_spec]).tobytes())
+
+    @staticmethod
+    def from_puzzle(puzzle: Puzzle) -> 'CompactPuzzle':
+        """
+        Creates a compact puzzle from a puzzle.
+
+        Args:
+            puzzle: the puzzle.
+
+        Returns:
+            the compact puzzle, which has the same colour on each face.
+        """
+        colour_codes: dict[FaceColour, int] = {colour: code for code, colour in enumerate(FaceColour)}
+        return CompactPuzzle(bytes(colour_codes[cube.face_label_to_colour[face_label]]
+                                   for cube in puzzle.number_to_cube.values()
+                                   for face_label in FaceLabel))
+
+    @property
+    def colour_codes(self) -> np.ndarray:
+        """
+        Gets the colour codes as an array.
+
+        Returns:
+            a read-only view of the colour codes, with shape (4, 6).
+        """
+        return np.frombuffer(self.codes, dtype=np.uint8).reshape(N_CUBES, N_FACES)
+
+    def to_spec(self) -> PuzzleSpec:
+        """
+        Converts the compact puzzle to a specification.
+
+        Returns:
+            the puzzle specification, written with upper case colour initials.
+        """
+        initials: str = ''.join(COLOUR_INITIALS[code] for code in self.codes)
+        return [initials[start:start + N_FACES] for start in range(0, len(initials), N_FACES)]
+
+    def to_puzzle(self) -> Puzzle:
+        """
+        Converts the compact puzzle to a puzzle.
+
+        Returns:
+            the puzzle, which has the same colour on each face.
+        """
+        return Puzzle(self.to_spec())
+
+    def get_colours(self) -> list[FaceColour]:
+        """
+        Gets the colours that appear on the puzzle.
+
+        Returns:
+            the colours in enum order.
+        """
+        colours: list[FaceColour] = list(FaceColour)
+        return [colours[code] for code in sorted(set(self.codes))]
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, CompactPuzzle):
+            return NotImplemented
+        return self.codes == other.codes
+
+    def __hash__(self) -> int:
+        return hash(self.codes)
+
+    def __repr__(self) -> str:
+        return f'CompactPuzzle.from_spec({self.to_spec()!r})'
+
+
+def mk_compact_puzzles(colour_codes: np.ndarray) -> list[CompactPuzzle]:
+    """
+    Makes compact puzzles from an array of colour codes.
+
+    Args:
+        colour_codes: the colour codes of the puzzles, as a uint8 array with shape (n, 4, 6).
+
+    Returns:
+        the compact puzzles.
+
+    Raises:
+        ValueError: if the array does not have the expected shape or holds a code that is not a colour code.
+    """
+    if colour_codes.dtype != np.uint8 or colour_codes.shape[1:] != (N_CUBES, N_FACES):
+        raise ValueError(f'Expected colour codes with shape (n, {N_CUBES}, {N_FACES})')
+    if np.any(colour_codes >= N_COLOURS):
+        raise ValueError(f'Expected colour codes less than {N_COLOURS}')
+    data: bytes = np.ascontiguousarray(colour_codes).tobytes()
+    size: int = N_CUBES * N_FACES
+    return [_mk_unchecked(data[start:start + size]) for start in range(0, len(data), size)]
+
+
+def _mk_unchecked(codes: bytes) -> CompactPuzzle:
+    """
+    Makes a compact puzzle from colour codes that are already known to be valid, skipping the checks.
+
+    Args:
+        codes: the 24 colour codes.
+
+    Returns:
+        the compact puzzle.
+    """
+    puzzle: CompactPuzzle = object.__new__(CompactPuzzle)
+    puzzle.codes = codes
+    return puzzle
+
+
+def load_compact_puzzles(puzzle_specs: Sequence[PuzzleSpec]) -> list[CompactPuzzle]:
+    """
+    Loads many puzzle specifications as compact puzzles.
+
+    Args:
+        puzzle_specs: the puzzle specifications.
+
+    Returns:
+        the compact puzzles.
+
+    Raises:
+        ValueError: if any specification is not a list of 4 6-letter strings of valid face colour initials.
+    """
+    return mk_compact_puzzles(encode_puzzle_specs(puzzle_specs))
+
+
+if __name__ == "__main__":
+    compact_puzzle: CompactPuzzle = CompactPuzzle.from_spec(WINNING_MOVES_PUZZLE_SPEC)
+    print(compact_puzzle)
+    print(compact_puzzle.colour_codes)
+    print(f'The compact puzzle holds {len(compact_puzzle.codes)} bytes of colour codes.')
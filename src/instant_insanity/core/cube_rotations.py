@@ -4,6 +4,7 @@ Given any initial cube orientation and any final cube orientation,
 we define a canonical rotation matrix that maps the initial orientation to the final orientation.
 """
 
+from collections.abc import Sequence
 from dataclasses import dataclass
 
 import numpy as np
@@ -12,7 +13,7 @@ from manim.typing import Vector3D
 from scipy.spatial.transform import Rotation
 
 from instant_insanity.core.cube import FacePlane
-from instant_insanity.core.puzzle import FaceLabel, DEFAULT_EDGE_COLOUR
+from instant_insanity.core.puzzle import FaceLabel, DEFAULT_EDGE_COLOUR, INITIAL_FACE_LABEL_TO_PLANE
 from instant_insanity.mobjects.labelled_edge import DEFAULT_EDGE_FONT, DEFAULT_EDGE_FONT_COLOR, DEFAULT_EDGE_FONT_SIZE
 
 type PlaneToLabelMapping = dict[FacePlane, FaceLabel]
@@ -130,6 +131,59 @@ def make_visible_cube_texts_from_mapping(mapping: PlaneToLabelMapping) -> Visibl
         top=mapping[FacePlane.TOP].value,
     )
 
+# the face planes in FacePlane order, which is the order of the entries of a plane permutation
+FACE_PLANES: list[FacePlane] = list(FacePlane)
+
+# the position of each face plane in FACE_PLANES
+PLANE_INDEX: dict[FacePlane, int] = {plane: index for index, plane in enumerate(FACE_PLANES)}
+
+# a rotation maps each face plane to the plane whose label moves onto it
+type PlaneSources = dict[FacePlane, FacePlane]
+
+# the plane sources of a 90-degree counter-clockwise rotation around each axis
+DOWN_SOURCES: PlaneSources = {
+    FacePlane.FRONT: FacePlane.RIGHT,
+    FacePlane.BACK: FacePlane.LEFT,
+    FacePlane.RIGHT: FacePlane.BACK,
+    FacePlane.LEFT: FacePlane.FRONT,
+    FacePlane.TOP: FacePlane.TOP,
+    FacePlane.BOTTOM: FacePlane.BOTTOM,
+}
+RIGHT_SOURCES: PlaneSources = {
+    FacePlane.FRONT: FacePlane.TOP,
+    FacePlane.BACK: FacePlane.BOTTOM,
+    FacePlane.RIGHT: FacePlane.RIGHT,
+    FacePlane.LEFT: FacePlane.LEFT,
+    FacePlane.TOP: FacePlane.BACK,
+    FacePlane.BOTTOM: FacePlane.FRONT,
+}
+UP_SOURCES: PlaneSources = {plane: source for source, plane in DOWN_SOURCES.items()}
+LEFT_SOURCES: PlaneSources = {plane: source for source, plane in RIGHT_SOURCES.items()}
+FRONT_SOURCES: PlaneSources = {
+    FacePlane.FRONT: FacePlane.FRONT,
+    FacePlane.BACK: FacePlane.BACK,
+    FacePlane.RIGHT: FacePlane.BOTTOM,
+    FacePlane.LEFT: FacePlane.TOP,
+    FacePlane.TOP: FacePlane.RIGHT,
+    FacePlane.BOTTOM: FacePlane.LEFT,
+}
+BACK_SOURCES: PlaneSources = {plane: source for source, plane in FRONT_SOURCES.items()}
+
+
+def apply_plane_sources(sources: PlaneSources, before_mapping: PlaneToLabelMapping) -> PlaneToLabelMapping:
+    """
+    Applies a rotation given by its plane sources to a cube labelling.
+
+    Args:
+        sources: the plane whose label moves onto each plane.
+        before_mapping: the face plane to label mapping before the rotation
+
+    Returns:
+        the face plane to label mapping after the rotation
+    """
+    return {plane: before_mapping[source] for plane, source in sources.items()}
+
+
 def rotate_down(before_mapping: PlaneToLabelMapping) -> PlaneToLabelMapping:
     """
     The function applies a 90-degree counter-clockwise rotation around the DOWN axis
@@ -142,15 +196,7 @@ def rotate_down(before_mapping: PlaneToLabelMapping) -> PlaneToLabelMapping:
         the face plane to label mapping after the rotation
 
     """
-    after_mapping: PlaneToLabelMapping = dict()
-    after_mapping[FacePlane.FRONT] = before_mapping[FacePlane.RIGHT]
-    after_mapping[FacePlane.BACK] = before_mapping[FacePlane.LEFT]
-    after_mapping[FacePlane.RIGHT] = before_mapping[FacePlane.BACK]
-    after_mapping[FacePlane.LEFT] = before_mapping[FacePlane.FRONT]
-    after_mapping[FacePlane.TOP] = before_mapping[FacePlane.TOP]
-    after_mapping[FacePlane.BOTTOM] = before_mapping[FacePlane.BOTTOM]
-
-    return after_mapping
+    return apply_plane_sources(DOWN_SOURCES, before_mapping)
 
 def rotate_right(before_mapping: PlaneToLabelMapping) -> PlaneToLabelMapping:
     """
@@ -164,15 +210,7 @@ def rotate_right(before_mapping: PlaneToLabelMapping) -> PlaneToLabelMapping:
         the face plane to label mapping after the rotation
 
     """
-    after_mapping: PlaneToLabelMapping = dict()
-    after_mapping[FacePlane.FRONT] = before_mapping[FacePlane.TOP]
-    after_mapping[FacePlane.BACK] = before_mapping[FacePlane.BOTTOM]
-    after_mapping[FacePlane.RIGHT] = before_mapping[FacePlane.RIGHT]
-    after_mapping[FacePlane.LEFT] = before_mapping[FacePlane.LEFT]
-    after_mapping[FacePlane.TOP] = before_mapping[FacePlane.BACK]
-    after_mapping[FacePlane.BOTTOM] = before_mapping[FacePlane.FRONT]
-
-    return after_mapping
+    return apply_plane_sources(RIGHT_SOURCES, before_mapping)
 
 def rotate_up(before_mapping: PlaneToLabelMapping) -> PlaneToLabelMapping:
     """
@@ -187,15 +225,7 @@ def rotate_up(before_mapping: PlaneToLabelMapping) -> PlaneToLabelMapping:
         the face plane to label mapping after the rotation
 
     """
-    after_mapping: PlaneToLabelMapping = dict()
-    after_mapping[FacePlane.FRONT] = before_mapping[FacePlane.LEFT]
-    after_mapping[FacePlane.BACK] = before_mapping[FacePlane.RIGHT]
-    after_mapping[FacePlane.RIGHT] = before_mapping[FacePlane.FRONT]
-    after_mapping[FacePlane.LEFT] = before_mapping[FacePlane.BACK]
-    after_mapping[FacePlane.TOP] = before_mapping[FacePlane.TOP]
-    after_mapping[FacePlane.BOTTOM] = before_mapping[FacePlane.BOTTOM]
-
-    return after_mapping
+    return apply_plane_sources(UP_SOURCES, before_mapping)
 
 def rotate_left(before_mapping: PlaneToLabelMapping) -> PlaneToLabelMapping:
     """
@@ -210,15 +240,7 @@ def rotate_left(before_mapping: PlaneToLabelMapping) -> PlaneToLabelMapping:
         the face plane to label mapping after the rotation
 
     """
-    after_mapping: PlaneToLabelMapping = dict()
-    after_mapping[FacePlane.FRONT] = before_mapping[FacePlane.BOTTOM]
-    after_mapping[FacePlane.BACK] = before_mapping[FacePlane.TOP]
-    after_mapping[FacePlane.RIGHT] = before_mapping[FacePlane.RIGHT]
-    after_mapping[FacePlane.LEFT] = before_mapping[FacePlane.LEFT]
-    after_mapping[FacePlane.TOP] = before_mapping[FacePlane.FRONT]
-    after_mapping[FacePlane.BOTTOM] = before_mapping[FacePlane.BACK]
-
-    return after_mapping
+    return apply_plane_sources(LEFT_SOURCES, before_mapping)
 
 def rotate_front(before_mapping: PlaneToLabelMapping) -> PlaneToLabelMapping:
     """
@@ -232,15 +254,7 @@ def rotate_front(before_mapping: PlaneToLabelMapping) -> PlaneToLabelMapping:
         the face plane to label mapping after the rotation
 
     """
-    after_mapping: PlaneToLabelMapping = dict()
-    after_mapping[FacePlane.FRONT] = before_mapping[FacePlane.FRONT]
-    after_mapping[FacePlane.BACK] = before_mapping[FacePlane.BACK]
-    after_mapping[FacePlane.RIGHT] = before_mapping[FacePlane.BOTTOM]
-    after_mapping[FacePlane.LEFT] = before_mapping[FacePlane.TOP]
-    after_mapping[FacePlane.TOP] = before_mapping[FacePlane.RIGHT]
-    after_mapping[FacePlane.BOTTOM] = before_mapping[FacePlane.LEFT]
-
-    return after_mapping
+    return apply_plane_sources(FRONT_SOURCES, before_mapping)
 
 def rotate_back(before_mapping: PlaneToLabelMapping) -> PlaneToLabelMapping:
     """
@@ -255,15 +269,59 @@ def rotate_back(before_mapping: PlaneToLabelMapping) -> PlaneToLabelMapping:
         the face plane to label mapping after the rotation
 
     """
-    after_mapping: PlaneToLabelMapping = dict()
-    after_mapping[FacePlane.FRONT] = before_mapping[FacePlane.FRONT]
-    after_mapping[FacePlane.BACK] = before_mapping[FacePlane.BACK]
-    after_mapping[FacePlane.RIGHT] = before_mapping[FacePlane.TOP]
-    after_mapping[FacePlane.LEFT] = before_mapping[FacePlane.BOTTOM]
-    after_mapping[FacePlane.TOP] = before_mapping[FacePlane.LEFT]
-    after_mapping[FacePlane.BOTTOM] = before_mapping[FacePlane.RIGHT]
+    return apply_plane_sources(BACK_SOURCES, before_mapping)
+
+# a quarter turn is identified by the Manim direction constant of its axis, written as a tuple
+type AxisKey = tuple[float, float, float]
+
+
+def mk_axis_key(vector: Vector3D) -> AxisKey:
+    """
+    Makes the key of a rotation axis.
+
+    Args:
+        vector: the axis of rotation.
+
+    Returns:
+        the components of the vector as a tuple of floats.
+    """
+    x: float
+    y: float
+    z: float
+    x, y, z = (float(component) for component in vector)
+    return x, y, z
+
+
+# the axes of the quarter turns, which generate every rotation of the cube
+QUARTER_TURN_AXES: list[Vector3D] = [LEFT, RIGHT, UP, DOWN, OUT, IN]
+
+# the plane sources of the quarter turn around each axis, listed in the same order as QUARTER_TURN_AXES
+QUARTER_TURN_SOURCES: list[PlaneSources] = [
+    LEFT_SOURCES, RIGHT_SOURCES, UP_SOURCES, DOWN_SOURCES, FRONT_SOURCES, BACK_SOURCES
+]
+
+# the index of each quarter turn in QUARTER_TURN_AXES, keyed by its axis
+QUARTER_TURN_INDEX: dict[AxisKey, int] = {mk_axis_key(axis): index for index, axis in enumerate(QUARTER_TURN_AXES)}
+
+
+def get_quarter_turn_index(vector: Vector3D) -> int:
+    """
+    Gets the index of the quarter turn around an axis.
+
+    Args:
+        vector: the axis of rotation, a Manim direction constant
+
+    Returns:
+        the index of the quarter turn in QUARTER_TURN_AXES.
+
+    Raises:
+        ValueError: if the vector is not one of the allowed Manim direction constants
+    """
+    try:
+        return QUARTER_TURN_INDEX[mk_axis_key(vector)]
+    except (KeyError, TypeError, ValueError) as error:
+        raise ValueError(f'Invalid vector: {vector}') from error
 
-    return after_mapping
 
 def rotate_by_vector(vector: Vector3D, before_mapping: PlaneToLabelMapping) -> PlaneToLabelMapping:
     """
@@ -282,19 +340,7 @@ def rotate_by_vector(vector: Vector3D, before_mapping: PlaneToLabelMapping) -> P
     Raises:
         ValueError: if the vector is not one of the allowed Manim direction constants
     """
-    if np.array_equal(vector, LEFT):
-        return rotate_left(before_mapping)
-    if np.array_equal(vector, RIGHT):
-        return rotate_right(before_mapping)
-    if np.array_equal(vector, UP):
-        return rotate_up(before_mapping)
-    if np.array_equal(vector, DOWN):
-        return rotate_down(before_mapping)
-    if np.array_equal(vector, OUT):
-        return rotate_front(before_mapping)
-    if np.array_equal(vector, IN):
-        return rotate_back(before_mapping)
-    raise ValueError(f'Invalid vector: {vector}')
+    return apply_plane_sources(QUARTER_TURN_SOURCES[get_quarter_turn_index(vector)], before_mapping)
 
 
 def get_opposite_face_label(face_label: FaceLabel) -> FaceLabel:
@@ -325,6 +371,8 @@ class CubeOrientation:
     def __post_init__(self):
         if self.front == get_opposite_face_label(self.top):
             raise ValueError(f'Expected adjacent faces but got opposites {self.front} and {self.top}')
+        if self.front == self.top:
+            raise ValueError(f'Expected adjacent faces but got the same face {self.front} twice')
 
     def get_face_plane_to_label_mapping(self) -> dict[FacePlane, FaceLabel]:
         """
@@ -347,14 +395,247 @@ CUBE_ORIENTATIONS: list[CubeOrientation] = [
     CubeOrientation(front, top)
     for front in FaceLabel
     for top in FaceLabel
-    if front != get_opposite_face_label(top)
+    if front != top and front != get_opposite_face_label(top)
+]
+
+def mk_orientation_mappings() -> list[PlaneToLabelMapping]:
+    """
+    Makes the face plane to label mapping of every cube orientation.
+
+    The mappings are found by applying quarter turns about the RIGHT and DOWN axes to the
+    initial mapping until no new mapping appears. These two rotations generate every rotation of the cube.
+
+    Returns:
+        the mappings listed in the same order as CUBE_ORIENTATIONS.
+    """
+    front_top_to_mapping: dict[tuple[FaceLabel, FaceLabel], PlaneToLabelMapping] = {}
+    pending: list[PlaneToLabelMapping] = [INITIAL_PLANE_TO_LABEL_MAPPING]
+    while pending:
+        mapping: PlaneToLabelMapping = pending.pop()
+        front_top: tuple[FaceLabel, FaceLabel] = (mapping[FacePlane.FRONT], mapping[FacePlane.TOP])
+        if front_top in front_top_to_mapping:
+            continue
+        front_top_to_mapping[front_top] = mapping
+        pending.append(rotate_right(mapping))
+        pending.append(rotate_down(mapping))
+
+    orientation: CubeOrientation
+    return [front_top_to_mapping[(orientation.front, orientation.top)] for orientation in CUBE_ORIENTATIONS]
+
+# the face plane to label mapping of each cube orientation, listed in the same order as CUBE_ORIENTATIONS
+ORIENTATION_MAPPINGS: list[PlaneToLabelMapping] = mk_orientation_mappings()
+
+# the index of each orientation in CUBE_ORIENTATIONS, keyed by its front and top labels
+ORIENTATION_INDEX: dict[tuple[FaceLabel, FaceLabel], int] = {
+    (orientation.front, orientation.top): index for index, orientation in enumerate(CUBE_ORIENTATIONS)
+}
+
+# the index of the orientation of a cube in its initial position
+IDENTITY_INDEX: int = ORIENTATION_INDEX[(FaceLabel.X, FaceLabel.Z)]
+
+def get_orientation_index(mapping: PlaneToLabelMapping) -> int:
+    """
+    Gets the index of the orientation of a cube labelling.
+
+    Args:
+        mapping: the face plane to label mapping of the cube.
+
+    Returns:
+        the index of its orientation in CUBE_ORIENTATIONS.
+    """
+    return ORIENTATION_INDEX[(mapping[FacePlane.FRONT], mapping[FacePlane.TOP])]
+
+def mk_orientation_permutations() -> np.ndarray:
+    """
+    Makes the plane permutation of every cube orientation.
+
+    The rotation that takes a cube from its initial position to an orientation moves the label
+    of one plane onto each plane. Its plane permutation lists the index in FACE_PLANES of that plane
+    for each plane in FACE_PLANES order.
+
+    Returns:
+        an int8 array with shape (24, 6), listed in the same order as CUBE_ORIENTATIONS.
+    """
+    mapping: PlaneToLabelMapping
+    return np.array([[PLANE_INDEX[INITIAL_FACE_LABEL_TO_PLANE[mapping[plane]]] for plane in FACE_PLANES]
+                     for mapping in ORIENTATION_MAPPINGS], dtype=np.int8)
+
+# the plane permutation of each orientation, listed in the same order as CUBE_ORIENTATIONS
+ORIENTATION_PERMUTATIONS: np.ndarray = mk_orientation_permutations()
+
+def mk_composition_table() -> np.ndarray:
+    """
+    Makes the table of products of the rotation group.
+
+    The rotation with index i takes a cube from its initial position to orientation i.
+    Applying rotation i and then rotation j moves the label of plane p[i][p[j][k]] onto plane k,
+    where p is ORIENTATION_PERMUTATIONS. A rotation is determined by the planes that it moves
+    onto the front and top planes, so the product is looked up by those two planes.
+
+    Returns:
+        an array with shape (24, 24) whose entry (i, j) is the index of rotation i followed by rotation j.
+    """
+    n_planes: int = len(FACE_PLANES)
+    front: int = PLANE_INDEX[FacePlane.FRONT]
+    top: int = PLANE_INDEX[FacePlane.TOP]
+    key_to_index: np.ndarray = np.full(n_planes * n_planes, -1, dtype=np.intp)
+    key_to_index[ORIENTATION_PERMUTATIONS[:, front] * n_planes + ORIENTATION_PERMUTATIONS[:, top]] = \
+        np.arange(len(ORIENTATION_PERMUTATIONS))
+
+    # products[i, j, k] = p[i][p[j][k]]
+    products: np.ndarray = ORIENTATION_PERMUTATIONS[:, ORIENTATION_PERMUTATIONS].astype(np.intp)
+    return key_to_index[products[:, :, front] * n_planes + products[:, :, top]]
+
+# entry (i, j) is the index of the orientation reached by rotation i followed by rotation j
+COMPOSITION_TABLE: np.ndarray = mk_composition_table()
+
+# entry i is the index of the rotation that undoes rotation i
+INVERSE_TABLE: np.ndarray = np.argmax(COMPOSITION_TABLE == IDENTITY_INDEX, axis=1)
+
+# the index of the rotation of each quarter turn, listed in the same order as QUARTER_TURN_AXES
+QUARTER_TURN_ORIENTATIONS: list[int] = [
+    get_orientation_index(apply_plane_sources(sources, INITIAL_PLANE_TO_LABEL_MAPPING))
+    for sources in QUARTER_TURN_SOURCES
 ]
 
+# entry (i, k) is the index of the orientation reached by quarter turn k from orientation i
+QUARTER_TURN_TABLE: np.ndarray = COMPOSITION_TABLE[:, QUARTER_TURN_ORIENTATIONS]
+
+def rotate_orientation(orientation_index: int, vector: Vector3D) -> int:
+    """
+    Applies a 90-degree counter-clockwise rotation around an axis to a cube orientation.
+
+    This gives the same orientation as rotate_by_vector() but with a table lookup.
+
+    Args:
+        orientation_index: the index of the orientation before the rotation.
+        vector: the axis of rotation, a Manim direction constant
+
+    Returns:
+        the index of the orientation after the rotation.
+
+    Raises:
+        ValueError: if the vector is not one of the allowed Manim direction constants
+    """
+    return int(QUARTER_TURN_TABLE[orientation_index, get_quarter_turn_index(vector)])
+
+def apply_quarter_turns(orientation_index: int, vectors: Sequence[Vector3D]) -> int:
+    """
+    Applies a sequence of 90-degree counter-clockwise rotations to a cube orientation.
+
+    Args:
+        orientation_index: the index of the orientation before the rotations.
+        vectors: the axes of the rotations in the order they are applied, each a Manim direction constant
+
+    Returns:
+        the index of the orientation after the rotations.
+
+    Raises:
+        ValueError: if any vector is not one of the allowed Manim direction constants
+    """
+    vector: Vector3D
+    for vector in vectors:
+        orientation_index = int(QUARTER_TURN_TABLE[orientation_index, get_quarter_turn_index(vector)])
+    return orientation_index
+
+
+# a turn path lists the indices in QUARTER_TURN_AXES of the quarter turns applied in order
+type TurnPath = tuple[int, ...]
+
+def mk_shortest_turn_paths() -> list[list[TurnPath]]:
+    """
+    Makes the shortest turn path between every pair of cube orientations.
+
+    The orientations are the vertices of the Cayley graph of the rotation group whose generators are
+    the quarter turns, so a breadth-first search from each orientation finds a shortest path to every other.
+    Quarter turns are tried in QUARTER_TURN_AXES order, so of several shortest paths the one found is
+    the first in that order.
+
+    Returns:
+        a table whose entry [start][target] is a shortest turn path from orientation start to orientation target.
+    """
+    n_orientations: int = len(CUBE_ORIENTATIONS)
+    table: list[list[TurnPath]] = []
+    start: int
+    for start in range(n_orientations):
+        paths: list[TurnPath | None] = [None] * n_orientations
+        paths[start] = ()
+        frontier: list[int] = [start]
+        while frontier:
+            next_frontier: list[int] = []
+            orientation_index: int
+            for orientation_index in frontier:
+                path: TurnPath | None = paths[orientation_index]
+                # every orientation in the frontier has been reached
+                assert path is not None
+                turn: int
+                for turn in range(len(QUARTER_TURN_AXES)):
+                    next_index: int = int(QUARTER_TURN_TABLE[orientation_index, turn])
+                    if paths[next_index] is None:
+                        paths[next_index] = path + (turn,)
+                        next_frontier.append(next_index)
+            frontier = next_frontier
+        table.append([path for path in paths if path is not None])
+    return table
+
+# entry [start][target] is a shortest turn path from orientation start to orientation target
+SHORTEST_TURN_PATHS: list[list[TurnPath]] = mk_shortest_turn_paths()
+
+def get_shortest_turns(start_index: int, target_index: int) -> list[Vector3D]:
+    """
+    Gets the fewest quarter turns that rotate a cube from one orientation to another.
+
+    Args:
+        start_index: the index of the orientation before the turns.
+        target_index: the index of the orientation after the turns.
+
+    Returns:
+        the axes of the quarter turns in the order they are applied, each a Manim direction constant.
+    """
+    return [QUARTER_TURN_AXES[turn] for turn in SHORTEST_TURN_PATHS[start_index][target_index]]
+
+def get_shortest_turns_to_front(start_index: int, target_front: FaceLabel) -> list[Vector3D]:
+    """
+    Gets the fewest quarter turns that rotate a cube so that a given face is at the front.
+
+    Of the orientations with the target face at the front, the one reached by the fewest turns is chosen,
+    and ties are broken in CUBE_ORIENTATIONS order.
+
+    Args:
+        start_index: the index of the orientation before the turns.
+        target_front: the face label that must be at the front after the turns.
+
+    Returns:
+        the axes of the quarter turns in the order they are applied, each a Manim direction constant.
+    """
+    paths: list[TurnPath] = [SHORTEST_TURN_PATHS[start_index][index]
+                             for index, orientation in enumerate(CUBE_ORIENTATIONS)
+                             if orientation.front == target_front]
+    return [QUARTER_TURN_AXES[turn] for turn in min(paths, key=len)]
+
+def mk_turns_rotation(vectors: Sequence[Vector3D]) -> Rotation:
+    """
+    Makes the rotation of a sequence of 90-degree counter-clockwise turns.
+
+    Args:
+        vectors: the axes of the turns in the order they are applied.
+
+    Returns:
+        the product of the turns, which is the identity if there are none.
+    """
+    rotation: Rotation = Rotation.identity()
+    vector: Vector3D
+    for vector in vectors:
+        rotation = Rotation.from_rotvec(np.asarray(vector, dtype=float) * np.pi / 2.0) * rotation
+    return rotation
+
 def rotate_to_match_front(current_orientation: CubeOrientation, target_front: FaceLabel) -> Rotation:
     """
     Returns a rotation transformation that rotates cube in its current orientation
     so that its front face matches the target front face.
 
+    The rotation is made of the fewest quarter turns that do this.
+
     Args:
         current_orientation: The initial orientation of the cube.
         target_front: the target front face
@@ -362,8 +643,5 @@ def rotate_to_match_front(current_orientation: CubeOrientation, target_front: Fa
     Returns:
         a rotation that sends the given target front face to the front of the cube.
     """
-    initial_front: FaceLabel = current_orientation.front
-    initial_top: FaceLabel = current_orientation.top
-    if initial_front == target_front:
-        return Rotation.identity()
-    return Rotation.identity()
\ No newline at end of file
+    start_index: int = ORIENTATION_INDEX[(current_orientation.front, current_orientation.top)]
+    return mk_turns_rotation(get_shortest_turns_to_front(start_index, target_front))
@@ -1,18 +1,63 @@
 """
 This module performs a depth sort on a set of convex, planar polygons
 in 3d space where depth is defined by a projection onto a 2d space.
+
+Only the pairs of polygons whose projections overlap constrain the drawing order.
+A broad phase first finds the pairs whose 2d axis-aligned bounding boxes overlap,
+by sweeping the boxes along the x-axis in order of their left edges and pruning the pairs
+whose y-intervals are disjoint. Only these candidate pairs reach the exact shapely test,
+which is applied to all of them at once with the vectorised shapely functions,
+so a scene of several puzzles does not pay for the many pairs of faces that are far apart.
 """
 from typing import OrderedDict
 import numpy as np
 import networkx as nx
-from shapely.geometry import Point, Polygon
-from shapely.geometry.base import BaseGeometry
+import shapely
+from shapely.geometry import Polygon
 from manim.typing import Point3D_Array
 
 from instant_insanity.core.convex_planar_polygon import ConvexPlanarPolygon
-from instant_insanity.core.projection import Projection
+from instant_insanity.core.projection import Projection, stack_planes
 from instant_insanity.core.geometry_types import *
 
+
+def find_overlapping_boxes(bounds: np.ndarray) -> np.ndarray:
+    """
+    Finds the pairs of 2d axis-aligned boxes that overlap, by sweep and prune along the x-axis.
+
+    Boxes that only touch count as overlapping, so no pair whose closed boxes meet is missed.
+
+    Args:
+        bounds: the bounds (min_x, min_y, max_x, max_y) of each box, with shape (n, 4).
+
+    Returns:
+        the index pairs (i, j) with i < j of the overlapping boxes in lexicographic order, with shape (m, 2).
+
+    Raises:
+        ValueError: if bounds does not have shape (n, 4).
+    """
+    if bounds.ndim != 2 or bounds.shape[1] != 4:
+        raise ValueError('bounds must be of shape (n, 4)')
+
+    n: int = len(bounds)
+    order: np.ndarray = np.argsort(bounds[:, 0], kind='stable')
+    sorted_bounds: np.ndarray = bounds[order]
+
+    # a box can only overlap the later boxes in the sweep whose left edges are not beyond its right edge
+    ends: np.ndarray = np.searchsorted(sorted_bounds[:, 0], sorted_bounds[:, 2], side='right')
+    counts: np.ndarray = ends - np.arange(n) - 1
+    first: np.ndarray = np.repeat(np.arange(n), counts)
+    offsets: np.ndarray = np.arange(len(first)) - np.repeat(np.cumsum(counts) - counts, counts)
+    second: np.ndarray = first + 1 + offsets
+
+    # prune the pairs whose y-intervals are disjoint
+    is_overlapping: np.ndarray = ((sorted_bounds[first, 1] <= sorted_bounds[second, 3]) &
+                                  (sorted_bounds[second, 1] <= sorted_bounds[first, 3]))
+    pairs: np.ndarray = np.sort(np.stack([order[first[is_overlapping]], order[second[is_overlapping]]], axis=1),
+                                axis=1)
+    return pairs[np.lexsort((pairs[:, 1], pairs[:, 0]))]
+
+
 class DepthSort[KeyType]:
     """
     This class performs a depth sort on a set of convex, planar polygons based
@@ -92,11 +137,17 @@ class DepthSort[KeyType]:
         # each vertex path does in fact define a convex, planar polygon.
         # If not, then ConvexPlanarPolygon will raise an exception.
 
-        # project each vertex path from model space to scene space
-        projected_paths: PolygonKeyToVertexPathMapping[KeyType] = {
-            polygon_key: self.projection.project_points(path)
-            for polygon_key, path in paths.items()
-        }
+        # project all the vertex paths from model space to scene space in one batch
+        projected_paths: PolygonKeyToVertexPathMapping[KeyType] = {}
+        bounds: np.ndarray = np.zeros((0, 4), dtype=np.float64)
+        if paths:
+            path_lengths: list[int] = [len(path) for path in paths.values()]
+            path_starts: np.ndarray = np.cumsum(path_lengths) - path_lengths
+            projected_vertices: Point3D_Array = self.projection.project_points(np.concatenate(list(paths.values())))
+            projected_paths = dict(zip(paths.keys(), np.split(projected_vertices, path_starts[1:])))
+            projected_xy: np.ndarray = projected_vertices[:, :2]
+            bounds = np.hstack([np.minimum.reduceat(projected_xy, path_starts),
+                                np.maximum.reduceat(projected_xy, path_starts)])
 
         # depth-sort the polygons by performing a topological sort on the directed graph for
         # the binary relation on polygons: A is_behind B
@@ -106,48 +157,47 @@ class DepthSort[KeyType]:
         polygon_keys: list[KeyType] = list(paths.keys())
         graph.add_nodes_from(polygon_keys)
 
-        # perform a pair-wise comparison of the projected polygons
-        i: int
-        polygon_key_i: KeyType
-        for i, polygon_key_i in enumerate(polygon_keys):
-            path_i: Point3D_Array = projected_paths[polygon_key_i]
-            polygon_i: Polygon = Polygon(path_i)
-
-            j: int
-            polygon_key_j: KeyType
-            for j, polygon_key_j in enumerate(polygon_keys):
-                if j <= i:
-                    continue
-                path_j: Point3D_Array = projected_paths[polygon_key_j]
-                polygon_j: Polygon = Polygon(path_j)
-                if not polygon_i.intersects(polygon_j):
-                    continue
-
-                # the projected polygons intersect so compute their intersection
-                polygon_ij: BaseGeometry = polygon_i.intersection(polygon_j)
-
-                # if they do not intersect in a Polygon we can ignore it
-                if not isinstance(polygon_ij, Polygon):
-                    continue
-
-                # if the area is nearly zero we can ignore it
-                area: float = polygon_ij.area
-                if np.isclose(area, 0.0):
-                    continue
-
-                # get a representative point of the intersection
-                point_ij: Point = polygon_ij.representative_point()
-                x: float = point_ij.x
-                y: float = point_ij.y
-
-                t_i: float = self.projection.polygon_t(convex_planar_polygons[polygon_key_i], x, y)
-                t_j: float = self.projection.polygon_t(convex_planar_polygons[polygon_key_j], x, y)
-                if np.isclose(t_i, t_j):
-                    raise ValueError(f'polygons {polygon_key_i} and {polygon_key_j} intersect in model space')
-                if t_i < t_j:
-                    graph.add_edge(polygon_key_i, polygon_key_j)
+        # the broad phase keeps the pairs whose bounding boxes overlap
+        candidate_pairs: np.ndarray = find_overlapping_boxes(bounds)
+
+        # the exact phase keeps the candidate pairs whose projected polygons overlap in a positive area
+        # and gets a representative point of the intersection of each overlapping pair
+        overlapping_pairs: list[tuple[int, int]] = []
+        overlap_points: np.ndarray = np.zeros((0, 2), dtype=np.float64)
+        if len(candidate_pairs) > 0:
+            polygons: np.ndarray = np.array([Polygon(path) for path in projected_paths.values()], dtype=object)
+            polygons_i: np.ndarray = polygons[candidate_pairs[:, 0]]
+            polygons_j: np.ndarray = polygons[candidate_pairs[:, 1]]
+            is_intersecting: np.ndarray = shapely.intersects(polygons_i, polygons_j)
+            candidate_pairs = candidate_pairs[is_intersecting]
+
+            # if they do not intersect in a Polygon or the area is nearly zero we can ignore it
+            intersections: np.ndarray = shapely.intersection(polygons_i[is_intersecting], polygons_j[is_intersecting])
+            is_overlapping: np.ndarray = ((shapely.get_type_id(intersections) == shapely.GeometryType.POLYGON) &
+                                          ~np.isclose(shapely.area(intersections), 0.0))
+            overlapping_pairs = [(int(i), int(j)) for i, j in candidate_pairs[is_overlapping]]
+            overlap_points = shapely.get_coordinates(shapely.point_on_surface(intersections[is_overlapping]))
+
+        # evaluate the depths of both polygons of every overlapping pair in one batch
+        if overlapping_pairs:
+            planes: np.ndarray = stack_planes([convex_planar_polygons[polygon_key] for polygon_key in polygon_keys])
+            pair_indices: np.ndarray = np.array(overlapping_pairs)
+            xy: np.ndarray = np.repeat(overlap_points, 2, axis=0)
+            t: np.ndarray = self.projection.polygons_t(planes[pair_indices.ravel()], xy).reshape(-1, 2)
+            t_i: np.ndarray = t[:, 0]
+            t_j: np.ndarray = t[:, 1]
+
+            is_tied: np.ndarray = np.isclose(t_i, t_j)
+            if np.any(is_tied):
+                i, j = overlapping_pairs[int(np.argmax(is_tied))]
+                raise ValueError(f'polygons {polygon_keys[i]} and {polygon_keys[j]} intersect in model space')
+
+            is_behind: bool
+            for (i, j), is_behind in zip(overlapping_pairs, (t_i < t_j).tolist()):
+                if is_behind:
+                    graph.add_edge(polygon_keys[i], polygon_keys[j])
                 else:
-                    graph.add_edge(polygon_key_j, polygon_key_i)
+                    graph.add_edge(polygon_keys[j], polygon_keys[i])
 
         # we now have built the directed graph for is_behind so check if it's acyclic
         if not nx.is_directed_acyclic_graph(graph):
@@ -0,0 +1,138 @@
+"""
+This module contains the GeneralPuzzle class which represents a generalised Instant Insanity puzzle.
+
+The Puzzle class models the real puzzle which has exactly four cubes painted with the colours in FaceColour.
+A generalised puzzle has any number of cubes and any number of colours.
+It is solved when every row of faces along the front, top, back, and bottom shows every colour once,
+which requires as many colours as there are cubes.
+
+A generalised cube is specified like a PuzzleCubeSpec, as six characters listed in FaceLabel order,
+except that any character is allowed. Each distinct character is a colour symbol.
+Symbols are case-sensitive, so 'a' and 'A' are different colours.
+"""
+import random
+
+from instant_insanity.core.puzzle import FaceLabel, AxisLabel, AXIS_TO_FACE_LABEL_PAIR, Puzzle, PuzzleCubeNumber
+
+# GeneralPuzzleSpec is a list of strings, one per cube.
+# Each string contains six colour symbols listed in FaceLabel order.
+type GeneralPuzzleSpec = list[str]
+
+# a general cube colours its six faces with colour indices listed in FaceLabel order
+type GeneralCubeColours = tuple[int, int, int, int, int, int]
+
+# the position of each face label in a cube specification
+FACE_LABEL_INDEX: dict[FaceLabel, int] = {face_label: index for index, face_label in enumerate(FaceLabel)}
+
+# the colour symbols used by mk_random_general_puzzle_spec
+DEFAULT_COLOUR_SYMBOLS: str = 'ABCDEFGHIJKLMNOPQRSTUVWXYZ'
+
+
+class GeneralPuzzle:
+    """
+    A generalised Instant Insanity puzzle with any number of cubes and colours.
+
+    Attributes:
+        puzzle_spec: the puzzle specification.
+        colours: the distinct colour symbols in sorted order, whose positions are the colour indices.
+        cube_colours: the colour index of each face of each cube.
+    """
+    puzzle_spec: GeneralPuzzleSpec
+    colours: list[str]
+    cube_colours: list[GeneralCubeColours]
+
+    def __init__(self, puzzle_spec: GeneralPuzzleSpec) -> None:
+        """
+        Create a generalised puzzle from a specification.
+
+        Args:
+            puzzle_spec: a nonempty list of 6-character strings giving the colour symbols of the faces.
+
+        Raises:
+            ValueError: if puzzle_spec is empty or any cube specification is not a string of length 6.
+        """
+        if len(puzzle_spec) == 0:
+            raise ValueError('Expected at least one cube')
+        cube_spec: str
+        for cube_spec in puzzle_spec:
+            if not isinstance(cube_spec, str):
+                raise ValueError(f"Expected a string, got {type(cube_spec).__name__}")
+            if len(cube_spec) != 6:
+                raise ValueError(f"Expected string of length 6, got length {len(cube_spec)}")
+
+        self.puzzle_spec = puzzle_spec
+        self.colours = sorted(set(''.join(puzzle_spec)))
+        symbol_to_index: dict[str, int] = {symbol: index for index, symbol in enumerate(self.colours)}
+        self.cube_colours = [
+            (symbol_to_index[cube_spec[0]], symbol_to_index[cube_spec[1]], symbol_to_index[cube_spec[2]],
+             symbol_to_index[cube_spec[3]], symbol_to_index[cube_spec[4]], symbol_to_index[cube_spec[5]])
+            for cube_spec in puzzle_spec
+        ]
+
+    @classmethod
+    def from_puzzle(cls, puzzle: Puzzle) -> 'GeneralPuzzle':
+        """
+        Create the generalised puzzle that has the same cubes as a puzzle.
+        The colour symbols are the upper case initials of the face colours.
+
+        Args:
+            puzzle: the puzzle.
+
+        Returns:
+            the generalised puzzle.
+        """
+        cube_number: PuzzleCubeNumber
+        return cls([puzzle.number_to_cube[cube_number].cube_spec.upper() for cube_number in PuzzleCubeNumber])
+
+    @property
+    def n_cubes(self) -> int:
+        return len(self.cube_colours)
+
+    @property
+    def n_colours(self) -> int:
+        return len(self.colours)
+
+    def get_axis_colour_pair(self, cube_index: int, axis_label: AxisLabel) -> tuple[int, int]:
+        """
+        Gets the colour indices at the two ends of a cube axis.
+
+        Args:
+            cube_index: the index of the cube, starting from 0.
+            axis_label: the axis label.
+
+        Returns:
+            the pair of colour indices.
+        """
+        face_label_1: FaceLabel
+        face_label_2: FaceLabel
+        face_label_1, face_label_2 = AXIS_TO_FACE_LABEL_PAIR[axis_label]
+        cube_colours: GeneralCubeColours = self.cube_colours[cube_index]
+        return cube_colours[FACE_LABEL_INDEX[face_label_1]], cube_colours[FACE_LABEL_INDEX[face_label_2]]
+
+
+def mk_random_general_puzzle_spec(n_cubes: int, rng: random.Random,
+                                  symbols: str = DEFAULT_COLOUR_SYMBOLS) -> GeneralPuzzleSpec:
+    """
+    Makes a random specification for a puzzle with n cubes and n colours.
+    Every face is coloured independently and uniformly, and specifications that
+    do not use all n colours are rejected and redrawn.
+
+    Args:
+        n_cubes: the number of cubes, which is also the number of colours.
+        rng: the random number generator.
+        symbols: the colour symbols, of which the first n are used.
+
+    Returns:
+        the random puzzle specification.
+
+    Raises:
+        ValueError: if there are fewer than n symbols.
+    """
+    if n_cubes > len(symbols):
+        raise ValueError(f'Expected at most {len(symbols)} cubes, got: {n_cubes}')
+    colour_symbols: str = symbols[:n_cubes]
+    while True:
+        puzzle_spec: GeneralPuzzleSpec = [''.join(rng.choice(colour_symbols) for _ in range(6))
+                                          for _ in range(n_cubes)]
+        if len(set(''.join(puzzle_spec))) == n_cubes:
+            return puzzle_spec
@@ -3,17 +3,29 @@ This module implements projection of points in model space onto
 the camera plane.
 
 Refer to projection.md for the math.
+
+Each projection, including its model to scene conversion, is also precomputed as a 4x4 homogeneous matrix.
+Applying the matrix to a model point (mx, my, mz, 1) gives (X, Y, Z, W), and the scene point is (X/W, Y/W, Z).
+The x and y rows give the projective numerators, and W is 1 for an orthographic projection and the
+distance vz - mz from the model point to the viewpoint along the z-axis for a perspective projection.
+The depth row is not divided by W, so the depth is exactly the converted model z-coordinate,
+as it is for project_point, rather than the nonlinear pseudo-depth of a graphics pipeline.
+project_points applies the matrix to a whole array of points with a single matrix product.
+Since the matrix is homogeneous, it composes with the rigid motion matrices of transformation.py,
+so project_transformed_points applies a rigid motion and a projection to all the vertices
+with a single matrix product.
 """
 
 from dataclasses import dataclass
 from abc import ABC, abstractmethod
+from collections.abc import Sequence
 from typing import Protocol
 
 import numpy as np
 from manim import RIGHT, UP, OUT
-from manim.typing import Point3D, Vector3D, Point3D_Array
+from manim.typing import Point3D, Vector3D, Point3D_Array, MatrixMN
 
-from instant_insanity.core.type_check import check_vector3_float64, check_matrix_nx3_float64
+from instant_insanity.core.type_check import check_vector3_float64, check_point_array_float64
 
 
 class Planar(Protocol):
@@ -41,6 +53,24 @@ class Planar(Protocol):
         ...
 
 
+def stack_planes(planes: Sequence[Planar]) -> np.ndarray:
+    """
+    Stacks the base points and normals of planes into one array for batched depth evaluation.
+
+    Args:
+        planes: the planes.
+
+    Returns:
+        a NumPy array with shape (n, 2, 3) holding the base point and the normal of each plane.
+    """
+    plane: Planar
+    stacked: np.ndarray = np.empty((len(planes), 2, 3), dtype=np.float64)
+    for index, plane in enumerate(planes):
+        stacked[index, 0] = plane.get_point()
+        stacked[index, 1] = plane.get_normal()
+    return stacked
+
+
 @dataclass
 class ModelToSceneConversion:
     """
@@ -86,10 +116,12 @@ class Projection(ABC):
     Attributes:
         camera_z: the z-coordinate c of the camera plane.
         conversion: the transformation that converts model space to scene space.
+        matrix: the 4x4 homogeneous matrix of the projection, including the conversion to scene space.
     """
 
     camera_z: float
     conversion: ModelToSceneConversion
+    matrix: MatrixMN
 
     def __init__(self,
                  camera_z: float = 2.0,
@@ -107,6 +139,74 @@ class Projection(ABC):
     def compute_u(self, model_point: Point3D) -> Vector3D:
         pass
 
+    @abstractmethod
+    def mk_projective_rows(self) -> MatrixMN:
+        """
+        Makes the rows of the projection onto the camera plane in model space.
+
+        Returns:
+            a (3, 4) matrix whose rows give X, Y, and W, where (X/W, Y/W, c) is the projection of
+            the model point onto the camera plane z=c.
+        """
+        pass
+
+    def mk_matrix(self) -> MatrixMN:
+        """
+        Makes the homogeneous matrix of the projection, including the conversion to scene space.
+
+        Returns:
+            the 4x4 matrix whose rows give X, Y, Z, and W, where (X/W, Y/W, Z) is the projected scene point.
+        """
+        rows: MatrixMN = self.mk_projective_rows()
+        row_w: np.ndarray = rows[2]
+        scale: float = self.conversion.scene_per_model
+        o_x: float
+        o_y: float
+        o_z: float
+        o_x, o_y, o_z = self.conversion.scene_origin
+
+        # fold the conversion (p - o) * s into the rows, where the x and y rows are divided by W later
+        matrix: MatrixMN = np.zeros((4, 4), dtype=np.float64)
+        matrix[0] = scale * (rows[0] - o_x * row_w)
+        matrix[1] = scale * (rows[1] - o_y * row_w)
+        matrix[2] = [0.0, 0.0, scale, -scale * o_z]
+        matrix[3] = row_w
+        return matrix
+
+    def project_transformed_points(self, transform: MatrixMN, model_points: Point3D_Array) -> Point3D_Array:
+        """Transforms model points by a homogeneous matrix and projects them with one matrix product.
+
+        Args:
+            transform: a 4x4 affine matrix, such as the matrix of a RigidMotion, applied to the model points.
+            model_points: A NumPy array of points in model space with shape (n, 3) or (k, m, 3).
+
+        Returns:
+            A NumPy array with the same shape containing the projections of the transformed points.
+
+        Raises:
+            TypeError: if model_points is not a NumPy array of float64 values.
+            ValueError: if model_points does not have shape (n, 3) or (k, m, 3), or a transformed point is
+                level with the viewpoint of a perspective projection.
+        """
+        check_point_array_float64(model_points)
+
+        return apply_projection_matrix(self.matrix @ transform, model_points)
+
+    @abstractmethod
+    def compute_u_array(self, model_points: np.ndarray) -> np.ndarray:
+        """
+        Computes the unit vector u for each point of an array of model points at once.
+
+        This is the batched form of compute_u. It does not validate its argument.
+
+        Args:
+            model_points: a NumPy array of points in model space with shape (..., 3).
+
+        Returns:
+            a NumPy array of unit vectors with the same shape.
+        """
+        pass
+
     def project_point(self, model_point: Point3D) -> Point3D:
         """Projects the model point onto the camera plane and computes its parameter t along the projection line.
 
@@ -127,11 +227,26 @@ class Projection(ABC):
         return self._project_point_along_u(model_point, u)
 
     def project_points(self, model_points: Point3D_Array) -> Point3D_Array:
-        check_matrix_nx3_float64(model_points)
+        """Projects an array of model points onto the camera plane in one batch.
+
+        The array is validated once and then projected with one product with the homogeneous matrix of
+        the projection, giving the same result as calling project_point on each point.
 
-        projected_points: list[Point3D] = [self.project_point(model_point)
-                                              for model_point in model_points]
-        return np.array(projected_points, dtype=np.float64)
+        Args:
+            model_points: A NumPy array of points in model space with shape (n, 3) or (k, m, 3).
+
+        Returns:
+            A NumPy array with the same shape containing (x, y, mz) for each model point, where (x, y, c)
+                is the projection of the model point onto the camera plane z=c.
+
+        Raises:
+            TypeError: if model_points is not a NumPy array of float64 values.
+            ValueError: if model_points does not have shape (n, 3) or (k, m, 3), or a model point is
+                level with the viewpoint of a perspective projection.
+        """
+        check_point_array_float64(model_points)
+
+        return apply_projection_matrix(self.matrix, model_points)
 
     def _project_point_along_u(self, model_point: Point3D, u: Vector3D) -> Point3D:
         """Projects the model point onto the camera plane along the direction given by the unit vector u.
@@ -217,6 +332,40 @@ class Projection(ABC):
 
         return t
 
+    def polygons_t(self, planes: np.ndarray, xy: np.ndarray) -> np.ndarray:
+        """
+        Computes the t parameters of many (plane, scene point) pairs at once.
+
+        This is the batched form of polygon_t, which it matches pair by pair.
+
+        Args:
+            planes: the planes in model space, as stacked by stack_planes, with shape (n, 2, 3).
+            xy: the x and y coordinates of the projected points in scene space, with shape (n, 2).
+
+        Returns:
+            the t-parameter of the point of each plane that projects to its scene point, with shape (n,).
+
+        Raises:
+            ValueError: if the arrays do not have matching shapes (n, 2, 3) and (n, 2).
+        """
+        if planes.ndim != 3 or planes.shape[1:] != (2, 3):
+            raise ValueError('planes must be of shape (n, 2, 3)')
+        if xy.shape != (len(planes), 2):
+            raise ValueError('xy must be of shape (n, 2) with one point per plane')
+
+        # we are not given the z-coordinates of the points in scene space so set them to 0.0
+        scene_points: np.ndarray = np.zeros((len(xy), 3), dtype=np.float64)
+        scene_points[:, :2] = xy
+        p: np.ndarray = self.conversion.convert_scene_to_model(scene_points)
+        # we want the corresponding points in model space to lie on the camera plane
+        p[:, 2] = self.camera_z
+
+        unit_u: np.ndarray = self.compute_u_array(p)
+        b: np.ndarray = planes[:, 0]
+        n: np.ndarray = planes[:, 1]
+
+        return np.einsum('ij,ij->i', b - p, n) / np.einsum('ij,ij->i', unit_u, n)
+
 
 class PerspectiveProjection(Projection):
     """This class models a perspective projection.
@@ -242,6 +391,7 @@ class PerspectiveProjection(Projection):
 
         super().__init__(**kwargs)
         self.viewpoint = viewpoint
+        self.matrix = self.mk_matrix()
 
     def compute_u(self, model_point: Point3D) -> Vector3D:
         check_vector3_float64(model_point)
@@ -255,6 +405,28 @@ class PerspectiveProjection(Projection):
 
         return u
 
+    def compute_u_array(self, model_points: np.ndarray) -> np.ndarray:
+        # compute the unit vectors pointing from the model points to the viewpoint
+        directions: np.ndarray = self.viewpoint - model_points
+        norms: np.ndarray = np.linalg.norm(directions, axis=-1, keepdims=True)
+        if np.any(np.isclose(norms, 0.0)):
+            raise ValueError('model point is too close to viewpoint')
+
+        return directions / norms
+
+    def mk_projective_rows(self) -> MatrixMN:
+        # the line from m to v meets z = c at m + (c - mz) / (vz - mz) * (v - m)
+        c: float = self.camera_z
+        v_x: float
+        v_y: float
+        v_z: float
+        v_x, v_y, v_z = self.viewpoint
+        return np.array([
+            [v_z - c, 0.0, -v_x, c * v_x],
+            [0.0, v_z - c, -v_y, c * v_y],
+            [0.0, 0.0, -1.0, v_z],
+        ], dtype=np.float64)
+
 
 class OrthographicProjection(Projection):
     """This class models an orthographic projection.
@@ -289,12 +461,57 @@ class OrthographicProjection(Projection):
             raise ValueError('unit vector z-component is too small')
 
         self.u = u
+        self.matrix = self.mk_matrix()
 
     def compute_u(self, model_point: Point3D) -> Vector3D:
         check_vector3_float64(model_point)
 
         return self.u
 
+    def compute_u_array(self, model_points: np.ndarray) -> np.ndarray:
+        # every projection line has the same direction
+        return np.broadcast_to(self.u, model_points.shape)
+
+    def mk_projective_rows(self) -> MatrixMN:
+        # the line from m along u meets z = c at m - (mz - c) / uz * u
+        c: float = self.camera_z
+        u_x: float
+        u_y: float
+        u_z: float
+        u_x, u_y, u_z = self.u
+        return np.array([
+            [1.0, 0.0, -u_x / u_z, c * u_x / u_z],
+            [0.0, 1.0, -u_y / u_z, c * u_y / u_z],
+            [0.0, 0.0, 0.0, 1.0],
+        ], dtype=np.float64)
+
+
+def apply_projection_matrix(matrix: MatrixMN, model_points: np.ndarray) -> np.ndarray:
+    """
+    Applies a homogeneous projection matrix to an array of model points.
+
+    Args:
+        matrix: a 4x4 projection matrix, as made by Projection.mk_matrix.
+        model_points: A NumPy array of points in model space with shape (..., 3).
+
+    Returns:
+        A NumPy array with the same shape containing (X/W, Y/W, Z) for each model point.
+
+    Raises:
+        ValueError: if W is nearly zero for any point, which means the point is level with
+            the viewpoint of a perspective projection.
+    """
+    if matrix.shape != (4, 4):
+        raise ValueError('matrix must be of shape (4, 4)')
+    homogeneous: np.ndarray = model_points @ matrix[:, :3].T + matrix[:, 3]
+    w: np.ndarray = homogeneous[..., 3:]
+    if np.any(np.isclose(w, 0.0)):
+        raise ValueError('model point is level with the viewpoint')
+
+    scene_points: np.ndarray = homogeneous[..., :3].copy()
+    scene_points[..., :2] /= w
+    return scene_points
+
 
 def mk_standard_orthographic_projection() -> OrthographicProjection:
     direction: Vector3D = np.array([1.5, 1, 5], dtype=np.float64)
@@ -126,11 +126,12 @@ class FaceColour(StrEnum):
             raise ValueError(f"Expected a single alphabetic character but got: {c!r}")
 
         c = c.upper()
-        for member in cls:
-            if member.name.startswith(c):
-                return member
+        if c not in _INITIAL_TO_FACE_COLOUR:
+            raise ValueError(f"No FaceColour member name starts with '{c}'")
+        return _INITIAL_TO_FACE_COLOUR[c]
 
-        raise ValueError(f"No FaceColour member name starts with '{c}'")
+# maps the upper case initial of each face colour member name to the member
+_INITIAL_TO_FACE_COLOUR: dict[str, FaceColour] = {member.name[0]: member for member in FaceColour}
 
 # use black as the default colour for cube face edges
 DEFAULT_EDGE_COLOUR: str = 'black'
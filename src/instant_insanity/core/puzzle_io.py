@@ -0,0 +1,274 @@
+"""
+This module reads and writes large files of puzzles.
+
+There are two file formats:
+
+* The text format has one line per puzzle. A line is the puzzle specification written as
+  24 colour initials, the six faces of each cube in turn, followed by a newline,
+  so every line is 25 bytes long. The newline at the end of the file may be left out.
+* The binary format starts with a header and then stores each puzzle in 9 bytes.
+  The 24 colour codes of a puzzle are packed 3 bits each into 72 bits, most significant bit first.
+  Since there are seven colours, the code 7 is invalid.
+
+Both formats are fixed width, so a file is read by memory-mapping it and viewing it as a NumPy array
+of records, which are copied out and decoded a batch at a time, with the lookup table of compact_puzzle
+or by unpacking their bits, and then validated with vectorised checks,
+so no Python code runs per character or per puzzle.
+The batches are uint8 arrays of colour codes with shape (n, 4, 6), which solve_many accepts directly.
+"""
+import mmap
+import os
+import tempfile
+from collections.abc import Iterator, Sequence
+from enum import StrEnum
+
+import numpy as np
+
+from instant_insanity.core.compact_puzzle import N_COLOURS, N_CUBES, N_FACES, COLOUR_CODE_TABLE, COLOUR_INITIALS, \
+    INVALID_COLOUR_CODE, encode_puzzle_specs
+from instant_insanity.core.puzzle import PuzzleSpec, CARTEBLANCHE_PUZZLE_SPEC, WINNING_MOVES_PUZZLE_SPEC
+
+# the number of faces of a puzzle
+N_PUZZLE_FACES: int = N_CUBES * N_FACES
+
+# the number of bytes of a line of the text format, including its newline
+TEXT_LINE_SIZE: int = N_PUZZLE_FACES + 1
+
+# the newline byte that ends each line of the text format
+NEWLINE_BYTE: int = ord('\n')
+
+# a binary puzzle file starts with this header
+BINARY_PUZZLE_HEADER: bytes = b'IIP\x01'
+
+# the number of bits of a colour code in the binary format
+BITS_PER_FACE: int = 3
+
+# the number of bytes of a puzzle in the binary format
+BINARY_RECORD_SIZE: int = N_PUZZLE_FACES * BITS_PER_FACE // 8
+
+# the default number of puzzles decoded at a time
+DEFAULT_IO_BATCH_SIZE: int = 65536
+
+# the upper case initials as bytes, indexed by colour code
+_INITIAL_BYTES: np.ndarray = np.frombuffer(COLOUR_INITIALS.encode('ascii'), dtype=np.uint8)
+
+
+class PuzzleFileFormat(StrEnum):
+    """The formats of puzzle files."""
+    TEXT = 'text'
+    BINARY = 'binary'
+
+
+def get_file_format(data: bytes | mmap.mmap) -> PuzzleFileFormat:
+    """
+    Gets the format of the contents of a puzzle file.
+
+    Args:
+        data: the contents of the file.
+
+    Returns:
+        BINARY if the contents start with the binary header, and TEXT otherwise.
+    """
+    return PuzzleFileFormat.BINARY if data[:len(BINARY_PUZZLE_HEADER)] == BINARY_PUZZLE_HEADER \
+        else PuzzleFileFormat.TEXT
+
+
+def check_colour_codes(colour_codes: np.ndarray) -> np.ndarray:
+    """
+    Checks that an array holds the colour codes of puzzles.
+
+    Args:
+        colour_codes: the array.
+
+    Returns:
+        the array.
+
+    Raises:
+        ValueError: if the array is not a uint8 array with shape (n, 4, 6) of colour codes.
+    """
+    if colour_codes.dtype != np.uint8 or colour_codes.shape[1:] != (N_CUBES, N_FACES):
+        raise ValueError(f'Expected colour codes with shape (n, {N_CUBES}, {N_FACES})')
+    if np.any(colour_codes >= N_COLOURS):
+        raise ValueError(f'Expected colour codes less than {N_COLOURS}')
+    return colour_codes
+
+
+def encode_text(colour_codes: np.ndarray) -> bytes:
+    """
+    Encodes puzzles in the text format.
+
+    Args:
+        colour_codes: the colour codes of the puzzles, with shape (n, 4, 6).
+
+    Returns:
+        the lines of the puzzles.
+    """
+    lines: np.ndarray = np.full((len(colour_codes), TEXT_LINE_SIZE), NEWLINE_BYTE, dtype=np.uint8)
+    lines[:, :N_PUZZLE_FACES] = _INITIAL_BYTES[colour_codes.reshape(len(colour_codes), N_PUZZLE_FACES)]
+    return lines.tobytes()
+
+
+def decode_text(data: np.ndarray, first_line: int = 1) -> np.ndarray:
+    """
+    Decodes lines of the text format.
+
+    Args:
+        data: the bytes of whole lines, where the newline of the last line may be left out.
+        first_line: the line number of the first line, used in error messages.
+
+    Returns:
+        the colour codes of the puzzles, with shape (n, 4, 6).
+
+    Raises:
+        ValueError: if any line is not 24 colour initials followed by a newline.
+    """
+    if len(data) % TEXT_LINE_SIZE == N_PUZZLE_FACES:
+        data = np.append(data, np.uint8(NEWLINE_BYTE))
+    if len(data) % TEXT_LINE_SIZE != 0:
+        raise ValueError(f'Expected lines of {N_PUZZLE_FACES} colour initials')
+
+    lines: np.ndarray = data.reshape(-1, TEXT_LINE_SIZE)
+    colour_codes: np.ndarray = COLOUR_CODE_TABLE[lines[:, :N_PUZZLE_FACES]]
+    is_invalid: np.ndarray = np.any(colour_codes == INVALID_COLOUR_CODE, axis=1) | (lines[:, -1] != NEWLINE_BYTE)
+    if np.any(is_invalid):
+        line_index: int = int(np.argmax(is_invalid))
+        line: str = lines[line_index].tobytes().decode('ascii', errors='replace')
+        raise ValueError(f'Expected {N_PUZZLE_FACES} colour initials on line {first_line + line_index}, got: {line!r}')
+    return colour_codes.reshape(-1, N_CUBES, N_FACES)
+
+
+def encode_binary(colour_codes: np.ndarray) -> bytes:
+    """
+    Encodes puzzles in the binary format, without the header.
+
+    Args:
+        colour_codes: the colour codes of the puzzles, with shape (n, 4, 6).
+
+    Returns:
+        the records of the puzzles.
+    """
+    codes: np.ndarray = colour_codes.reshape(len(colour_codes), N_PUZZLE_FACES, 1)
+    bits: np.ndarray = np.unpackbits(codes, axis=2)[:, :, -BITS_PER_FACE:]
+    return np.packbits(bits.reshape(len(colour_codes), -1), axis=1).tobytes()
+
+
+def decode_binary(data: np.ndarray, first_record: int = 0) -> np.ndarray:
+    """
+    Decodes records of the binary format.
+
+    Args:
+        data: the bytes of whole records, without the header.
+        first_record: the index of the first record, used in error messages.
+
+    Returns:
+        the colour codes of the puzzles, with shape (n, 4, 6).
+
+    Raises:
+        ValueError: if the data is not whole records or any record holds an invalid colour code.
+    """
+    if len(data) % BINARY_RECORD_SIZE != 0:
+        raise ValueError(f'Expected records of {BINARY_RECORD_SIZE} bytes')
+    bits: np.ndarray = np.unpackbits(data.reshape(-1, BINARY_RECORD_SIZE), axis=1)
+    bits = bits.reshape(-1, N_PUZZLE_FACES, BITS_PER_FACE)
+    colour_codes: np.ndarray = (bits[:, :, 0] << 2) | (bits[:, :, 1] << 1) | bits[:, :, 2]
+    is_invalid: np.ndarray = np.any(colour_codes >= N_COLOURS, axis=1)
+    if np.any(is_invalid):
+        raise ValueError(f'Invalid colour code in record {first_record + int(np.argmax(is_invalid))}')
+    return colour_codes.reshape(-1, N_CUBES, N_FACES)
+
+
+def write_puzzle_file(path: str | os.PathLike, puzzles: Sequence[PuzzleSpec] | np.ndarray,
+                      file_format: PuzzleFileFormat = PuzzleFileFormat.TEXT) -> int:
+    """
+    Writes puzzles to a file.
+
+    Args:
+        path: the path of the file.
+        puzzles: the puzzle specifications, or their colour codes as a uint8 array with shape (n, 4, 6).
+        file_format: the format of the file.
+
+    Returns:
+        the number of puzzles written.
+
+    Raises:
+        ValueError: if any puzzle is invalid.
+    """
+    colour_codes: np.ndarray = check_colour_codes(puzzles) if isinstance(puzzles, np.ndarray) \
+        else encode_puzzle_specs([list(puzzle_spec) for puzzle_spec in puzzles])
+    with open(path, 'wb') as file:
+        if file_format == PuzzleFileFormat.TEXT:
+            file.write(encode_text(colour_codes))
+        else:
+            file.write(BINARY_PUZZLE_HEADER)
+            file.write(encode_binary(colour_codes))
+    return len(colour_codes)
+
+
+def iter_puzzle_batches(path: str | os.PathLike, batch_size: int = DEFAULT_IO_BATCH_SIZE) -> Iterator[np.ndarray]:
+    """
+    Reads a puzzle file a batch at a time, in either format.
+
+    Args:
+        path: the path of the file.
+        batch_size: the maximum number of puzzles in a batch.
+
+    Returns:
+        an iterator over the colour codes of the batches of puzzles, each with shape (n, 4, 6).
+
+    Raises:
+        ValueError: if batch_size is not positive or the file is not a valid puzzle file.
+    """
+    if batch_size <= 0:
+        raise ValueError(f'Expected a positive batch size, got: {batch_size}')
+    if os.path.getsize(path) == 0:
+        return
+
+    with open(path, 'rb') as file, mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+        data: np.ndarray = np.frombuffer(mapped, dtype=np.uint8)
+        try:
+            start: int
+            if get_file_format(mapped) == PuzzleFileFormat.TEXT:
+                step: int = batch_size * TEXT_LINE_SIZE
+                for start in range(0, len(data), step):
+                    yield decode_text(np.array(data[start:start + step]), first_line=start // TEXT_LINE_SIZE + 1)
+            else:
+                header_size: int = len(BINARY_PUZZLE_HEADER)
+                if (len(data) - header_size) % BINARY_RECORD_SIZE != 0:
+                    raise ValueError(f'Expected records of {BINARY_RECORD_SIZE} bytes')
+                step = batch_size * BINARY_RECORD_SIZE
+                for start in range(header_size, len(data), step):
+                    yield decode_binary(np.array(data[start:start + step]),
+                                        first_record=(start - header_size) // BINARY_RECORD_SIZE)
+        finally:
+            # the mapped file can't be closed while a view of it is alive, even one held by the traceback
+            # of an error, so the batches are decoded from copies and the view of the whole file is released here
+            del data
+
+
+def read_puzzle_file(path: str | os.PathLike) -> np.ndarray:
+    """
+    Reads a whole puzzle file, in either format.
+
+    Args:
+        path: the path of the file.
+
+    Returns:
+        the colour codes of the puzzles, with shape (n, 4, 6).
+
+    Raises:
+        ValueError: if the file is not a valid puzzle file.
+    """
+    batches: list[np.ndarray] = list(iter_puzzle_batches(path))
+    if not batches:
+        return np.zeros((0, N_CUBES, N_FACES), dtype=np.uint8)
+    return np.concatenate(batches)
+
+
+if __name__ == "__main__":
+    with tempfile.TemporaryDirectory() as directory:
+        puzzle_file_format: PuzzleFileFormat
+        for puzzle_file_format in PuzzleFileFormat:
+            file_path: str = os.path.join(directory, f'puzzles.{puzzle_file_format}')
+            write_puzzle_file(file_path, [WINNING_MOVES_PUZZLE_SPEC, CARTEBLANCHE_PUZZLE_SPEC], puzzle_file_format)
+            print(f'The {puzzle_file_format} file has {os.path.getsize(file_path)} bytes.')
+            print(read_puzzle_file(file_path))
@@ -0,0 +1,255 @@
+"""
+This module computes a canonical form for puzzle specifications.
+
+Many different specifications describe what is essentially the same puzzle.
+The following changes do not affect which stacks solve the puzzle:
+
+* rotating any cube,
+* listing the cubes in a different order, and
+* renaming the colours.
+
+Two specifications are equivalent if one can be turned into the other by these changes.
+The canonical form is the same for all the specifications in an equivalence class,
+so it can be used as a key for caching anything that only depends on the class, such as its solutions.
+
+A cube specification lists the colours in FaceLabel order.
+Rotating the cube to any of its 24 orientations and reading the colours off in FaceLabel order
+gives 24 specifications for the same cube.
+For a fixed renaming of the colours, the least way to write the puzzle is to write each cube
+in its least orientation and then sort the cubes.
+The canonical form is the least of these over every renaming of the colours onto the first
+colour initials in FaceColour order, so it is itself a valid PuzzleSpec.
+The least orientation of each cube under every renaming is computed once and remembered,
+so canonicalising a puzzle only sorts the remembered cubes for each renaming.
+
+The CanonicalForm also records the changes that produce it, so that a solution of the canonical
+puzzle can be mapped back to a solution of the original puzzle.
+"""
+from dataclasses import dataclass
+from functools import cache, lru_cache
+from itertools import permutations
+
+from instant_insanity.core.cube_rotations import PlaneToLabelMapping, ORIENTATION_MAPPINGS
+from instant_insanity.core.puzzle import FaceLabel, AxisLabel, FaceColour, Puzzle, PuzzleSpec, PuzzleCubeSpec, \
+    INITIAL_FACE_LABEL_TO_PLANE
+
+# the position of each face label in a cube specification
+FACE_LABEL_POSITION: dict[FaceLabel, int] = {face_label: position for position, face_label in enumerate(FaceLabel)}
+
+# the canonical colour symbols are the colour initials in FaceColour order
+CANONICAL_COLOUR_SYMBOLS: str = ''.join(colour.name[0] for colour in FaceColour)
+
+# the number of cubes whose least rotations are remembered, which is every cube that uses four colours
+LEAST_ROTATIONS_CACHE_SIZE: int = 4 ** 6
+
+# a spec permutation lists, for each position of the rotated cube spec, the position it is read from
+type SpecPermutation = tuple[int, int, int, int, int, int]
+
+
+def mk_spec_permutation(mapping: PlaneToLabelMapping) -> SpecPermutation:
+    """
+    Makes the spec permutation of a cube orientation.
+
+    Args:
+        mapping: the face plane to label mapping of the orientation.
+
+    Returns:
+        the spec permutation that reads the colours of the rotated cube off the original cube spec.
+    """
+    face_label: FaceLabel
+    positions: list[int] = [FACE_LABEL_POSITION[mapping[INITIAL_FACE_LABEL_TO_PLANE[face_label]]]
+                            for face_label in FaceLabel]
+    return positions[0], positions[1], positions[2], positions[3], positions[4], positions[5]
+
+
+# the spec permutation of each orientation, listed in the same order as CUBE_ORIENTATIONS
+SPEC_PERMUTATIONS: list[SpecPermutation] = [mk_spec_permutation(mapping) for mapping in ORIENTATION_MAPPINGS]
+
+
+def rotate_cube_spec(cube_spec: PuzzleCubeSpec, orientation_index: int) -> PuzzleCubeSpec:
+    """
+    Rotates a cube specification.
+
+    Args:
+        cube_spec: the cube specification.
+        orientation_index: the index of the orientation in CUBE_ORIENTATIONS.
+
+    Returns:
+        the specification of the cube after it is rotated to the orientation.
+    """
+    permutation: SpecPermutation = SPEC_PERMUTATIONS[orientation_index]
+    return ''.join(cube_spec[position] for position in permutation)
+
+
+@dataclass(frozen=True)
+class CanonicalForm:
+    """
+    The canonical form of a puzzle specification together with the changes that produce it.
+
+    Canonical cube i is original cube cube_indices[i], rotated to orientation orientation_indices[i],
+    with each colour symbol renamed by colour_map.
+
+    Attributes:
+        key: the canonical specification joined into a single string.
+        puzzle_spec: the canonical specification.
+        colour_map: maps each upper case original colour symbol to its canonical symbol.
+        cube_indices: the index of the original cube of each canonical cube, starting from 0.
+        orientation_indices: the index in CUBE_ORIENTATIONS of the rotation applied to each canonical cube.
+    """
+    key: str
+    puzzle_spec: PuzzleSpec
+    colour_map: dict[str, str]
+    cube_indices: tuple[int, ...]
+    orientation_indices: tuple[int, ...]
+
+    def get_original_axis(self, cube_index: int, axis_label: AxisLabel) -> AxisLabel:
+        """
+        Maps an axis of a canonical cube back to the original cube.
+
+        Args:
+            cube_index: the index of the canonical cube, starting from 0.
+            axis_label: the axis of the canonical cube.
+
+        Returns:
+            the axis of the original cube that joins the same two faces.
+        """
+        # the two faces of an axis are at adjacent positions in FaceLabel order
+        permutation: SpecPermutation = SPEC_PERMUTATIONS[self.orientation_indices[cube_index]]
+        axis_labels: list[AxisLabel] = list(AxisLabel)
+        return axis_labels[permutation[2 * axis_labels.index(axis_label)] // 2]
+
+
+def normalise_puzzle_spec(puzzle_spec: PuzzleSpec) -> PuzzleSpec:
+    """
+    Normalises the colour initials of a puzzle specification to upper case.
+
+    Args:
+        puzzle_spec: the puzzle specification.
+
+    Returns:
+        the specification with every initial in upper case.
+
+    Raises:
+        ValueError: if the specification is not a valid PuzzleSpec.
+    """
+    Puzzle(puzzle_spec)
+    return [cube_spec.upper() for cube_spec in puzzle_spec]
+
+
+@cache
+def get_renamings(n_symbols: int) -> list[str]:
+    """
+    Gets every renaming of the first canonical colour symbols.
+
+    Args:
+        n_symbols: the number of colour symbols.
+
+    Returns:
+        the renamed symbols of each renaming, in the order of itertools.permutations.
+    """
+    return [''.join(renamed_symbols) for renamed_symbols in permutations(CANONICAL_COLOUR_SYMBOLS[:n_symbols])]
+
+
+@dataclass(frozen=True)
+class RenamedLeastRotations:
+    """
+    The least rotations of a cube under every renaming of its colours, listed in the order of get_renamings().
+
+    Attributes:
+        cube_specs: the least specification of the renamed cube over its 24 orientations.
+        orientation_indices: the index in CUBE_ORIENTATIONS of the first orientation that gives it.
+    """
+    cube_specs: tuple[PuzzleCubeSpec, ...]
+    orientation_indices: tuple[int, ...]
+
+
+@lru_cache(maxsize=LEAST_ROTATIONS_CACHE_SIZE)
+def get_least_rotation(cube_spec: PuzzleCubeSpec) -> tuple[PuzzleCubeSpec, int]:
+    """
+    Gets the least specification of a cube over its 24 orientations.
+
+    Args:
+        cube_spec: the cube specification.
+
+    Returns:
+        the least specification and the index in CUBE_ORIENTATIONS of the first orientation that gives it.
+    """
+    rotations: list[PuzzleCubeSpec] = [rotate_cube_spec(cube_spec, orientation_index)
+                                       for orientation_index in range(len(SPEC_PERMUTATIONS))]
+    least: PuzzleCubeSpec = min(rotations)
+    return least, rotations.index(least)
+
+
+@lru_cache(maxsize=LEAST_ROTATIONS_CACHE_SIZE)
+def get_renamed_least_rotations(cube_spec: PuzzleCubeSpec, n_symbols: int) -> RenamedLeastRotations:
+    """
+    Gets the least rotations of a cube under every renaming of its colours.
+
+    Args:
+        cube_spec: the cube specification, written with the first n_symbols canonical colour symbols.
+        n_symbols: the number of colour symbols of the puzzle.
+
+    Returns:
+        the least rotations.
+    """
+    # renaming the colours commutes with rotating the cube
+    least_rotations: list[tuple[PuzzleCubeSpec, int]] = [
+        get_least_rotation(cube_spec.translate(str.maketrans(CANONICAL_COLOUR_SYMBOLS[:n_symbols], renamed_symbols)))
+        for renamed_symbols in get_renamings(n_symbols)
+    ]
+    return RenamedLeastRotations(tuple(least for least, _ in least_rotations),
+                                 tuple(orientation_index for _, orientation_index in least_rotations))
+
+
+def canonicalise(puzzle_spec: PuzzleSpec) -> CanonicalForm:
+    """
+    Computes the canonical form of a puzzle specification.
+
+    Args:
+        puzzle_spec: the puzzle specification.
+
+    Returns:
+        the canonical form.
+
+    Raises:
+        ValueError: if the specification is not a valid PuzzleSpec.
+    """
+    cube_specs: PuzzleSpec = normalise_puzzle_spec(puzzle_spec)
+    symbols: str = ''.join(sorted(set(''.join(cube_specs))))
+    n_symbols: int = len(symbols)
+
+    # write the cubes with the canonical symbols so that their least rotations can be shared by every puzzle
+    table: dict[int, int] = str.maketrans(symbols, CANONICAL_COLOUR_SYMBOLS[:n_symbols])
+    least_rotations: list[RenamedLeastRotations] = [
+        get_renamed_least_rotations(cube_spec.translate(table), n_symbols) for cube_spec in cube_specs
+    ]
+
+    # for each renaming, the least way to write the puzzle is to sort the least rotations of its cubes
+    keys: list[str] = [''.join(sorted(renamed_cube_specs))
+                       for renamed_cube_specs in zip(*[rotations.cube_specs for rotations in least_rotations])]
+    key: str = min(keys)
+    index: int = keys.index(key)
+    cubes: list[tuple[PuzzleCubeSpec, int, int]] = sorted(
+        (rotations.cube_specs[index], cube_index, rotations.orientation_indices[index])
+        for cube_index, rotations in enumerate(least_rotations)
+    )
+    return CanonicalForm(
+        key=key,
+        puzzle_spec=[cube[0] for cube in cubes],
+        colour_map=dict(zip(symbols, get_renamings(n_symbols)[index])),
+        cube_indices=tuple(cube[1] for cube in cubes),
+        orientation_indices=tuple(cube[2] for cube in cubes),
+    )
+
+
+def get_canonical_key(puzzle_spec: PuzzleSpec) -> str:
+    """
+    Computes the canonical key of a puzzle specification.
+
+    Args:
+        puzzle_spec: the puzzle specification.
+
+    Returns:
+        the key, which is equal for two specifications exactly when they are equivalent.
+    """
+    return canonicalise(puzzle_spec).key
@@ -8,13 +8,30 @@ We use SymPy datatypes instead of NumPy.
 The two main types are:
 Scalar: real numbers, modelled as Expr
 Vector: real vectors in 3D space modelled Matrix with shape (3,1), e.g. as column vectors
+
+The symbolic projections also serve as a compiler for numeric kernels.
+A projection whose parameters are symbols is applied once to a symbolic model point and to a symbolic plane,
+which derives the closed forms of project_point and polygon_t.
+The closed forms are simplified and then lambdified into NumPy functions that evaluate
+a whole array of points or planes at once.
+The kernels take the parameter values of a numeric projection of projection.py,
+so the tests can check the derivation against the numeric code.
+
+The kernels are a verified reference, not the runtime path.
+The numeric projections already evaluate whole arrays with a single matrix product,
+and the kernels cost a compile on first use without being materially faster.
 """
 
+from collections.abc import Callable, Sequence
 from dataclasses import dataclass
 from abc import ABC, abstractmethod
+from functools import cache
 from typing import Protocol
 
-from sympy import Expr, Matrix, sqrt, S, Rational, Integer, simplify
+import numpy as np
+from sympy import Expr, Matrix, Symbol, sqrt, S, Rational, Integer, simplify, symbols, lambdify
+
+from instant_insanity.core import projection as numeric_projection
 
 type Scalar = Expr
 type Vector = Matrix
@@ -106,31 +123,23 @@ class Projection(ABC):
     This is the abstract base class for projections.
 
     Attributes:
-        scene_x: The x-offset to subtract from the projection onto the camera plane.
-        scene_y: The y-offset to subtract from the projection onto the camera plane.
-        camera_z: The z coordinate c of the camera plane.
-        scale: the scale factor to convert model coordinates to camera coordinates.
-
+        camera_z: the z-coordinate c of the camera plane.
+        conversion: the transformation that converts model space to scene space.
     """
 
-    scene_x: Scalar
-    scene_y: Scalar
     camera_z: Scalar
-    scale: Scalar
     conversion: ModelToSceneConversion
 
     def __init__(self,
+                 camera_z: Scalar = Integer(2),
                  scene_x: Scalar = S.Zero,
                  scene_y: Scalar = S.Zero,
-                 camera_z: Scalar = S.Zero,
-                 scale: Scalar = S.One) -> None:
-        self.scene_x = scene_x
-        self.scene_y = scene_y
+                 scene_z: Scalar = S.Zero,
+                 scene_per_model: Scalar = S.One
+                 ) -> None:
         self.camera_z = camera_z
-        self.scale = scale
 
-        scene_origin: Vector = scene_x * UNIT_I + scene_y * UNIT_J + camera_z * UNIT_K
-        scene_per_model: Scalar = scale
+        scene_origin: Vector = scene_x * UNIT_I + scene_y * UNIT_J + scene_z * UNIT_K
         self.conversion = ModelToSceneConversion(scene_origin, scene_per_model)
 
     @abstractmethod
@@ -193,25 +202,28 @@ class Projection(ABC):
         c: Scalar = self.camera_z
 
         t: Scalar = (m_z - c) / u_z
-        x: Scalar = m_x - t * u_x - self.scene_x
-        y: Scalar = m_y - t * u_y - self.scene_y
+        x: Scalar = m_x - t * u_x
+        y: Scalar = m_y - t * u_y
 
-        return self.scale * Matrix([x, y, m_z])
+        p: Vector = Matrix([x, y, m_z])
 
-    def polygon_t(self, polygon: Planar, x: Scalar, y: Scalar) -> float:
+        return self.conversion.convert_model_to_scene(p)
+
+    def polygon_t(self, polygon: Planar, x: Scalar, y: Scalar) -> Scalar:
         """
         Compute the t parameter of the point in model space that projects to (x, y, c)
         on the camera plane.
         Args:
             polygon: the plane in model space defined by the convex planar polygon.
-            x: the x coordinate of the projected point.
-            y: the y coordinate of the projected point.
+            x: the x-coordinate of the projected point in scene space.
+            y: the y-coordinate of the projected point in scene space.
 
         Returns:
             the parameter t of the point in model space.
 
         Let u be the unit vector that defines the direction of the light ray.
-        Let p = (x, y, c) be a point on the camera plane.
+        Let s = (x, y, z) be a point in scene space where z is not given.
+        Let p = (p_x, p_y, c) be the corresponding point on the camera plane.
         Let m be the point in model space that projects to (x, y).
         We have:
         m = p + t * u
@@ -228,15 +240,16 @@ class Projection(ABC):
         We can solve for t as follows:
         t = (b - p) @ n / u @ n
         """
-        p: Vector = Matrix([
-            x / self.scale + self.scene_x,
-            y / self.scale + self.scene_y,
-            self.camera_z
-        ])
+        # we are not given the z-coordinate of the point in scene space so set it to 0
+        scene_point: Vector = Matrix([x, y, S.Zero])
+        p: Vector = self.conversion.convert_scene_to_model(scene_point)
+        # we want the corresponding point in model space to lie on the camera plane
+        p[2] = self.camera_z
+
         unit_u: Vector = self.compute_u(p)
         b: Vector = polygon.get_point()
         n: Vector = polygon.get_normal()
-        t: float = ((b - p).T * n) / (unit_u.T * n)
+        t: Scalar = (b - p).dot(n) / unit_u.dot(n)
 
         return t
 
@@ -323,8 +336,221 @@ def mk_standard_orthographic_projection() -> OrthographicProjection:
     direction: Vector = Matrix([Rational(3, 2), S.One, Integer(5)])
     u: Vector = direction / direction.norm()
     projection: OrthographicProjection = OrthographicProjection(u,
-                                                                scale=Rational(1, 2),
+                                                                camera_z=S.One,
                                                                 scene_x=Integer(2),
                                                                 scene_y=Integer(-3),
-                                                                camera_z=S.One)
+                                                                scene_z=S.Zero,
+                                                                scene_per_model=Rational(1, 2))
     return projection
+
+
+# the symbols of a model point
+MODEL_POINT: Vector = Matrix(symbols('m_x m_y m_z', real=True))
+
+# the symbols of the x and y coordinates of a point in scene space
+SCENE_XY: tuple[Symbol, Symbol] = symbols('x y', real=True)
+
+# the symbols of the base point and the normal vector of a plane
+PLANE_POINT: Vector = Matrix(symbols('b_x b_y b_z', real=True))
+PLANE_NORMAL: Vector = Matrix(symbols('n_x n_y n_z', real=True))
+
+# the symbols of the parameters shared by both projections
+CAMERA_Z: Symbol = Symbol('c', real=True)
+SCENE_ORIGIN: Vector = Matrix(symbols('o_x o_y o_z', real=True))
+SCENE_PER_MODEL: Symbol = Symbol('s', positive=True)
+
+# the symbols of the viewpoint of a perspective projection and the direction of an orthographic projection
+VIEWPOINT: Vector = Matrix(symbols('v_x v_y v_z', real=True))
+DIRECTION: Vector = Matrix(symbols('u_x u_y u_z', real=True))
+
+# the parameters of each projection in the order that the kernels take their values
+PERSPECTIVE_PARAMETERS: tuple[Symbol, ...] = (*VIEWPOINT, CAMERA_Z, *SCENE_ORIGIN, SCENE_PER_MODEL)
+ORTHOGRAPHIC_PARAMETERS: tuple[Symbol, ...] = (*DIRECTION, CAMERA_Z, *SCENE_ORIGIN, SCENE_PER_MODEL)
+
+
+@dataclass(frozen=True)
+class SymbolicPlane:
+    """
+    A plane given by a base point and a normal vector, which satisfies the Planar protocol.
+
+    Attributes:
+        point: a base point on the plane.
+        normal: a nonzero normal vector.
+    """
+    point: Vector
+    normal: Vector
+
+    def get_point(self) -> Vector:
+        return self.point
+
+    def get_normal(self) -> Vector:
+        return self.normal
+
+
+@dataclass(frozen=True)
+class CompiledProjection:
+    """
+    The closed forms of a projection and the NumPy kernels lambdified from them.
+
+    Attributes:
+        parameters: the symbols of the parameters of the projection.
+        projected_point: the projection of MODEL_POINT into scene space.
+        t: the t-parameter of the point of the plane (PLANE_POINT, PLANE_NORMAL) that projects to SCENE_XY.
+        project_kernel: the kernel of projected_point, which takes the parameters and then MODEL_POINT.
+        t_kernel: the kernel of t, which takes the parameters, SCENE_XY, PLANE_POINT, and PLANE_NORMAL.
+    """
+    parameters: tuple[Symbol, ...]
+    projected_point: Vector
+    t: Scalar
+    project_kernel: Callable[..., list]
+    t_kernel: Callable[..., np.ndarray]
+
+    def project_points(self, values: Sequence[float], model_points: np.ndarray) -> np.ndarray:
+        """
+        Projects an array of model points.
+
+        Args:
+            values: the values of the parameters.
+            model_points: the model points, with shape (..., 3).
+
+        Returns:
+            the projected points in scene space, with the same shape.
+
+        Raises:
+            ValueError: if the number of values does not match the parameters or the points are not 3-vectors.
+        """
+        self._check_values(values)
+        if model_points.shape[-1:] != (3,):
+            raise ValueError('model_points must be of shape (..., 3)')
+        coordinates: list = self.project_kernel(*values, *np.moveaxis(model_points, -1, 0))
+        return np.stack(np.broadcast_arrays(*coordinates), axis=-1).astype(np.float64)
+
+    def polygons_t(self, values: Sequence[float], planes: np.ndarray, xy: np.ndarray) -> np.ndarray:
+        """
+        Computes the t parameters of many (plane, scene point) pairs at once.
+
+        Args:
+            values: the values of the parameters.
+            planes: the planes in model space, as stacked by projection.stack_planes, with shape (n, 2, 3).
+            xy: the x and y coordinates of the projected points in scene space, with shape (n, 2).
+
+        Returns:
+            the t-parameter of the point of each plane that projects to its scene point, with shape (n,).
+
+        Raises:
+            ValueError: if the number of values does not match the parameters or the arrays do not have
+                matching shapes (n, 2, 3) and (n, 2).
+        """
+        self._check_values(values)
+        if planes.ndim != 3 or planes.shape[1:] != (2, 3):
+            raise ValueError('planes must be of shape (n, 2, 3)')
+        if xy.shape != (len(planes), 2):
+            raise ValueError('xy must be of shape (n, 2) with one point per plane')
+        t: np.ndarray = self.t_kernel(*values, *xy.T, *planes[:, 0].T, *planes[:, 1].T)
+        return np.broadcast_to(t, (len(planes),)).astype(np.float64)
+
+    def _check_values(self, values: Sequence[float]) -> None:
+        if len(values) != len(self.parameters):
+            raise ValueError(f'Expected {len(self.parameters)} parameter values, got: {len(values)}')
+
+
+def compile_projection(projection: Projection, parameters: Sequence[Symbol]) -> CompiledProjection:
+    """
+    Derives the closed forms of a projection whose parameters are symbols and lambdifies them.
+
+    Args:
+        projection: the projection.
+        parameters: the symbols of the parameters, in the order that the kernels take their values.
+
+    Returns:
+        the closed forms and their kernels.
+
+    Raises:
+        ValueError: if the closed forms depend on a symbol that is not a parameter.
+    """
+    projected_point: Vector = projection.project_point(MODEL_POINT).applyfunc(simplify)
+    plane: SymbolicPlane = SymbolicPlane(PLANE_POINT, PLANE_NORMAL)
+    t: Scalar = simplify(projection.polygon_t(plane, *SCENE_XY))
+
+    project_arguments: list[Symbol] = [*parameters, *MODEL_POINT]
+    t_arguments: list[Symbol] = [*parameters, *SCENE_XY, *PLANE_POINT, *PLANE_NORMAL]
+    unknowns: set = (projected_point.free_symbols - set(project_arguments)) | (t.free_symbols - set(t_arguments))
+    if unknowns:
+        raise ValueError(f'Expected the closed forms to depend only on the parameters, got: {unknowns}')
+
+    return CompiledProjection(parameters=tuple(parameters),
+                              projected_point=projected_point,
+                              t=t,
+                              project_kernel=lambdify(project_arguments, list(projected_point), modules='numpy'),
+                              t_kernel=lambdify(t_arguments, t, modules='numpy'))
+
+
+@cache
+def compile_perspective_projection() -> CompiledProjection:
+    """
+    Compiles the perspective projection with symbolic parameters, once.
+
+    Returns:
+        the compiled projection, whose parameters are PERSPECTIVE_PARAMETERS.
+    """
+    projection: PerspectiveProjection = PerspectiveProjection(VIEWPOINT,
+                                                              camera_z=CAMERA_Z,
+                                                              scene_x=SCENE_ORIGIN[0],
+                                                              scene_y=SCENE_ORIGIN[1],
+                                                              scene_z=SCENE_ORIGIN[2],
+                                                              scene_per_model=SCENE_PER_MODEL)
+    return compile_projection(projection, PERSPECTIVE_PARAMETERS)
+
+
+@cache
+def compile_orthographic_projection() -> CompiledProjection:
+    """
+    Compiles the orthographic projection with symbolic parameters, once.
+
+    The direction symbols are normalised, so the kernels accept the unit vector u of a numeric projection.
+
+    Returns:
+        the compiled projection, whose parameters are ORTHOGRAPHIC_PARAMETERS.
+    """
+    projection: OrthographicProjection = OrthographicProjection(DIRECTION / DIRECTION.norm(),
+                                                                camera_z=CAMERA_Z,
+                                                                scene_x=SCENE_ORIGIN[0],
+                                                                scene_y=SCENE_ORIGIN[1],
+                                                                scene_z=SCENE_ORIGIN[2],
+                                                                scene_per_model=SCENE_PER_MODEL)
+    return compile_projection(projection, ORTHOGRAPHIC_PARAMETERS)
+
+
+def get_compiled_projection(projection: numeric_projection.Projection) -> tuple[CompiledProjection, list[float]]:
+    """
+    Gets the compiled projection that matches a numeric projection and the values of its parameters.
+
+    Args:
+        projection: the numeric projection.
+
+    Returns:
+        the compiled projection and the parameter values to pass to its kernels.
+
+    Raises:
+        TypeError: if the projection is neither perspective nor orthographic.
+    """
+    shared_values: list[float] = [float(projection.camera_z),
+                                  *(float(value) for value in projection.conversion.scene_origin),
+                                  float(projection.conversion.scene_per_model)]
+    if isinstance(projection, numeric_projection.PerspectiveProjection):
+        return compile_perspective_projection(), [*(float(value) for value in projection.viewpoint), *shared_values]
+    if isinstance(projection, numeric_projection.OrthographicProjection):
+        return compile_orthographic_projection(), [*(float(value) for value in projection.u), *shared_values]
+    raise TypeError(f'Expected a perspective or orthographic projection, got: {type(projection).__name__}')
+
+
+if __name__ == "__main__":
+    numeric: numeric_projection.Projection = numeric_projection.mk_standard_orthographic_projection()
+    compiled_projection: CompiledProjection
+    parameter_values: list[float]
+    compiled_projection, parameter_values = get_compiled_projection(numeric)
+    print(f'projected point: {list(compiled_projection.projected_point)}')
+    print(f't: {compiled_projection.t}')
+    demo_points: np.ndarray = np.array([[1.0, 1.0, 1.0], [-1.0, 1.0, -1.0]], dtype=np.float64)
+    print(compiled_projection.project_points(parameter_values, demo_points))
+    print(numeric.project_points(demo_points))
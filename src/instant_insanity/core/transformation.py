@@ -79,6 +79,59 @@ def apply_linear_transform(mat: MatrixMN, v: Point3D_Array) -> Point3D_Array:
     return v_transformed[:, :3]
 
 
+def apply_homogeneous_matrix(mat: MatrixMN, points: np.ndarray) -> np.ndarray:
+    """Apply a 4×4 affine transformation matrix to an array of 3D points of any shape.
+
+    This is the batched form of apply_linear_transform. The last row of the matrix must be (0, 0, 0, 1).
+
+    Args:
+        mat: A NumPy array of shape (4, 4) representing an affine transformation.
+        points: A NumPy array of shape (..., 3).
+
+    Returns:
+        A NumPy array of the same shape with the transformed 3D points.
+    """
+    if mat.shape != (4, 4):
+        raise ValueError('mat must be of shape (4, 4)')
+    if points.shape[-1] != 3:
+        raise ValueError('points must be of shape (..., 3)')
+
+    return points @ mat[:3, :3].T + mat[:3, 3]
+
+
+def mk_translation_matrix(translation: Vector3D) -> MatrixMN:
+    """Makes the homogeneous matrix of a translation.
+
+    Args:
+        translation: a translation 3-vector.
+
+    Returns:
+        MatrixMN: A 4x4 homogeneous translation matrix.
+    """
+    mat: MatrixMN = np.eye(4, dtype=np.float64)
+    mat[:3, 3] = translation
+    return mat
+
+
+def mk_rigid_motion_matrix(rotation: Vector3D, translation: Vector3D) -> MatrixMN:
+    """Makes the homogeneous matrix of a rotation followed by a translation.
+
+    Let R be a rotation, let T be a translation, and let V be a vertex.
+    The matrix maps V to R(V) + T, the same as transform_vertex_path.
+
+    Args:
+        rotation: a rotation 3-vector.
+        translation: a translation 3-vector.
+
+    Returns:
+        MatrixMN: A 4x4 homogeneous rigid motion matrix.
+    """
+    mat: MatrixMN = np.eye(4, dtype=np.float64)
+    mat[:3, :3] = Rotation.from_rotvec(rotation).as_matrix()
+    mat[:3, 3] = translation
+    return mat
+
+
 def transform_vertex_path(rotation: Vector3D, translation: Vector3D, vertex_path: Point3D_Array) -> Point3D_Array:
     """
     Transform the vertices by applying a rotation followed by a translation.
@@ -112,6 +165,29 @@ class RigidMotion:
                                                     path_0)
         return path
 
+    def mk_matrix(self) -> MatrixMN:
+        """
+        Makes the homogeneous matrix of the rigid motion.
+
+        Returns:
+            the 4x4 matrix that maps a vertex V to R(V) + T.
+        """
+        return mk_rigid_motion_matrix(self.rotation, self.translation)
+
+    def compose(self, other: 'RigidMotion') -> 'RigidMotion':
+        """
+        Makes the rigid motion that applies this rigid motion and then the other.
+
+        Args:
+            other: the rigid motion applied second.
+
+        Returns:
+            the composed rigid motion.
+        """
+        rotation: Rotation = Rotation.from_rotvec(other.rotation) * Rotation.from_rotvec(self.rotation)
+        translation: Vector3D = Rotation.from_rotvec(other.rotation).apply(self.translation) + other.translation
+        return RigidMotion(rotation.as_rotvec(), translation)
+
     def mk_at(self, alpha: float) -> 'RigidMotion':
         """
         Makes a copy of the rigid motion at the given alpha.
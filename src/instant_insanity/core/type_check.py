@@ -46,3 +46,16 @@ def check_matrix_nx3_float64(m):
         ValueError: If m is not 2-dimensional or does not have exactly 3 columns.
     """
     check_array_float64(m, "m", ndim=2, components=3)
+
+def check_point_array_float64(a):
+    """Validate that a is a NumPy array of 3-vectors with shape (n, 3) or (k, m, 3) and dtype float64.
+
+    Args:
+        a (np.ndarray): Input array to validate.
+
+    Raises:
+        TypeError: If a is not a NumPy array or has incorrect dtype.
+        ValueError: If a is not 2- or 3-dimensional or its last dimension is not 3.
+    """
+    ndim: int = a.ndim if isinstance(a, np.ndarray) and a.ndim == 3 else 2
+    check_array_float64(a, "a", ndim=ndim, components=3)
@@ -19,19 +19,21 @@ faces are visible.
 The face labels are manim Text objects. We remove them from the scenebefore an animated rotation and
 add them back to the scene after the rotations is completed.
 """
-from typing import cast
+from typing import Mapping, cast
 
 from manim import Scene, Text, Polygon, DOWN, RIGHT, UP, PI, AnimationGroup, Indicate, BLACK
 from manim.typing import Vector3D
 
 from instant_insanity.animators.puzzle_3d_animators import Puzzle3DAnimorph, Puzzle3DCubeRotationAnimorph, \
     Puzzle3DSetCubeGapAnimorph
+from instant_insanity.animators.solution_compiler import CompiledSolution, RotationSegment, compile_solution
 from instant_insanity.core.cube import FacePlane
-from instant_insanity.core.cube_rotations import VisibleCubeTexts, PlaneToLabelMapping, INITIAL_PLANE_TO_LABEL_MAPPING, \
-    mk_label_from_str, rotate_by_vector
+from instant_insanity.core.cube_rotations import VisibleCubeTexts, PlaneToLabelMapping, IDENTITY_INDEX, \
+    ORIENTATION_MAPPINGS, mk_label_from_str, rotate_orientation
 from instant_insanity.core.puzzle import PuzzleCubeNumber, FaceLabel
 from instant_insanity.mobjects.puzzle_3d import Puzzle3D, Puzzle3DPolygonName, DEFAULT_BUFF
 from instant_insanity.scenes.helpers import morph_and_checkpoint
+from instant_insanity.solvers.graph_solver import Grid
 
 # only front, right, and top cube faces are visible in the standard orthographic projection
 VISIBLE_PLANES: list[FacePlane] = [FacePlane.FRONT, FacePlane.RIGHT, FacePlane.TOP]
@@ -42,7 +44,7 @@ TEXT_DIRECTIONS: list[Vector3D] = [DOWN, RIGHT, UP]
 class PuzzleFaceLabeller:
     scene: Scene
     puzzle3d: Puzzle3D
-    cube_to_mapping: dict[PuzzleCubeNumber, PlaneToLabelMapping]
+    cube_to_orientation: dict[PuzzleCubeNumber, int]
     cube_to_visible_texts: dict[PuzzleCubeNumber, VisibleCubeTexts]
 
     def __init__(self, scene: Scene, puzzle3d: Puzzle3D) -> None:
@@ -51,9 +53,9 @@ class PuzzleFaceLabeller:
 
         cube_number: PuzzleCubeNumber
 
-        # we need to keep track of the mapping from face plane to face label for each cube
-        self.cube_to_mapping ={
-            cube_number: INITIAL_PLANE_TO_LABEL_MAPPING for cube_number in PuzzleCubeNumber
+        # we need to keep track of the orientation of each cube, which gives its face plane to face label mapping
+        self.cube_to_orientation = {
+            cube_number: IDENTITY_INDEX for cube_number in PuzzleCubeNumber
         }
 
         # we need to keep track of the text label mobjects so we can remove them before a rotation
@@ -89,7 +91,7 @@ class PuzzleFaceLabeller:
         Args:
             cube_number: the cube number.
         """
-        plane_to_label_mapping: dict[FacePlane, FaceLabel] = self.cube_to_mapping[cube_number]
+        plane_to_label_mapping: PlaneToLabelMapping = ORIENTATION_MAPPINGS[self.cube_to_orientation[cube_number]]
         texts: VisibleCubeTexts = self.cube_to_visible_texts[cube_number]
 
         for visible_plane, direction in zip(VISIBLE_PLANES, TEXT_DIRECTIONS):
@@ -143,10 +145,9 @@ class PuzzleFaceLabeller:
             cube_rotation_axis: the cube rotation axis.
         """
 
-        # rotate the cube's plane-to-label mapping
-        plane_to_label_mapping: PlaneToLabelMapping = self.cube_to_mapping[cube_number]
-        plane_to_label_mapping = rotate_by_vector(cube_rotation_axis, plane_to_label_mapping)
-        self.cube_to_mapping[cube_number] = plane_to_label_mapping
+        # rotate the cube's orientation, which rotates its plane-to-label mapping
+        self.cube_to_orientation[cube_number] = rotate_orientation(self.cube_to_orientation[cube_number],
+                                                                   cube_rotation_axis)
 
     def rotate_cube_ccw_90(self, cube: PuzzleCubeNumber, unit_normal: Vector3D) -> None:
         """
@@ -158,19 +159,56 @@ class PuzzleFaceLabeller:
             cube: The cube to rotate.
             unit_normal: The unit normal vector.
         """
-
-        self.remove_cube_texts(cube)
-
-        rotation: Vector3D = cast(Vector3D, unit_normal * PI / 2.0)
         mask: dict[PuzzleCubeNumber, bool] = {
             cube_number: cube_number == cube for cube_number in PuzzleCubeNumber
         }
+        self.rotate_cubes_ccw_90(unit_normal, mask)
+
+    def rotate_cubes_ccw_90(self, unit_normal: Vector3D, mask: Mapping[PuzzleCubeNumber, bool]) -> None:
+        """
+        Rotate the masked cubes counter-clockwise by 90 degrees about the
+        axis defined by a unit normal vector. Checkpoint the puzzle
+        in the rotated position.
+
+        Args:
+            unit_normal: The unit normal vector.
+            mask: dict of cube number to flag (True to rotate).
+        """
+        cube_number: PuzzleCubeNumber
+        cubes: list[PuzzleCubeNumber] = [cube_number for cube_number in PuzzleCubeNumber if mask[cube_number]]
+        for cube_number in cubes:
+            self.remove_cube_texts(cube_number)
+
+        rotation: Vector3D = cast(Vector3D, unit_normal * PI / 2.0)
         animorph: Puzzle3DAnimorph = Puzzle3DCubeRotationAnimorph(self.puzzle3d, rotation, mask)
         morph_and_checkpoint(self.scene, animorph)
 
-        # rotate the cube plane-to-label mapping
-        self.rotate_plane_to_label_mapping(cube, unit_normal)
-        self.update_cube_texts(cube)
+        # rotate the cube plane-to-label mappings
+        for cube_number in cubes:
+            self.rotate_plane_to_label_mapping(cube_number, unit_normal)
+            self.update_cube_texts(cube_number)
+
+    def rotate_to_solution(self, grid: Grid) -> CompiledSolution:
+        """
+        Rotate the cubes from their current orientations into a solution,
+        turning cubes together whenever they turn about the same axis,
+        so that the fewest quarter-turn animations are played.
+
+        Args:
+            grid: a solution grid of the puzzle.
+
+        Returns:
+            the compiled solution that was played.
+
+        Raises:
+            ValueError: if the grid is not a solution of the puzzle.
+        """
+        start_orientations: list[int] = [self.cube_to_orientation[cube_number] for cube_number in PuzzleCubeNumber]
+        compiled_solution: CompiledSolution = compile_solution(self.puzzle3d.puzzle, grid, start_orientations)
+        segment: RotationSegment
+        for segment in compiled_solution.segments:
+            self.rotate_cubes_ccw_90(segment.axis, segment.mask)
+        return compiled_solution
 
     def rotate_puzzle_ccw_90(self, unit_normal: Vector3D) -> None:
         """
@@ -0,0 +1,46 @@
+#!/usr/bin/env python3
+"""
+Script to enumerate every four-colour, four-cube puzzle up to symmetry and classify it by its number of solutions.
+
+The shards are saved in a checkpoint directory as they are classified.
+Running the script again with the same directory resumes the enumeration
+by skipping the shards that are already saved.
+
+Usage:
+    enumerate-puzzles checkpoint-dir [--processes N] [--output results.npz]
+"""
+
+import argparse
+from pathlib import Path
+
+from instant_insanity.solvers.enumeration import EnumerationResults, load_results, run_enumeration, write_results
+
+
+def main() -> None:
+    """Main function to handle command line usage."""
+    parser = argparse.ArgumentParser(
+        description="Enumerate every four-cube puzzle up to symmetry and count its solutions.")
+    parser.add_argument("directory", type=Path, help="the checkpoint directory for the shard files")
+    parser.add_argument("--processes", type=int, default=None,
+                        help="the number of worker processes, one per CPU by default")
+    parser.add_argument("--output", type=Path, default=None,
+                        help="the columnar .npz file to write once every shard is saved")
+    args = parser.parse_args()
+
+    n_classified: int = run_enumeration(args.directory, processes=args.processes)
+    print(f'Classified {n_classified} shards.')
+
+    results: EnumerationResults = load_results(args.directory)
+    print(f'Enumerated {len(results.solution_counts)} puzzles.')
+    n_solutions: int
+    n_puzzles: int
+    for n_solutions, n_puzzles in results.get_histogram().items():
+        print(f'{n_solutions} solutions: {n_puzzles} puzzles')
+
+    if args.output is not None:
+        write_results(results, args.output)
+        print(f'Wrote {args.output}')
+
+
+if __name__ == "__main__":
+    main()
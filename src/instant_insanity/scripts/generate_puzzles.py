@@ -0,0 +1,48 @@
+#!/usr/bin/env python3
+"""
+Script to generate random puzzles that have exactly one solution.
+
+The puzzles are written as JSON Lines, one object per puzzle, to the output file or to standard output.
+The same seed and batch size always give the same puzzles in the same order, whatever the number of processes.
+
+Usage:
+    generate-puzzles count [--seed N] [--processes N] [--batch-size N] [--colours BGRW] [--output puzzles.jsonl]
+"""
+
+import argparse
+import sys
+from pathlib import Path
+
+from instant_insanity.solvers.puzzle_generator import DEFAULT_GENERATOR_BATCH_SIZE, DEFAULT_GENERATOR_COLOURS, \
+    generate_puzzles, write_puzzles
+
+
+def main() -> None:
+    """Main function to handle command line usage."""
+    parser = argparse.ArgumentParser(
+        description="Generate random puzzles that have exactly one solution.")
+    parser.add_argument("count", type=int, help="the number of puzzles to generate")
+    parser.add_argument("--seed", type=int, default=0, help="the base seed")
+    parser.add_argument("--processes", type=int, default=None,
+                        help="the number of worker processes, one per CPU by default")
+    parser.add_argument("--batch-size", type=int, default=DEFAULT_GENERATOR_BATCH_SIZE,
+                        help="the number of puzzles sampled by each task")
+    parser.add_argument("--colours", default=DEFAULT_GENERATOR_COLOURS,
+                        help="the initials of the four colours")
+    parser.add_argument("--allow-equivalent", action="store_true",
+                        help="keep puzzles that are equivalent to one already generated")
+    parser.add_argument("--output", type=Path, default=None, help="the JSON Lines file, standard output by default")
+    args = parser.parse_args()
+
+    puzzles = generate_puzzles(args.count, seed=args.seed, processes=args.processes, batch_size=args.batch_size,
+                               colours=args.colours, distinct=not args.allow_equivalent)
+    if args.output is None:
+        write_puzzles(puzzles, sys.stdout)
+    else:
+        with open(args.output, 'w') as file:
+            n_written: int = write_puzzles(puzzles, file)
+        print(f'Wrote {n_written} puzzles to {args.output}')
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,184 @@
+"""
+This module solves many puzzles at once with NumPy.
+
+The puzzles are parsed straight from their specifications into a dense uint8 array of colour codes
+with shape (n, 4, 6) by encode_puzzle_specs, without building any Puzzle objects.
+The colour code of a face is the index of its colour in FaceColour, as in CompactPuzzle.
+
+The search uses the same grid as GraphSolver, but rather than backtracking it checks every
+possible row at once. A row assigns an axis to each of the four cubes, so there are 3^4 = 81 rows.
+A row is a 2-factor if it shows each colour exactly twice.
+A solution is a pair of 2-factor rows, the front row and the top row, that never give a cube
+the same axis twice, with the first cube's front axis before its top axis.
+For a block of puzzles, the colour counts of all 81 rows are packed into integers as in BitmaskEngine
+and checked together. The number of top rows that can go with each 2-factor front row is then
+a product of the (n, 81) array of 2-factors with the fixed (81, 81) array of allowed row pairs.
+
+The rows are listed in lexicographic order, so the row pairs in row-major order are in the
+order that GraphSolver finds its solutions, and the first allowed pair is the first solution.
+A puzzle that does not have exactly four colours has no solutions.
+
+The blocks can be solved in this process or spread over a process pool.
+A puzzle file can also be solved a batch at a time as it is read, without loading it all.
+"""
+import os
+from collections.abc import Iterator, Sequence
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from itertools import product
+
+import numpy as np
+
+from instant_insanity.core.compact_puzzle import N_COLOURS, N_CUBES, N_FACES, encode_puzzle_specs
+from instant_insanity.core.puzzle import PuzzleSpec
+from instant_insanity.core.puzzle_io import DEFAULT_IO_BATCH_SIZE, iter_puzzle_batches
+from instant_insanity.solvers.bitmask_solver import COUNTER_BITS, mk_grid, pack_counters
+from instant_insanity.solvers.graph_solver import Grid, GRID_ROWS, GRID_COLUMNS
+
+# the default number of puzzles solved together as one block
+DEFAULT_BLOCK_SIZE: int = 4096
+
+# the axis index of each cube in each row, in lexicographic order, with shape (81, 4)
+ROW_AXES: np.ndarray = np.array(list(product(range(3), repeat=N_CUBES)), dtype=np.int8)
+
+# the packed spectra that add 5 to every counter and select the high bit of every counter
+OVERFLOW_BIAS: int = pack_counters(N_COLOURS, 5)
+OVERFLOW_MASK: int = pack_counters(N_COLOURS, 1 << (COUNTER_BITS - 1))
+
+# which pairs of front and top rows are allowed regardless of the colours, with shape (81, 81)
+ALLOWED_ROW_PAIRS: np.ndarray = (np.all(ROW_AXES[:, None, :] != ROW_AXES[None, :, :], axis=-1)
+                                 & (ROW_AXES[:, None, 0] < ROW_AXES[None, :, 0]))
+
+
+def solve_block(colour_codes: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Solves a block of puzzles.
+
+    Args:
+        colour_codes: the colour codes of the puzzles, with shape (n, 4, 6).
+
+    Returns:
+        the number of solutions of each puzzle, with shape (n,),
+        and the packed first solution of each puzzle, with shape (n, 8), or -1 where there is none.
+    """
+    n_puzzles: int = len(colour_codes)
+
+    # pack the colour counts of each cube axis, as in BitmaskEngine, with shape (n, 4, 3)
+    face_spectra: np.ndarray = np.left_shift(np.int32(1), COUNTER_BITS * colour_codes.astype(np.int32))
+    edge_spectra: np.ndarray = face_spectra[:, :, 0::2] + face_spectra[:, :, 1::2]
+
+    # pack the colour counts of each row, with shape (n, 81)
+    row_spectra: np.ndarray = np.zeros((n_puzzles, len(ROW_AXES)), dtype=np.int32)
+    cube_index: int
+    for cube_index in range(N_CUBES):
+        row_spectra += edge_spectra[:, cube_index, ROW_AXES[:, cube_index]]
+
+    # with four colours, a row of four edges is a 2-factor if no colour appears more than twice
+    colour_masks: np.ndarray = np.bitwise_or.reduce(np.left_shift(1, colour_codes.reshape(n_puzzles, -1)), axis=1)
+    has_four_colours: np.ndarray = np.bitwise_count(colour_masks) == N_CUBES
+    is_two_factor: np.ndarray = (((row_spectra + OVERFLOW_BIAS) & OVERFLOW_MASK) == 0) & has_four_colours[:, None]
+
+    # count the top rows that can go with each front row
+    two_factors: np.ndarray = is_two_factor.astype(np.float32)
+    top_counts: np.ndarray = two_factors @ ALLOWED_ROW_PAIRS.T.astype(np.float32)
+    solution_counts: np.ndarray = np.rint((two_factors * top_counts).sum(axis=1)).astype(np.int64)
+
+    first_fronts: np.ndarray = np.argmax(is_two_factor & (top_counts > 0), axis=1)
+    first_tops: np.ndarray = np.argmax(is_two_factor & ALLOWED_ROW_PAIRS[first_fronts], axis=1)
+    first_solutions: np.ndarray = np.concatenate([ROW_AXES[first_fronts], ROW_AXES[first_tops]], axis=1)
+    first_solutions[solution_counts == 0] = -1
+    return solution_counts, first_solutions
+
+
+@dataclass(frozen=True)
+class BatchSolution:
+    """
+    The solutions of a batch of puzzles.
+
+    Attributes:
+        solution_counts: the number of solutions of each puzzle, with shape (n,).
+        first_solutions: the first solution of each puzzle, with shape (n, 8), listing the axis index of the
+            front row and then the top row, or -1 where the puzzle has no solution.
+    """
+    solution_counts: np.ndarray
+    first_solutions: np.ndarray
+
+    def get_first_grid(self, index: int) -> Grid | None:
+        """
+        Gets the first solution of a puzzle as a grid.
+
+        Args:
+            index: the index of the puzzle in the batch.
+
+        Returns:
+            the grid of the first solution, or None if the puzzle has no solution.
+        """
+        if self.solution_counts[index] == 0:
+            return None
+        return mk_grid(tuple(int(axis) for axis in self.first_solutions[index]))
+
+
+def solve_many(puzzle_specs: Sequence[PuzzleSpec] | np.ndarray,
+               block_size: int = DEFAULT_BLOCK_SIZE,
+               max_workers: int | None = None) -> BatchSolution:
+    """
+    Solves many puzzles.
+
+    Args:
+        puzzle_specs: the puzzle specifications, or their colour codes as a uint8 array with shape (n, 4, 6).
+        block_size: the number of puzzles solved together.
+        max_workers: the number of worker processes, or None to solve every block in this process.
+
+    Returns:
+        the solution counts and first solutions of the puzzles.
+
+    Raises:
+        ValueError: if any specification is invalid or block_size is not positive.
+    """
+    if block_size <= 0:
+        raise ValueError(f'Expected a positive block size, got: {block_size}')
+
+    colour_codes: np.ndarray
+    if isinstance(puzzle_specs, np.ndarray) and puzzle_specs.dtype == np.uint8:
+        if puzzle_specs.shape[1:] != (N_CUBES, N_FACES) or np.any(puzzle_specs >= N_COLOURS):
+            raise ValueError(f'Expected colour codes with shape (n, {N_CUBES}, {N_FACES})')
+        colour_codes = puzzle_specs
+    else:
+        colour_codes = encode_puzzle_specs([list(puzzle_spec) for puzzle_spec in puzzle_specs])
+
+    blocks: list[np.ndarray] = [colour_codes[start:start + block_size]
+                                for start in range(0, len(colour_codes), block_size)]
+    results: list[tuple[np.ndarray, np.ndarray]]
+    if max_workers is None:
+        results = [solve_block(block) for block in blocks]
+    else:
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            results = list(executor.map(solve_block, blocks))
+
+    if not results:
+        return BatchSolution(solution_counts=np.zeros(0, dtype=np.int64),
+                             first_solutions=np.zeros((0, len(GRID_ROWS) * N_CUBES), dtype=np.int8))
+    return BatchSolution(solution_counts=np.concatenate([result[0] for result in results]),
+                         first_solutions=np.concatenate([result[1] for result in results]))
+
+
+def solve_puzzle_file(path: str | os.PathLike, batch_size: int = DEFAULT_IO_BATCH_SIZE,
+                      block_size: int = DEFAULT_BLOCK_SIZE, max_workers: int | None = None) -> Iterator[BatchSolution]:
+    """
+    Solves the puzzles of a puzzle file a batch at a time, as the file is read.
+
+    Args:
+        path: the path of the puzzle file, in either format of puzzle_io.
+        batch_size: the maximum number of puzzles read at a time.
+        block_size: the number of puzzles solved together.
+        max_workers: the number of worker processes, or None to solve every block in this process.
+
+    Returns:
+        an iterator over the solutions of each batch of puzzles, in file order.
+
+    Raises:
+        ValueError: if the file is not a valid puzzle file, or batch_size or block_size is not positive.
+    """
+    colour_codes: np.ndarray
+    for colour_codes in iter_puzzle_batches(path, batch_size):
+        yield solve_many(colour_codes, block_size, max_workers)
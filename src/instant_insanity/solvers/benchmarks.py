@@ -0,0 +1,157 @@
+"""
+This module benchmarks the search engines on random generalised puzzles.
+
+Each engine searches every puzzle to completion, and the benchmark records the number of solutions,
+the number of search nodes, and the wall time. A node is a choice placed in the grid by BitmaskEngine,
+and an option selected by ExactCoverEngine, so the node counts measure how much each search has to try.
+The searches can also be stopped after a number of solutions, to measure how soon each engine finds them.
+
+Run this module to print a table of the results for several puzzle sizes.
+"""
+import random
+import time
+from collections.abc import Callable, Iterator
+from dataclasses import dataclass
+from itertools import islice
+from typing import Protocol
+
+from instant_insanity.core.general_puzzle import GeneralPuzzle, GeneralPuzzleSpec, mk_random_general_puzzle_spec
+from instant_insanity.solvers.bitmask_solver import BitmaskEngine, PackedSolution
+from instant_insanity.solvers.exact_cover_solver import ExactCoverEngine
+from instant_insanity.solvers.general_solver import mk_general_cube_edges
+from instant_insanity.solvers.iterative_solver import mk_iterative_engine
+from instant_insanity.solvers.ordered_solver import IndexValueOrder, LeastConstrainingValueOrder, \
+    MostConstrainedCellOrder, mk_ordered_engine
+
+# the puzzle sizes benchmarked when this module is run
+DEFAULT_BENCHMARK_SIZES: list[int] = [4, 6, 8, 10, 12]
+
+# the number of random puzzles of each size
+DEFAULT_BENCHMARK_PUZZLES: int = 50
+
+
+class SearchEngine(Protocol):
+    """
+    The interface shared by the search engines.
+    """
+    node_count: int
+
+    def iter_solutions(self) -> Iterator[PackedSolution]:
+        ...
+
+
+def mk_bitmask_engine(puzzle: GeneralPuzzle) -> SearchEngine:
+    return BitmaskEngine(mk_general_cube_edges(puzzle), puzzle.n_colours)
+
+
+def mk_exact_cover_engine(puzzle: GeneralPuzzle) -> SearchEngine:
+    return ExactCoverEngine(puzzle)
+
+
+def mk_most_constrained_engine(puzzle: GeneralPuzzle) -> SearchEngine:
+    return mk_ordered_engine(puzzle, MostConstrainedCellOrder(), IndexValueOrder())
+
+
+def mk_least_constraining_engine(puzzle: GeneralPuzzle) -> SearchEngine:
+    return mk_ordered_engine(puzzle, MostConstrainedCellOrder(), LeastConstrainingValueOrder())
+
+
+# the engines compared by the benchmark, by name
+BENCHMARK_ENGINES: dict[str, Callable[[GeneralPuzzle], SearchEngine]] = {
+    'bitmask': mk_bitmask_engine,
+    'exact cover': mk_exact_cover_engine,
+    'iterative': mk_iterative_engine,
+    'most constrained': mk_most_constrained_engine,
+    'mc + lcv': mk_least_constraining_engine,
+}
+
+
+@dataclass
+class BenchmarkResult:
+    """
+    The totals for one engine over a set of puzzles.
+
+    Attributes:
+        engine_name: the name of the engine.
+        n_cubes: the number of cubes of each puzzle.
+        n_puzzles: the number of puzzles.
+        solution_count: the total number of solutions.
+        node_count: the total number of search nodes.
+        seconds: the total wall time.
+    """
+    engine_name: str
+    n_cubes: int
+    n_puzzles: int
+    solution_count: int
+    node_count: int
+    seconds: float
+
+
+def run_benchmark(n_cubes: int, n_puzzles: int = DEFAULT_BENCHMARK_PUZZLES, seed: int = 0,
+                  engines: dict[str, Callable[[GeneralPuzzle], SearchEngine]] | None = None,
+                  solution_limit: int | None = None) -> list[BenchmarkResult]:
+    """
+    Searches the same random puzzles with each engine.
+
+    Args:
+        n_cubes: the number of cubes, which is also the number of colours.
+        n_puzzles: the number of random puzzles.
+        seed: the random seed.
+        engines: the engines to compare, or None for BENCHMARK_ENGINES.
+        solution_limit: the number of solutions after which each search stops, or None to search to the end.
+
+    Returns:
+        the totals for each engine, in the order of the engines.
+    """
+    if engines is None:
+        engines = BENCHMARK_ENGINES
+    rng: random.Random = random.Random(seed)
+    puzzle_specs: list[GeneralPuzzleSpec] = [mk_random_general_puzzle_spec(n_cubes, rng) for _ in range(n_puzzles)]
+    puzzles: list[GeneralPuzzle] = [GeneralPuzzle(puzzle_spec) for puzzle_spec in puzzle_specs]
+
+    results: list[BenchmarkResult] = []
+    engine_name: str
+    mk_engine: Callable[[GeneralPuzzle], SearchEngine]
+    for engine_name, mk_engine in engines.items():
+        result: BenchmarkResult = BenchmarkResult(engine_name, n_cubes, n_puzzles, 0, 0, 0.0)
+        puzzle: GeneralPuzzle
+        for puzzle in puzzles:
+            start: float = time.perf_counter()
+            engine: SearchEngine = mk_engine(puzzle)
+            result.solution_count += sum(1 for _ in islice(engine.iter_solutions(), solution_limit))
+            result.seconds += time.perf_counter() - start
+            result.node_count += engine.node_count
+        results.append(result)
+    return results
+
+
+def format_results(results: list[BenchmarkResult]) -> str:
+    """
+    Formats benchmark results as a table.
+
+    Args:
+        results: the results.
+
+    Returns:
+        the table, with one line per result.
+    """
+    lines: list[str] = [f'{"cubes":>5} {"engine":<16} {"solutions":>9} {"nodes":>10} {"ms/puzzle":>10}']
+    result: BenchmarkResult
+    for result in results:
+        lines.append(f'{result.n_cubes:>5} {result.engine_name:<16} {result.solution_count:>9} '
+                     f'{result.node_count:>10} {1000 * result.seconds / result.n_puzzles:>10.3f}')
+    return '\n'.join(lines)
+
+
+if __name__ == "__main__":
+    all_results: list[BenchmarkResult] = []
+    size: int
+    for size in DEFAULT_BENCHMARK_SIZES:
+        all_results.extend(run_benchmark(size))
+    print(format_results(all_results))
+
+    print('Searching to the first solution.')
+    first_results: list[BenchmarkResult] = []
+    for size in DEFAULT_BENCHMARK_SIZES:
+        first_results.extend(run_benchmark(size, solution_limit=1))
+    print(format_results(first_results))
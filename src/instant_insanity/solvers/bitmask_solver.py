@@ -0,0 +1,310 @@
+"""
+This module implements a bitmask-encoded backtracking solver on the opposite-face graph.
+
+It searches the same grid as GraphSolver, in the same order and with the same rules for skipping
+redundant choices, so it finds the same solutions in the same order.
+The difference is in how the state is stored.
+GraphSolver rebuilds a dict spectrum for every choice it tries.
+This solver encodes the puzzle as small integers once and then never allocates while it checks a choice.
+
+Number the colours 0, 1, ..., n-1 and the axes X, Y, Z as 0, 1, 2.
+A spectrum is packed into a single int that holds a 4-bit counter for each colour,
+with colour i counted in bits 4i through 4i+3.
+The edge defined by a cube axis is packed the same way, as the spectrum of its two end colours.
+Adding an edge to a row is then one integer addition and removing it is one subtraction.
+
+A row spectrum is possible for a 2-factor if every counter is at most 2.
+A counter is at most 2 before an edge is added so it is at most 4 afterwards.
+Adding 5 to a counter between 0 and 4 sets its high bit exactly when the counter exceeds 2,
+without carrying into the next counter, so adding a packed 5 to every counter and masking
+the packed high bits checks all the colours at once.
+
+The engine itself works for any number of cubes and colours.
+BitmaskSolver adapts it to Puzzle and the Grid used by GraphSolver.
+"""
+from collections.abc import Iterator
+
+from instant_insanity.core.cube import FacePlane
+from instant_insanity.core.puzzle import Puzzle, AxisLabel, FaceColour, PuzzleCubeNumber, FaceColourPair, \
+    CARTEBLANCHE_PUZZLE, WINNING_MOVES_PUZZLE
+from instant_insanity.solvers.graph_solver import Grid, GRID_ROWS, GRID_COLUMNS
+
+# the number of bits in the counter for each colour
+COUNTER_BITS: int = 4
+
+# the axis labels in index order, so that AXIS_LABELS[i] is the label of axis i
+AXIS_LABELS: list[AxisLabel] = list(AxisLabel)
+Z_AXIS_INDEX: int = AXIS_LABELS.index(AxisLabel.Z)
+
+type AxisIndex = int
+type PackedSpectrum = int
+type PackedEdge = PackedSpectrum
+
+# the packed edges of a cube, indexed by axis index
+type CubeEdges = tuple[PackedEdge, PackedEdge, PackedEdge]
+
+# a solution lists the axis index in each grid cell, the front row followed by the top row
+type PackedSolution = tuple[AxisIndex, ...]
+
+
+def pack_counters(n_colours: int, value: int) -> PackedSpectrum:
+    """
+    Packs the same counter value for every colour.
+
+    Args:
+        n_colours: the number of colours.
+        value: the counter value, between 0 and 15.
+
+    Returns:
+        the packed spectrum in which every colour has the given count.
+    """
+    spectrum: PackedSpectrum = 0
+    for colour in range(n_colours):
+        spectrum |= value << (COUNTER_BITS * colour)
+    return spectrum
+
+
+def pack_edge(colour_1: int, colour_2: int) -> PackedEdge:
+    """
+    Packs the edge that joins two colours.
+    A loop, whose two colours are equal, adds 2 to the count of its colour.
+
+    Args:
+        colour_1: the index of the colour at one end of the edge.
+        colour_2: the index of the colour at the other end of the edge.
+
+    Returns:
+        the packed spectrum of the edge.
+    """
+    return (1 << (COUNTER_BITS * colour_1)) + (1 << (COUNTER_BITS * colour_2))
+
+
+def unpack_spectrum(spectrum: PackedSpectrum, n_colours: int) -> list[int]:
+    """
+    Unpacks a packed spectrum into a list of counts.
+
+    Args:
+        spectrum: the packed spectrum.
+        n_colours: the number of colours.
+
+    Returns:
+        the list of counts indexed by colour.
+    """
+    counter_mask: int = (1 << COUNTER_BITS) - 1
+    return [(spectrum >> (COUNTER_BITS * colour)) & counter_mask for colour in range(n_colours)]
+
+
+class BitmaskEngine:
+    """
+    This class searches for solutions of a puzzle given as packed cube edges.
+
+    The grid has two rows and one column per cube.
+    The cells are filled row by row, from left to right, trying the axes in index order.
+    The first cube is never given axis Z in the front row and its top axis must follow its front axis.
+    Every solution is therefore found once rather than once for each way of swapping the two rows.
+
+    Attributes:
+        cube_edges: the packed edges of each cube.
+        n_cubes: the number of cubes.
+        n_colours: the number of colours.
+        overflow_bias: the packed spectrum that adds 5 to every counter.
+        overflow_mask: the packed spectrum that selects the high bit of every counter.
+        node_count: the number of choices placed in the grid by the last search.
+    """
+    cube_edges: list[CubeEdges]
+    n_cubes: int
+    n_colours: int
+    overflow_bias: PackedSpectrum
+    overflow_mask: PackedSpectrum
+    node_count: int
+
+    def __init__(self, cube_edges: list[CubeEdges], n_colours: int) -> None:
+        """
+        Args:
+            cube_edges: the packed edges of each cube.
+            n_colours: the number of colours.
+
+        Raises:
+            ValueError: if the number of colours is not the number of cubes.
+        """
+        n_cubes: int = len(cube_edges)
+        if n_colours != n_cubes:
+            raise ValueError(f'Expected {n_cubes} colours, got: {n_colours}')
+
+        self.cube_edges = cube_edges
+        self.n_cubes = n_cubes
+        self.n_colours = n_colours
+        self.overflow_bias = pack_counters(n_colours, 5)
+        self.overflow_mask = pack_counters(n_colours, 1 << (COUNTER_BITS - 1))
+        self.node_count = 0
+
+    def iter_solutions(self) -> Iterator[PackedSolution]:
+        """
+        Searches the grid and yields each solution as soon as it is found.
+
+        Returns:
+            an iterator over the solutions.
+        """
+        self.node_count = 0
+        axes: list[AxisIndex] = []
+        yield from self._search_row(0, 0, 0, axes)
+
+    def _search_row(self, row: int, column: int, spectrum: PackedSpectrum,
+                    axes: list[AxisIndex]) -> Iterator[PackedSolution]:
+        """
+        Fills the grid from the given cell onwards.
+
+        Args:
+            row: the row index of the cell, 0 for the front row and 1 for the top row.
+            column: the column index of the cell.
+            spectrum: the packed spectrum of the cells already filled in this row.
+            axes: the axis indices already filled, in row-major order.
+
+        Returns:
+            an iterator over the solutions that extend the filled cells.
+        """
+        if column == self.n_cubes:
+            if row == 0:
+                yield from self._search_row(1, 0, 0, axes)
+            else:
+                yield tuple(axes)
+            return
+
+        edges: CubeEdges = self.cube_edges[column]
+        bias: PackedSpectrum = self.overflow_bias
+        mask: PackedSpectrum = self.overflow_mask
+        axis: AxisIndex
+        for axis in range(3):
+            if row == 0:
+                # the rows can be swapped so the first cube never needs axis Z in the front row
+                if column == 0 and axis == Z_AXIS_INDEX:
+                    continue
+            else:
+                front_axis: AxisIndex = axes[column]
+                # the first cube's axes are strictly ordered to avoid finding each solution twice
+                if column == 0 and axis < front_axis:
+                    continue
+                # an axis can't be in both rows
+                if axis == front_axis:
+                    continue
+
+            total: PackedSpectrum = spectrum + edges[axis]
+            if (total + bias) & mask:
+                continue
+
+            self.node_count += 1
+            axes.append(axis)
+            yield from self._search_row(row, column + 1, total, axes)
+            axes.pop()
+
+
+def mk_cube_edges(puzzle: Puzzle, colours: list[FaceColour]) -> list[CubeEdges]:
+    """
+    Packs the edges of each cube of a puzzle.
+
+    Args:
+        puzzle: the puzzle.
+        colours: the puzzle colours, whose list positions are the colour indices.
+
+    Returns:
+        the packed edges of each cube in cube number order.
+    """
+    colour_to_index: dict[FaceColour, int] = {colour: index for index, colour in enumerate(colours)}
+    cube_edges: list[CubeEdges] = []
+    cube_number: PuzzleCubeNumber
+    for cube_number in PuzzleCubeNumber:
+        axis_to_pair: dict[AxisLabel, FaceColourPair] = \
+            puzzle.number_to_cube[cube_number].get_axis_to_face_colour_pair()
+        edges: list[PackedEdge] = []
+        for axis_label in AXIS_LABELS:
+            colour_1: FaceColour
+            colour_2: FaceColour
+            colour_1, colour_2 = axis_to_pair[axis_label]
+            edges.append(pack_edge(colour_to_index[colour_1], colour_to_index[colour_2]))
+        cube_edges.append((edges[0], edges[1], edges[2]))
+    return cube_edges
+
+
+def mk_grid(solution: PackedSolution) -> Grid:
+    """
+    Converts a packed solution into a grid.
+
+    Args:
+        solution: the packed solution of a four-cube puzzle.
+
+    Returns:
+        the grid that has the same axis in each cell.
+    """
+    n_columns: int = len(GRID_COLUMNS)
+    grid: Grid = {}
+    row_index: int
+    row: FacePlane
+    for row_index, row in enumerate(GRID_ROWS):
+        column_index: int
+        column: PuzzleCubeNumber
+        for column_index, column in enumerate(GRID_COLUMNS):
+            grid[(row, column)] = AXIS_LABELS[solution[row_index * n_columns + column_index]]
+    return grid
+
+
+class BitmaskSolver:
+    """
+    This class solves a Puzzle with a BitmaskEngine.
+    It finds the same solutions as GraphSolver, in the same order, but it neither journals nor prints them.
+
+    Attributes:
+        puzzle: the puzzle.
+        colours: the puzzle colours in enum order.
+        engine: the search engine.
+        solutions: the solutions found by solve().
+    """
+    puzzle: Puzzle
+    colours: list[FaceColour]
+    engine: BitmaskEngine
+    solutions: list[Grid]
+
+    def __init__(self, puzzle: Puzzle) -> None:
+        """
+        Args:
+            puzzle: the puzzle.
+
+        Raises:
+            ValueError: if the puzzle does not have four colours.
+        """
+        self.puzzle = puzzle
+        self.colours = sorted(puzzle.get_colours(), key=list(FaceColour).index)
+        self.engine = BitmaskEngine(mk_cube_edges(puzzle, self.colours), len(self.colours))
+        self.solutions = []
+
+    def iter_solutions(self) -> Iterator[Grid]:
+        """
+        Searches the puzzle and yields each solution as soon as it is found.
+
+        Returns:
+            an iterator over the solution grids.
+        """
+        solution: PackedSolution
+        for solution in self.engine.iter_solutions():
+            yield mk_grid(solution)
+
+    def solve(self) -> None:
+        """
+        Solve the puzzle.
+        """
+        self.solutions.extend(self.iter_solutions())
+
+
+if __name__ == "__main__":
+    separator_line: str = '-' * 80
+    name: str
+    puzzle: Puzzle
+    for name, puzzle in [('Winning Moves', WINNING_MOVES_PUZZLE), ('Carteblanche', CARTEBLANCHE_PUZZLE)]:
+        print(separator_line)
+        print(f'Solving {name} puzzle.')
+        solver: BitmaskSolver = BitmaskSolver(puzzle)
+        solver.solve()
+        for index, grid in enumerate(solver.solutions, start=1):
+            print(f'Solution #{index}:')
+            for grid_row in GRID_ROWS:
+                print(' '.join(str(grid[(grid_row, grid_column)]) for grid_column in GRID_COLUMNS))
+    print(separator_line)
@@ -0,0 +1,175 @@
+"""
+This module implements a vectorised brute-force solver that checks every way to orient the cubes.
+
+It shares nothing with the graph formulation used by GraphSolver, so it serves as an independent
+oracle for cross-checking GraphSolver and the solvers derived from it.
+
+The cubes are lined up along the RIGHT axis, so the visible faces of each cube are the
+front, top, back, and bottom faces. A stack solves the puzzle if each of these four sides
+shows every colour once. For each cube, the colours on its four visible faces are precomputed
+for each of its 24 orientations, and encoded as one-hot bit masks.
+Every combination of orientations is then checked at once by broadcasting the bitwise OR of the masks
+of the four cubes across a (24, 24, 24, 24, 4) array, which solves the side if the OR has every colour bit set.
+
+Applying the same rotation to every cube keeps the visible faces visible if it maps the
+left-right axis to itself. These rotations form a group of order 8 that maps solutions to solutions,
+and its orbits are exactly the cosets of the orientations of the first cube that share its hidden axis.
+The reduced check therefore gives the first cube one orientation per hidden axis,
+which leaves 3 * 24^3 = 41,472 of the 24^4 = 331,776 combinations.
+
+An orientation combination determines a grid, whose front row lists the axis on the front face
+of each cube and whose top row lists the axis on the top face. Many combinations give the same grid,
+and the symmetries swap the two rows, so the rows are swapped if needed to put the first cube's
+front axis before its top axis. The resulting set of grids is exactly the list of solutions found by GraphSolver.
+"""
+import numpy as np
+
+from instant_insanity.core.cube import FacePlane
+from instant_insanity.core.cube_rotations import ORIENTATION_MAPPINGS, PlaneToLabelMapping
+from instant_insanity.core.puzzle import FaceColour, FACE_LABEL_AXIS, Puzzle, PuzzleCube, PuzzleCubeNumber, \
+    CARTEBLANCHE_PUZZLE, WINNING_MOVES_PUZZLE
+from instant_insanity.solvers.bitmask_solver import AXIS_LABELS, PackedSolution, mk_grid
+from instant_insanity.solvers.graph_solver import Grid, GRID_ROWS, GRID_COLUMNS
+
+# the visible face planes, listed around the stack
+VISIBLE_PLANES: list[FacePlane] = [FacePlane.FRONT, FacePlane.TOP, FacePlane.BACK, FacePlane.BOTTOM]
+
+# the number of orientations of a cube
+N_ORIENTATIONS: int = len(ORIENTATION_MAPPINGS)
+
+# the number of colours in a solvable puzzle
+N_COLOURS: int = len(GRID_COLUMNS)
+
+
+def get_axis_index(mapping: PlaneToLabelMapping, plane: FacePlane) -> int:
+    """
+    Gets the index of the axis of the face on a plane.
+
+    Args:
+        mapping: the face plane to label mapping of an orientation.
+        plane: the face plane.
+
+    Returns:
+        the index in AXIS_LABELS of the axis of the face.
+    """
+    return AXIS_LABELS.index(FACE_LABEL_AXIS[mapping[plane]])
+
+
+# the front and top axis indices of each orientation, with shape (24, 2)
+ORIENTATION_AXES: np.ndarray = np.array([[get_axis_index(mapping, row) for row in GRID_ROWS]
+                                         for mapping in ORIENTATION_MAPPINGS], dtype=np.int8)
+
+# the first orientation whose hidden axis is each axis, in axis order
+HIDDEN_AXIS_REPRESENTATIVES: np.ndarray = np.array([
+    [get_axis_index(mapping, FacePlane.RIGHT) for mapping in ORIENTATION_MAPPINGS].index(axis_index)
+    for axis_index in range(len(AXIS_LABELS))
+])
+
+
+def mk_orientation_colours(puzzle_cube: PuzzleCube, colours: list[FaceColour]) -> np.ndarray:
+    """
+    Makes the colours on the visible faces of a cube in each orientation.
+
+    Args:
+        puzzle_cube: the cube.
+        colours: the puzzle colours, whose list positions are the colour indices.
+
+    Returns:
+        the colour index on each visible face plane in each orientation, with shape (24, 4).
+    """
+    return np.array([[colours.index(puzzle_cube.face_label_to_colour[mapping[plane]]) for plane in VISIBLE_PLANES]
+                     for mapping in ORIENTATION_MAPPINGS], dtype=np.uint8)
+
+
+class BruteForceSolver:
+    """
+    This class solves a puzzle by checking every combination of cube orientations at once.
+
+    Attributes:
+        puzzle: the puzzle.
+        colours: the puzzle colours in enum order.
+        orientation_colours: the colour index on each visible face plane of each cube in each orientation,
+            with shape (4, 24, 4).
+        solutions: the solutions found by solve().
+    """
+    puzzle: Puzzle
+    colours: list[FaceColour]
+    orientation_colours: np.ndarray
+    solutions: list[Grid]
+
+    def __init__(self, puzzle: Puzzle) -> None:
+        """
+        Args:
+            puzzle: the puzzle.
+
+        Raises:
+            ValueError: if the puzzle does not have four colours.
+        """
+        self.puzzle = puzzle
+        self.colours = sorted(puzzle.get_colours(), key=list(FaceColour).index)
+        if len(self.colours) != N_COLOURS:
+            raise ValueError(f'Expected {N_COLOURS} colours, got: {len(self.colours)}')
+        self.orientation_colours = np.stack([mk_orientation_colours(puzzle.number_to_cube[cube_number], self.colours)
+                                             for cube_number in PuzzleCubeNumber])
+        self.solutions = []
+
+    def find_orientations(self, reduced: bool = True) -> np.ndarray:
+        """
+        Finds the orientation combinations that solve the puzzle.
+
+        Args:
+            reduced: if True, give the first cube one orientation per hidden axis,
+                otherwise check all 24^4 combinations.
+
+        Returns:
+            the orientation index of each cube in each solving combination, with shape (n, 4).
+        """
+        masks: np.ndarray = np.left_shift(np.uint8(1), self.orientation_colours)
+        first_orientations: np.ndarray = HIDDEN_AXIS_REPRESENTATIVES if reduced else np.arange(N_ORIENTATIONS)
+        combined: np.ndarray = (masks[0][first_orientations][:, None, None, None, :]
+                                | masks[1][None, :, None, None, :]
+                                | masks[2][None, None, :, None, :]
+                                | masks[3][None, None, None, :, :])
+        is_solved: np.ndarray = np.all(combined == (1 << N_COLOURS) - 1, axis=-1)
+        orientations: np.ndarray = np.argwhere(is_solved)
+        orientations[:, 0] = first_orientations[orientations[:, 0]]
+        return orientations
+
+    def find_packed_solutions(self) -> list[PackedSolution]:
+        """
+        Finds the distinct solutions, with the rows swapped if needed to put the first cube's
+        front axis before its top axis.
+
+        Returns:
+            the packed solutions in increasing order, which is the order GraphSolver finds them.
+        """
+        orientations: np.ndarray = self.find_orientations()
+        axes: np.ndarray = ORIENTATION_AXES[orientations]
+        rows: np.ndarray = np.swapaxes(axes, 1, 2)
+        is_swapped: np.ndarray = rows[:, 0, 0] > rows[:, 1, 0]
+        rows[is_swapped] = rows[is_swapped][:, ::-1, :]
+        packed: np.ndarray = np.unique(rows.reshape(len(rows), 2 * len(GRID_COLUMNS)), axis=0)
+        return [tuple(int(axis) for axis in row) for row in packed]
+
+    def solve(self) -> None:
+        """
+        Solve the puzzle.
+        """
+        self.solutions.extend(mk_grid(solution) for solution in self.find_packed_solutions())
+
+
+if __name__ == "__main__":
+    separator_line: str = '-' * 80
+    name: str
+    puzzle: Puzzle
+    for name, puzzle in [('Winning Moves', WINNING_MOVES_PUZZLE), ('Carteblanche', CARTEBLANCHE_PUZZLE)]:
+        print(separator_line)
+        solver: BruteForceSolver = BruteForceSolver(puzzle)
+        print(f'Solving {name} puzzle: {len(solver.find_orientations(reduced=False))} of '
+              f'{N_ORIENTATIONS ** len(GRID_COLUMNS)} orientation combinations solve it.')
+        solver.solve()
+        for index, grid in enumerate(solver.solutions, start=1):
+            print(f'Solution #{index}:')
+            for grid_row in GRID_ROWS:
+                print(' '.join(str(grid[(grid_row, grid_column)]) for grid_column in GRID_COLUMNS))
+    print(separator_line)
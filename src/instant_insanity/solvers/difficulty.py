@@ -0,0 +1,96 @@
+"""
+This module rates the difficulty of puzzles from the statistics of GraphSolver's search.
+
+The search is journalled to a SearchMetrics sink, which only keeps counters,
+so rating a puzzle costs little more than searching it and nothing is allocated per search node.
+
+The difficulty of a puzzle is the number of search nodes that GraphSolver tries per solution it finds.
+A puzzle with many solutions, or one whose dead ends are pruned early, is easy,
+and a puzzle whose single solution is hidden among many promising partial grids is hard.
+A puzzle with no solution has infinite difficulty.
+"""
+import math
+from collections.abc import Iterable
+
+from instant_insanity.core.puzzle import Puzzle, PuzzleSpec, CARTEBLANCHE_PUZZLE, WINNING_MOVES_PUZZLE
+from instant_insanity.solvers.graph_solver import Action, GraphSolver, SearchMetrics, GRID_COLUMNS, PRUNE_ACTIONS
+
+
+def mk_search_metrics(puzzle: Puzzle) -> SearchMetrics:
+    """
+    Searches a puzzle to the end and collects the statistics of the search.
+
+    Args:
+        puzzle: the puzzle.
+
+    Returns:
+        the search metrics.
+
+    Raises:
+        ValueError: if the puzzle does not have four colours.
+    """
+    if len(puzzle.get_colours()) != len(GRID_COLUMNS):
+        raise ValueError(f'Expected {len(GRID_COLUMNS)} colours, got: {len(puzzle.get_colours())}')
+    metrics: SearchMetrics = SearchMetrics()
+    GraphSolver(puzzle, metrics).count_solutions()
+    return metrics
+
+
+def get_difficulty(metrics: SearchMetrics) -> float:
+    """
+    Derives the difficulty score from search metrics.
+
+    Args:
+        metrics: the metrics of a complete search.
+
+    Returns:
+        the number of search nodes per solution, or infinity if there is no solution.
+    """
+    if metrics.solution_count == 0:
+        return math.inf
+    return metrics.get_node_count() / metrics.solution_count
+
+
+def difficulty(puzzle: Puzzle) -> float:
+    """
+    Rates the difficulty of a puzzle.
+
+    Args:
+        puzzle: the puzzle.
+
+    Returns:
+        the number of search nodes per solution, or infinity if there is no solution.
+
+    Raises:
+        ValueError: if the puzzle does not have four colours.
+    """
+    return get_difficulty(mk_search_metrics(puzzle))
+
+
+def rate_puzzles(puzzle_specs: Iterable[PuzzleSpec]) -> list[float]:
+    """
+    Rates the difficulty of many puzzles.
+
+    Args:
+        puzzle_specs: the puzzle specifications, which may be streamed.
+
+    Returns:
+        the difficulty of each puzzle, in order.
+
+    Raises:
+        ValueError: if any specification is invalid or does not have four colours.
+    """
+    return [difficulty(Puzzle(puzzle_spec)) for puzzle_spec in puzzle_specs]
+
+
+if __name__ == "__main__":
+    name: str
+    puzzle: Puzzle
+    for name, puzzle in [('Winning Moves', WINNING_MOVES_PUZZLE), ('Carteblanche', CARTEBLANCHE_PUZZLE)]:
+        search_metrics: SearchMetrics = mk_search_metrics(puzzle)
+        print(f'The {name} puzzle has difficulty {get_difficulty(search_metrics):.1f}.')
+        print(f'  nodes per depth: {search_metrics.node_counts}')
+        print(f'  branching factors: {[round(factor, 2) for factor in search_metrics.get_branching_factors()]}')
+        action: Action
+        for action in PRUNE_ACTIONS:
+            print(f'  {action.name}: {search_metrics.prune_counts[action]}')
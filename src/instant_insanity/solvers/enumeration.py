@@ -0,0 +1,473 @@
+"""
+This module enumerates every four-cube puzzle that uses four colours, up to symmetry,
+and classifies each one by its number of solutions.
+
+Naively there are 4^24 specifications, but most of them are equivalent.
+Rotating a cube, reordering the cubes, or renaming the colours does not change the number of solutions,
+so only one puzzle from each equivalence class needs to be solved.
+
+The enumeration works with cube classes rather than cube specifications.
+A cube class is the set of all specifications of the same cube in its 24 orientations,
+represented by its least specification. With four colours there are 4^6 = 4096 cube specifications
+that fall into 240 cube classes, numbered in the order of their representatives.
+Since the cubes can be reordered, a puzzle up to rotations and reordering is a sorted
+quadruple of class numbers.
+
+Renaming the colours permutes the classes. A quadruple is canonical if no renaming
+turns it into a smaller sorted quadruple, and exactly one quadruple in each equivalence class is canonical.
+Quadruples are generated in order and kept only if they are canonical and use all four colours.
+This keeps the first class no larger than any class in its renaming orbit,
+so the only possible first classes are the least classes of their orbits.
+
+The work is split into shards, one per choice of the first two classes.
+Each shard is classified independently and saved to its own NumPy .npz file in a directory,
+which acts as the checkpoint. A run that is interrupted can be resumed because shards
+whose files exist are skipped. The files are written under a temporary name and then renamed,
+so an interrupted write never leaves a partial shard behind.
+"""
+import multiprocessing
+import os
+from dataclasses import dataclass
+from functools import cache
+from itertools import permutations, product
+from pathlib import Path
+
+import numpy as np
+
+from instant_insanity.core.puzzle import PuzzleSpec, PuzzleCubeSpec
+from instant_insanity.core.puzzle_symmetry import CANONICAL_COLOUR_SYMBOLS, SPEC_PERMUTATIONS, \
+    normalise_puzzle_spec, rotate_cube_spec
+from instant_insanity.solvers.bitmask_solver import BitmaskEngine, CubeEdges, pack_edge
+
+# the number of cubes and colours in the enumerated puzzles
+N_CUBES: int = 4
+
+# the colour symbols of the enumerated puzzles
+ENUMERATION_COLOUR_SYMBOLS: str = CANONICAL_COLOUR_SYMBOLS[:N_CUBES]
+
+# the colour mask of a puzzle that uses every colour
+ALL_COLOURS_MASK: int = (1 << N_CUBES) - 1
+
+# the base used to pack a sorted quadruple of class numbers into a single integer key
+CLASS_KEY_BASE: int = 256
+
+# the file name prefix and suffix of a shard file
+SHARD_FILE_PREFIX: str = 'shard'
+SHARD_FILE_SUFFIX: str = '.npz'
+
+# a shard is identified by the class numbers of its first two cubes
+type Shard = tuple[int, int]
+
+# a puzzle is identified by the sorted class numbers of its cubes
+type CubeClasses = tuple[int, int, int, int]
+
+
+def get_least_rotation(cube_spec: PuzzleCubeSpec) -> PuzzleCubeSpec:
+    """
+    Gets the least specification of a cube over its 24 orientations.
+
+    Args:
+        cube_spec: the cube specification.
+
+    Returns:
+        the least specification of the cube.
+    """
+    return min(rotate_cube_spec(cube_spec, orientation_index)
+               for orientation_index in range(len(SPEC_PERMUTATIONS)))
+
+
+@dataclass(frozen=True)
+class CubeClassTables:
+    """
+    The lookup tables of the cube classes.
+
+    Attributes:
+        cube_specs: the representative specification of each class.
+        colour_masks: the bit mask of the colours used by each class.
+        renamings: the class that each colour renaming sends each class to, with shape (24, n_classes).
+        orbit_minimums: the least class that any renaming sends each class to.
+        cube_edges: the packed edges of each class's representative.
+    """
+    cube_specs: list[PuzzleCubeSpec]
+    colour_masks: np.ndarray
+    renamings: np.ndarray
+    orbit_minimums: np.ndarray
+    cube_edges: list[CubeEdges]
+
+    @property
+    def n_classes(self) -> int:
+        return len(self.cube_specs)
+
+    def get_class(self, cube_spec: PuzzleCubeSpec) -> int:
+        """
+        Gets the class of a cube specification written with the enumeration colour symbols.
+
+        Args:
+            cube_spec: the cube specification.
+
+        Returns:
+            the class number.
+        """
+        return self.cube_specs.index(get_least_rotation(cube_spec))
+
+
+def mk_cube_class_tables() -> CubeClassTables:
+    """
+    Makes the lookup tables of the cube classes.
+
+    Returns:
+        the lookup tables.
+    """
+    # label every specification with the representative of its class, rotating each class once
+    spec_to_representative: dict[PuzzleCubeSpec, PuzzleCubeSpec] = {}
+    symbols: tuple[str, ...]
+    for symbols in product(ENUMERATION_COLOUR_SYMBOLS, repeat=6):
+        cube_spec: PuzzleCubeSpec = ''.join(symbols)
+        if cube_spec not in spec_to_representative:
+            rotations: list[PuzzleCubeSpec] = [rotate_cube_spec(cube_spec, orientation_index)
+                                               for orientation_index in range(len(SPEC_PERMUTATIONS))]
+            representative: PuzzleCubeSpec = min(rotations)
+            for rotation in rotations:
+                spec_to_representative[rotation] = representative
+
+    cube_specs: list[PuzzleCubeSpec] = sorted(set(spec_to_representative.values()))
+    representative_to_class: dict[PuzzleCubeSpec, int] = {cube_spec: index
+                                                          for index, cube_spec in enumerate(cube_specs)}
+
+    colour_masks: np.ndarray = np.array(
+        [sum(1 << ENUMERATION_COLOUR_SYMBOLS.index(symbol) for symbol in set(cube_spec))
+         for cube_spec in cube_specs], dtype=np.int64)
+
+    renaming_rows: list[list[int]] = []
+    renamed_symbols: tuple[str, ...]
+    for renamed_symbols in permutations(ENUMERATION_COLOUR_SYMBOLS):
+        table: dict[int, int] = str.maketrans(ENUMERATION_COLOUR_SYMBOLS, ''.join(renamed_symbols))
+        renaming_rows.append([representative_to_class[spec_to_representative[cube_spec.translate(table)]]
+                              for cube_spec in cube_specs])
+    renamings: np.ndarray = np.array(renaming_rows, dtype=np.int64)
+
+    # the two faces of an axis are at adjacent positions in FaceLabel order
+    cube_edges: list[CubeEdges] = []
+    for cube_spec in cube_specs:
+        colours: list[int] = [ENUMERATION_COLOUR_SYMBOLS.index(symbol) for symbol in cube_spec]
+        cube_edges.append((pack_edge(colours[0], colours[1]),
+                           pack_edge(colours[2], colours[3]),
+                           pack_edge(colours[4], colours[5])))
+
+    return CubeClassTables(
+        cube_specs=cube_specs,
+        colour_masks=colour_masks,
+        renamings=renamings,
+        orbit_minimums=renamings.min(axis=0),
+        cube_edges=cube_edges,
+    )
+
+
+@cache
+def get_cube_class_tables() -> CubeClassTables:
+    """
+    Gets the cube class lookup tables, which are made on first use since they take a few seconds to make.
+
+    Returns:
+        the shared tables.
+    """
+    return mk_cube_class_tables()
+
+
+def mk_class_keys(cube_classes: np.ndarray) -> np.ndarray:
+    """
+    Packs sorted quadruples of class numbers into integer keys that compare in the same order.
+
+    Args:
+        cube_classes: the quadruples, with shape (..., 4).
+
+    Returns:
+        the keys, with shape (...).
+    """
+    keys: np.ndarray = np.zeros(cube_classes.shape[:-1], dtype=np.int64)
+    column: int
+    for column in range(N_CUBES):
+        keys = keys * CLASS_KEY_BASE + cube_classes[..., column]
+    return keys
+
+
+def get_canonical_cube_classes(puzzle_spec: PuzzleSpec, tables: CubeClassTables | None = None) -> CubeClasses:
+    """
+    Gets the canonical quadruple of class numbers of a four-colour puzzle.
+
+    Args:
+        puzzle_spec: the puzzle specification, which must use exactly four colours.
+        tables: the cube class lookup tables, or None for the shared tables.
+
+    Returns:
+        the canonical quadruple.
+
+    Raises:
+        ValueError: if the specification is not a valid PuzzleSpec with four colours.
+    """
+    if tables is None:
+        tables = get_cube_class_tables()
+    cube_specs: PuzzleSpec = normalise_puzzle_spec(puzzle_spec)
+    symbols: str = ''.join(sorted(set(''.join(cube_specs))))
+    if len(symbols) != N_CUBES:
+        raise ValueError(f'Expected {N_CUBES} colours, got: {len(symbols)}')
+    table: dict[int, int] = str.maketrans(symbols, ENUMERATION_COLOUR_SYMBOLS)
+    cube_classes: np.ndarray = np.array([tables.get_class(cube_spec.translate(table)) for cube_spec in cube_specs])
+    images: np.ndarray = np.sort(tables.renamings[:, cube_classes], axis=1)
+    least: np.ndarray = images[np.argmin(mk_class_keys(images))]
+    return int(least[0]), int(least[1]), int(least[2]), int(least[3])
+
+
+def mk_shards(tables: CubeClassTables | None = None) -> list[Shard]:
+    """
+    Makes the shards that can contain canonical quadruples.
+
+    Args:
+        tables: the cube class lookup tables, or None for the shared tables.
+
+    Returns:
+        the shards in increasing order.
+    """
+    if tables is None:
+        tables = get_cube_class_tables()
+    shards: list[Shard] = []
+    first: int
+    for first in np.unique(tables.orbit_minimums):
+        second: int
+        for second in range(int(first), tables.n_classes):
+            if tables.orbit_minimums[second] >= first:
+                shards.append((int(first), second))
+    return shards
+
+
+def enumerate_shard(shard: Shard, tables: CubeClassTables | None = None) -> np.ndarray:
+    """
+    Enumerates the canonical quadruples of a shard that use every colour.
+
+    Args:
+        shard: the shard.
+        tables: the cube class lookup tables, or None for the shared tables.
+
+    Returns:
+        the quadruples in increasing order, with shape (n, 4).
+    """
+    if tables is None:
+        tables = get_cube_class_tables()
+    first: int
+    second: int
+    first, second = shard
+
+    # any class after the second is a candidate unless a renaming sends it below the first
+    candidates: np.ndarray = np.flatnonzero(tables.orbit_minimums >= first)
+    candidates = candidates[candidates >= second]
+    third_indices: np.ndarray
+    fourth_indices: np.ndarray
+    third_indices, fourth_indices = np.triu_indices(len(candidates))
+    n_quadruples: int = len(third_indices)
+    cube_classes: np.ndarray = np.stack([
+        np.full(n_quadruples, first),
+        np.full(n_quadruples, second),
+        candidates[third_indices],
+        candidates[fourth_indices],
+    ], axis=1)
+
+    colour_masks: np.ndarray = np.bitwise_or.reduce(tables.colour_masks[cube_classes], axis=1)
+    cube_classes = cube_classes[colour_masks == ALL_COLOURS_MASK]
+
+    renamed_keys: np.ndarray = mk_class_keys(np.sort(tables.renamings[:, cube_classes], axis=2))
+    is_canonical: np.ndarray = renamed_keys.min(axis=0) == mk_class_keys(cube_classes)
+    return cube_classes[is_canonical].astype(np.uint8)
+
+
+def count_solutions(cube_classes: CubeClasses, tables: CubeClassTables | None = None) -> int:
+    """
+    Counts the solutions of the puzzle made of the representatives of some cube classes.
+
+    Args:
+        cube_classes: the class numbers.
+        tables: the cube class lookup tables, or None for the shared tables.
+
+    Returns:
+        the number of solutions.
+    """
+    if tables is None:
+        tables = get_cube_class_tables()
+    engine: BitmaskEngine = BitmaskEngine([tables.cube_edges[cube_class] for cube_class in cube_classes], N_CUBES)
+    return sum(1 for _ in engine.iter_solutions())
+
+
+def classify_shard(shard: Shard) -> tuple[Shard, np.ndarray, np.ndarray]:
+    """
+    Enumerates a shard and counts the solutions of each of its puzzles.
+
+    Args:
+        shard: the shard.
+
+    Returns:
+        the shard, its quadruples, and the solution count of each quadruple.
+    """
+    cube_classes: np.ndarray = enumerate_shard(shard)
+    solution_counts: np.ndarray = np.array([count_solutions((int(first), int(second), int(third), int(fourth)))
+                                            for first, second, third, fourth in cube_classes], dtype=np.uint16)
+    return shard, cube_classes, solution_counts
+
+
+def get_shard_path(directory: Path, shard: Shard) -> Path:
+    """
+    Gets the path of the file that holds the results of a shard.
+
+    Args:
+        directory: the checkpoint directory.
+        shard: the shard.
+
+    Returns:
+        the path of the shard file.
+    """
+    first: int
+    second: int
+    first, second = shard
+    return directory / f'{SHARD_FILE_PREFIX}_{first:03d}_{second:03d}{SHARD_FILE_SUFFIX}'
+
+
+def save_shard(directory: Path, shard: Shard, cube_classes: np.ndarray, solution_counts: np.ndarray) -> None:
+    """
+    Saves the results of a shard, replacing the file only once it is complete.
+
+    Args:
+        directory: the checkpoint directory.
+        shard: the shard.
+        cube_classes: the quadruples of the shard.
+        solution_counts: the solution count of each quadruple.
+    """
+    path: Path = get_shard_path(directory, shard)
+    temporary_path: Path = path.with_name(path.name + '.tmp')
+    with open(temporary_path, 'wb') as file:
+        np.savez(file, cube_classes=cube_classes, solution_counts=solution_counts)
+    os.replace(temporary_path, path)
+
+
+def run_enumeration(directory: Path, processes: int | None = None, shards: list[Shard] | None = None) -> int:
+    """
+    Classifies every shard that has not been saved yet.
+
+    Args:
+        directory: the checkpoint directory, which is created if needed.
+        processes: the number of worker processes, None for one per CPU, or 1 to work in this process.
+        shards: the shards to classify, or None for all of them.
+
+    Returns:
+        the number of shards classified by this run.
+    """
+    directory.mkdir(parents=True, exist_ok=True)
+    if shards is None:
+        shards = mk_shards()
+    pending: list[Shard] = [shard for shard in shards if not get_shard_path(directory, shard).exists()]
+
+    shard: Shard
+    cube_classes: np.ndarray
+    solution_counts: np.ndarray
+    if processes == 1:
+        for shard in pending:
+            save_shard(directory, *classify_shard(shard))
+    else:
+        with multiprocessing.Pool(processes) as pool:
+            for shard, cube_classes, solution_counts in pool.imap_unordered(classify_shard, pending):
+                save_shard(directory, shard, cube_classes, solution_counts)
+    return len(pending)
+
+
+@dataclass(frozen=True)
+class EnumerationResults:
+    """
+    The columns of the enumeration results.
+
+    Attributes:
+        cube_classes: the canonical quadruple of each puzzle, with shape (n, 4).
+        solution_counts: the number of solutions of each puzzle, with shape (n,).
+    """
+    cube_classes: np.ndarray
+    solution_counts: np.ndarray
+
+    def get_puzzle_spec(self, index: int, tables: CubeClassTables | None = None) -> PuzzleSpec:
+        """
+        Gets the specification of a puzzle.
+
+        Args:
+            index: the row of the puzzle.
+            tables: the cube class lookup tables, or None for the shared tables.
+
+        Returns:
+            the puzzle specification, made of the class representatives.
+        """
+        if tables is None:
+            tables = get_cube_class_tables()
+        return [tables.cube_specs[cube_class] for cube_class in self.cube_classes[index]]
+
+    def get_histogram(self) -> dict[int, int]:
+        """
+        Counts the puzzles that have each number of solutions.
+
+        Returns:
+            maps each number of solutions to the number of puzzles that have it.
+        """
+        counts: np.ndarray
+        frequencies: np.ndarray
+        counts, frequencies = np.unique(self.solution_counts, return_counts=True)
+        return {int(count): int(frequency) for count, frequency in zip(counts, frequencies)}
+
+
+def load_results(directory: Path, shards: list[Shard] | None = None) -> EnumerationResults:
+    """
+    Loads the saved shards in shard order.
+
+    Args:
+        directory: the checkpoint directory.
+        shards: the shards to load, or None for all of them.
+
+    Returns:
+        the concatenated results.
+
+    Raises:
+        ValueError: if any of the shards has not been saved.
+    """
+    if shards is None:
+        shards = mk_shards()
+    cube_classes: list[np.ndarray] = []
+    solution_counts: list[np.ndarray] = []
+    shard: Shard
+    for shard in shards:
+        path: Path = get_shard_path(directory, shard)
+        if not path.exists():
+            raise ValueError(f'Shard {shard} has not been saved in {directory}')
+        with np.load(path) as data:
+            cube_classes.append(data['cube_classes'])
+            solution_counts.append(data['solution_counts'])
+    return EnumerationResults(
+        cube_classes=np.concatenate(cube_classes) if cube_classes else np.empty((0, N_CUBES), dtype=np.uint8),
+        solution_counts=np.concatenate(solution_counts) if solution_counts else np.empty(0, dtype=np.uint16),
+    )
+
+
+def write_results(results: EnumerationResults, output_path: Path, tables: CubeClassTables | None = None) -> None:
+    """
+    Writes the results to a single columnar .npz file.
+
+    The file has a column of puzzle specifications, each the four representatives joined into one string,
+    a column of class quadruples, and a column of solution counts.
+
+    Args:
+        results: the results.
+        output_path: the path of the output file.
+        tables: the cube class lookup tables, or None for the shared tables.
+    """
+    if tables is None:
+        tables = get_cube_class_tables()
+    cube_specs: np.ndarray = np.array(tables.cube_specs)
+    puzzle_specs: np.ndarray = np.char.add(np.char.add(cube_specs[results.cube_classes[:, 0]],
+                                                       cube_specs[results.cube_classes[:, 1]]),
+                                           np.char.add(cube_specs[results.cube_classes[:, 2]],
+                                                       cube_specs[results.cube_classes[:, 3]]))
+    np.savez_compressed(output_path,
+                        puzzle_specs=puzzle_specs,
+                        cube_classes=results.cube_classes,
+                        solution_counts=results.solution_counts)
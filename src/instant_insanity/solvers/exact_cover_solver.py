@@ -0,0 +1,366 @@
+"""
+This module solves puzzles as exact cover problems with multiplicities, using Knuth's Algorithm X.
+
+GraphSolver fills a grid with two rows, one for the front-back faces and one for the top-bottom faces,
+and one column per cube. The constraints are exactly those of an exact cover problem:
+
+* each grid cell gets exactly one axis,
+* each colour has degree exactly 2 in each row, and
+* each cube axis is used in at most one row.
+
+An option puts an axis in a cell. It covers the cell once, covers the row's item for each end colour
+of the axis once, or twice for a loop, and covers the cube axis once.
+The cells and the row colours are primary items that must be covered exactly 1 or 2 times,
+and the cube axes are secondary items that may be covered at most once.
+
+Algorithm X chooses the primary item that is hardest to cover, that is, the one with the fewest options
+left relative to its remaining demand, rather than following a fixed order.
+A cell is branched on by trying each of its options, since exactly one of them is chosen.
+A colour may be covered by several options, so it is branched on by first including one of its options
+and then excluding it, which finds every solution exactly once.
+Selecting an option removes every option that would exceed the demand of one of its items,
+and any item whose remaining options cannot meet its demand ends the branch.
+
+The options are kept in sets, and removed options are restored in reverse order when the search backtracks,
+which is the same bookkeeping that the dancing links of DLX do with linked lists.
+
+As in GraphSolver, the rows can be swapped, so the first cube's front axis is required to precede its top axis.
+This is enforced by selecting the first cube's options before the search starts.
+"""
+from collections.abc import Iterator
+
+from instant_insanity.core.general_puzzle import GeneralPuzzle
+from instant_insanity.core.puzzle import Puzzle, CARTEBLANCHE_PUZZLE, WINNING_MOVES_PUZZLE
+from instant_insanity.solvers.bitmask_solver import AXIS_LABELS, AxisIndex, PackedSolution, mk_grid
+from instant_insanity.solvers.graph_solver import Grid, GRID_ROWS, GRID_COLUMNS
+
+# the number of axes of a cube
+N_AXES: int = len(AXIS_LABELS)
+
+# the number of rows of the grid
+N_ROWS: int = len(GRID_ROWS)
+
+# the demand of a colour item, which is its degree in a 2-factor
+COLOUR_DEMAND: int = 2
+
+type Item = int
+type Option = int
+
+
+class ExactCoverEngine:
+    """
+    This class searches for the solutions of a generalised puzzle with Algorithm X.
+
+    The primary items are numbered with the cells first, row by row, followed by the row colours, row by row.
+    The options are numbered in row-major order of their cells, with the axes of each cell in index order.
+
+    Attributes:
+        puzzle: the generalised puzzle.
+        n_cubes: the number of cubes.
+        option_items: the primary items covered by each option, with their multiplicities.
+        option_cube_axes: the secondary item of each option, which is its cube axis.
+        item_options: the options still available for each primary item.
+        demands: the number of times each primary item still has to be covered.
+        is_active: whether each option is still available.
+        node_count: the number of options selected by the last search.
+    """
+    puzzle: GeneralPuzzle
+    n_cubes: int
+    option_items: list[dict[Item, int]]
+    option_cube_axes: list[int]
+    cube_axis_options: list[list[Option]]
+    item_options: list[set[Option]]
+    demands: list[int]
+    is_active: list[bool]
+    node_count: int
+
+    def __init__(self, puzzle: GeneralPuzzle) -> None:
+        """
+        Args:
+            puzzle: the generalised puzzle.
+
+        Raises:
+            ValueError: if the number of colours is not the number of cubes.
+        """
+        if puzzle.n_colours != puzzle.n_cubes:
+            raise ValueError(f'Expected {puzzle.n_cubes} colours, got: {puzzle.n_colours}')
+        self.puzzle = puzzle
+        self.n_cubes = puzzle.n_cubes
+
+        self.option_items = []
+        self.option_cube_axes = []
+        row: int
+        for row in range(N_ROWS):
+            cube_index: int
+            for cube_index in range(self.n_cubes):
+                axis: AxisIndex
+                for axis in range(N_AXES):
+                    colour_1: int
+                    colour_2: int
+                    colour_1, colour_2 = puzzle.get_axis_colour_pair(cube_index, AXIS_LABELS[axis])
+                    items: dict[Item, int] = {self.get_cell_item(row, cube_index): 1}
+                    colour_item_1: Item = self.get_colour_item(row, colour_1)
+                    colour_item_2: Item = self.get_colour_item(row, colour_2)
+                    items[colour_item_1] = items.get(colour_item_1, 0) + 1
+                    items[colour_item_2] = items.get(colour_item_2, 0) + 1
+                    self.option_items.append(items)
+                    self.option_cube_axes.append(cube_index * N_AXES + axis)
+
+        self.cube_axis_options = [[] for _ in range(self.n_cubes * N_AXES)]
+        option: Option
+        cube_axis: int
+        for option, cube_axis in enumerate(self.option_cube_axes):
+            self.cube_axis_options[cube_axis].append(option)
+
+        self.item_options = []
+        self.demands = []
+        self.is_active = []
+        self.node_count = 0
+
+    def get_cell_item(self, row: int, cube_index: int) -> Item:
+        return row * self.n_cubes + cube_index
+
+    def get_colour_item(self, row: int, colour: int) -> Item:
+        return N_ROWS * self.n_cubes + row * self.n_cubes + colour
+
+    def get_option(self, row: int, cube_index: int, axis: AxisIndex) -> Option:
+        return (row * self.n_cubes + cube_index) * N_AXES + axis
+
+    def reset(self) -> None:
+        """
+        Makes every option available and sets every demand to its initial value.
+        """
+        n_items: int = 2 * N_ROWS * self.n_cubes
+        self.item_options = [set() for _ in range(n_items)]
+        option: Option
+        items: dict[Item, int]
+        for option, items in enumerate(self.option_items):
+            for item in items:
+                self.item_options[item].add(option)
+        self.demands = [1] * (N_ROWS * self.n_cubes) + [COLOUR_DEMAND] * (N_ROWS * self.n_cubes)
+        self.is_active = [True] * len(self.option_items)
+        self.node_count = 0
+
+    def deactivate(self, option: Option, removed: list[Option]) -> None:
+        """
+        Makes an option unavailable.
+
+        Args:
+            option: the option.
+            removed: the list of removed options, to which the option is appended.
+        """
+        self.is_active[option] = False
+        item: Item
+        for item in self.option_items[option]:
+            self.item_options[item].discard(option)
+        removed.append(option)
+
+    def restore(self, removed: list[Option], count: int) -> None:
+        """
+        Makes the most recently removed options available again.
+
+        Args:
+            removed: the list of removed options.
+            count: the number of options to keep removed.
+        """
+        while len(removed) > count:
+            option: Option = removed.pop()
+            self.is_active[option] = True
+            item: Item
+            for item in self.option_items[option]:
+                self.item_options[item].add(option)
+
+    def select(self, option: Option, removed: list[Option]) -> None:
+        """
+        Selects an option, reducing the demands of its items and removing the options that no longer fit.
+
+        Args:
+            option: the option.
+            removed: the list of removed options.
+        """
+        self.node_count += 1
+        self.deactivate(option, removed)
+        item: Item
+        multiplicity: int
+        for item, multiplicity in self.option_items[option].items():
+            self.demands[item] -= multiplicity
+            other: Option
+            for other in list(self.item_options[item]):
+                if self.option_items[other][item] > self.demands[item]:
+                    self.deactivate(other, removed)
+        for other in self.cube_axis_options[self.option_cube_axes[option]]:
+            if self.is_active[other]:
+                self.deactivate(other, removed)
+
+    def unselect(self, option: Option) -> None:
+        """
+        Restores the demands of the items of an option.
+
+        Args:
+            option: the option.
+        """
+        item: Item
+        multiplicity: int
+        for item, multiplicity in self.option_items[option].items():
+            self.demands[item] += multiplicity
+
+    def choose_item(self) -> Item | None:
+        """
+        Chooses the primary item to branch on.
+
+        Returns:
+            the item with the fewest options left relative to its demand, -1 if some item can no longer
+            be covered, or None if every item is covered.
+        """
+        best_item: Item | None = None
+        best_score: int = 0
+        item: Item
+        demand: int
+        for item, demand in enumerate(self.demands):
+            if demand == 0:
+                continue
+            options: set[Option] = self.item_options[item]
+            if sum(self.option_items[option][item] for option in options) < demand:
+                return -1
+            score: int = len(options) - demand
+            if best_item is None or score < best_score:
+                best_item = item
+                best_score = score
+        return best_item
+
+    def iter_solutions(self) -> Iterator[PackedSolution]:
+        """
+        Searches for the solutions and yields each one as soon as it is found.
+
+        Returns:
+            an iterator over the packed solutions, in the order they are found.
+        """
+        self.reset()
+        removed: list[Option] = []
+        selected: list[Option] = []
+        front_axis: AxisIndex
+        for front_axis in range(N_AXES):
+            top_axis: AxisIndex
+            for top_axis in range(front_axis + 1, N_AXES):
+                first_options: list[Option] = [self.get_option(0, 0, front_axis), self.get_option(1, 0, top_axis)]
+                if not all(self.is_active[option] for option in first_options):
+                    continue
+                self.select(first_options[0], removed)
+                if self.is_active[first_options[1]]:
+                    self.select(first_options[1], removed)
+                    selected.extend(first_options)
+                    yield from self._search(selected, removed)
+                    del selected[-2:]
+                    self.unselect(first_options[1])
+                self.unselect(first_options[0])
+                self.restore(removed, 0)
+
+    def _search(self, selected: list[Option], removed: list[Option]) -> Iterator[PackedSolution]:
+        """
+        Covers the remaining items.
+
+        Args:
+            selected: the options selected so far.
+            removed: the options removed so far.
+
+        Returns:
+            an iterator over the solutions that extend the selected options.
+        """
+        item: Item | None = self.choose_item()
+        if item is None:
+            yield self.mk_solution(selected)
+            return
+        if item < 0:
+            return
+
+        count: int = len(removed)
+        option: Option
+        if item < N_ROWS * self.n_cubes:
+            # a cell is covered by exactly one of its options
+            for option in sorted(self.item_options[item]):
+                self.select(option, removed)
+                selected.append(option)
+                yield from self._search(selected, removed)
+                selected.pop()
+                self.unselect(option)
+                self.restore(removed, count)
+        else:
+            # a colour is covered by several options, so include one and then exclude it
+            option = min(self.item_options[item])
+            self.select(option, removed)
+            selected.append(option)
+            yield from self._search(selected, removed)
+            selected.pop()
+            self.unselect(option)
+            self.restore(removed, count)
+
+            self.deactivate(option, removed)
+            yield from self._search(selected, removed)
+            self.restore(removed, count)
+
+    def mk_solution(self, selected: list[Option]) -> PackedSolution:
+        """
+        Converts the selected options into a packed solution.
+
+        Args:
+            selected: the selected options, one per cell.
+
+        Returns:
+            the packed solution, listing the axis index in each cell in row-major order.
+        """
+        axes: list[AxisIndex] = [0] * (N_ROWS * self.n_cubes)
+        option: Option
+        for option in selected:
+            axes[option // N_AXES] = option % N_AXES
+        return tuple(axes)
+
+
+class ExactCoverSolver:
+    """
+    This class solves a Puzzle with an ExactCoverEngine.
+    It is a drop-in alternative to GraphSolver that finds the same solutions in the same order.
+
+    Attributes:
+        puzzle: the puzzle.
+        engine: the search engine.
+        solutions: the solutions found by solve().
+    """
+    puzzle: Puzzle
+    engine: ExactCoverEngine
+    solutions: list[Grid]
+
+    def __init__(self, puzzle: Puzzle) -> None:
+        """
+        Args:
+            puzzle: the puzzle.
+
+        Raises:
+            ValueError: if the puzzle does not have four colours.
+        """
+        self.puzzle = puzzle
+        self.engine = ExactCoverEngine(GeneralPuzzle.from_puzzle(puzzle))
+        self.solutions = []
+
+    def solve(self) -> None:
+        """
+        Solve the puzzle.
+        The solutions are sorted into the order in which GraphSolver finds them.
+        """
+        self.solutions.extend(mk_grid(solution) for solution in sorted(self.engine.iter_solutions()))
+
+
+if __name__ == "__main__":
+    separator_line: str = '-' * 80
+    name: str
+    puzzle: Puzzle
+    for name, puzzle in [('Winning Moves', WINNING_MOVES_PUZZLE), ('Carteblanche', CARTEBLANCHE_PUZZLE)]:
+        print(separator_line)
+        print(f'Solving {name} puzzle.')
+        solver: ExactCoverSolver = ExactCoverSolver(puzzle)
+        solver.solve()
+        for index, grid in enumerate(solver.solutions, start=1):
+            print(f'Solution #{index}:')
+            for grid_row in GRID_ROWS:
+                print(' '.join(str(grid[(grid_row, grid_column)]) for grid_column in GRID_COLUMNS))
+        print(f'Selected {solver.engine.node_count} options.')
+    print(separator_line)
@@ -0,0 +1,114 @@
+"""
+This module solves generalised puzzles with any number of cubes.
+
+The formulation is the same as for GraphSolver.
+A solution is a pair of edge-disjoint 2-factors of the opposite-face graph, one for the
+front-back faces and one for the top-bottom faces, stored in a grid with two rows and one column per cube.
+The search is done by the BitmaskEngine, whose packed counters work for any number of colours.
+
+The grid columns are the cube numbers 1 through n. Since PuzzleCubeNumber is an IntEnum,
+the grid of a four-cube puzzle compares equal to the Grid that GraphSolver finds for it.
+"""
+from collections.abc import Iterator
+
+from instant_insanity.core.general_puzzle import GeneralPuzzle
+from instant_insanity.core.puzzle import AxisLabel
+from instant_insanity.solvers.bitmask_solver import BitmaskEngine, CubeEdges, PackedEdge, PackedSolution, \
+    AXIS_LABELS, pack_edge
+from instant_insanity.solvers.graph_solver import GridRow, GRID_ROWS
+
+type GeneralGridColumn = int
+type GeneralGridKey = tuple[GridRow, GeneralGridColumn]
+type GeneralGrid = dict[GeneralGridKey, AxisLabel]
+
+
+def mk_general_cube_edges(puzzle: GeneralPuzzle) -> list[CubeEdges]:
+    """
+    Packs the edges of each cube of a generalised puzzle.
+
+    Args:
+        puzzle: the generalised puzzle.
+
+    Returns:
+        the packed edges of each cube in cube order.
+    """
+    cube_edges: list[CubeEdges] = []
+    cube_index: int
+    for cube_index in range(puzzle.n_cubes):
+        edges: list[PackedEdge] = [pack_edge(*puzzle.get_axis_colour_pair(cube_index, axis_label))
+                                   for axis_label in AXIS_LABELS]
+        cube_edges.append((edges[0], edges[1], edges[2]))
+    return cube_edges
+
+
+def mk_general_grid(solution: PackedSolution, n_cubes: int) -> GeneralGrid:
+    """
+    Converts a packed solution into a generalised grid.
+
+    Args:
+        solution: the packed solution.
+        n_cubes: the number of cubes.
+
+    Returns:
+        the grid that has the same axis in each cell.
+    """
+    grid: GeneralGrid = {}
+    row_index: int
+    row: GridRow
+    for row_index, row in enumerate(GRID_ROWS):
+        column_index: int
+        for column_index in range(n_cubes):
+            grid[(row, column_index + 1)] = AXIS_LABELS[solution[row_index * n_cubes + column_index]]
+    return grid
+
+
+class GeneralGraphSolver:
+    """
+    This class solves a generalised puzzle.
+
+    Attributes:
+        puzzle: the generalised puzzle.
+        engine: the search engine.
+        solutions: the solutions found by solve().
+    """
+    puzzle: GeneralPuzzle
+    engine: BitmaskEngine
+    solutions: list[GeneralGrid]
+
+    def __init__(self, puzzle: GeneralPuzzle) -> None:
+        """
+        Args:
+            puzzle: the generalised puzzle.
+
+        Raises:
+            ValueError: if the number of colours is not the number of cubes.
+        """
+        self.puzzle = puzzle
+        self.engine = BitmaskEngine(mk_general_cube_edges(puzzle), puzzle.n_colours)
+        self.solutions = []
+
+    def iter_solutions(self) -> Iterator[GeneralGrid]:
+        """
+        Searches the puzzle and yields each solution as soon as it is found.
+
+        Returns:
+            an iterator over the solution grids.
+        """
+        solution: PackedSolution
+        for solution in self.engine.iter_solutions():
+            yield mk_general_grid(solution, self.puzzle.n_cubes)
+
+    def solve(self) -> None:
+        """
+        Solve the puzzle.
+        """
+        self.solutions.extend(self.iter_solutions())
+
+    def count_solutions(self) -> int:
+        """
+        Counts the solutions without building their grids.
+
+        Returns:
+            the number of solutions.
+        """
+        return sum(1 for _ in self.engine.iter_solutions())
@@ -12,6 +12,9 @@ Unlike Sudoku, a face pair can only appear once per column since it can't be in
 Like Sudoku, we need to avoid repeated values but in this case we are looking at the four rows
 of faces in the front, back, top, and bottom positions.
 """
+from abc import ABC, abstractmethod
+from collections import deque
+from collections.abc import Iterator
 from enum import StrEnum
 
 from instant_insanity.core.cube import FacePlane
@@ -29,6 +32,11 @@ type Grid = dict[GridKey, GridValue]
 GRID_ROWS: list[GridRow] = [FacePlane.FRONT, FacePlane.TOP]
 GRID_COLUMNS: list[GridColumn] = list(PuzzleCubeNumber)
 
+# the index of each cell in the order that the grid is filled, which is row by row
+_CELL_DEPTHS: dict[GridKey, int] = {(row, column): row_index * len(GRID_COLUMNS) + column_index
+                                    for row_index, row in enumerate(GRID_ROWS)
+                                    for column_index, column in enumerate(GRID_COLUMNS)}
+
 def is_final_grid_key(grid_key: GridKey) -> bool:
     """
     Check if a grid key is the final one.
@@ -59,6 +67,278 @@ class Action(StrEnum):
 type TraceRecord = tuple[Choice, Action]
 type Trace = list[TraceRecord]
 
+
+class TraceMode(StrEnum):
+    """How much of the journal a solver keeps."""
+    OFF = 'off'
+    COUNTERS = 'counters'
+    METRICS = 'metrics'
+    RING = 'ring'
+    FULL = 'full'
+
+
+# the number of records kept by a ring buffer trace unless another capacity is given
+DEFAULT_RING_CAPACITY: int = 1024
+
+
+class TraceSink(ABC):
+    """
+    This is the abstract base class for the destinations of a solver's journal.
+    """
+
+    @abstractmethod
+    def record(self, choice: Choice, action: Action) -> None:
+        """
+        Records that the solver took an action on a choice.
+
+        Args:
+            choice: the choice.
+            action: the action.
+        """
+        pass
+
+    def get_trace(self) -> Trace:
+        """
+        Gets the trace records that this sink keeps.
+
+        Returns:
+            the kept trace records, oldest first.
+        """
+        return []
+
+
+class NullTraceSink(TraceSink):
+    """
+    This sink discards every record.
+    It builds nothing, so a solver that journals to it does no allocation for journalling.
+    """
+
+    def record(self, choice: Choice, action: Action) -> None:
+        pass
+
+
+class CounterTraceSink(TraceSink):
+    """
+    This sink counts the records of each action and discards the records themselves.
+
+    Attributes:
+        action_counts: the number of records of each action.
+    """
+    action_counts: dict[Action, int]
+
+    def __init__(self) -> None:
+        self.action_counts = {action: 0 for action in Action}
+
+    def record(self, choice: Choice, action: Action) -> None:
+        self.action_counts[action] += 1
+
+
+# the actions that skip a choice without trying it
+PRUNE_ACTIONS: list[Action] = [Action.REDUNDANT, Action.IN_USE, Action.EXCEEDS_COLOUR_LIMITS]
+
+
+class SearchMetrics(TraceSink):
+    """
+    This sink counts the search nodes and the pruned choices at each depth and discards the records themselves.
+
+    A node is a choice that the solver tries. The depth of a choice is the index of its cell
+    in the order that the grid is filled, so the choices in the first cell have depth 0.
+
+    Attributes:
+        node_counts: the number of nodes at each depth.
+        prune_counts: the number of choices skipped at each depth, for each prune action.
+        solution_count: the number of solutions found.
+    """
+    node_counts: list[int]
+    prune_counts: dict[Action, list[int]]
+    solution_count: int
+
+    def __init__(self) -> None:
+        n_cells: int = len(GRID_ROWS) * len(GRID_COLUMNS)
+        self.node_counts = [0] * n_cells
+        self.prune_counts = {action: [0] * n_cells for action in PRUNE_ACTIONS}
+        self.solution_count = 0
+
+    def record(self, choice: Choice, action: Action) -> None:
+        if action == Action.TRYING:
+            self.node_counts[_CELL_DEPTHS[(choice[0], choice[1])]] += 1
+        elif action == Action.SOLVED:
+            self.solution_count += 1
+        elif action != Action.BACKTRACKING:
+            self.prune_counts[action][_CELL_DEPTHS[(choice[0], choice[1])]] += 1
+
+    def get_node_count(self) -> int:
+        """
+        Gets the total number of search nodes.
+
+        Returns:
+            the number of nodes at every depth.
+        """
+        return sum(self.node_counts)
+
+    def get_prune_count(self, action: Action) -> int:
+        """
+        Gets the total number of choices skipped for a reason.
+
+        Args:
+            action: the prune action that gives the reason.
+
+        Returns:
+            the number of choices skipped with the action at every depth.
+        """
+        return sum(self.prune_counts[action])
+
+    def get_branching_factors(self) -> list[float]:
+        """
+        Gets the average branching factor at each depth.
+
+        Returns:
+            the average number of nodes at each depth per node at the depth before it,
+            where the depth before the first is the root of the search, which is a single node.
+        """
+        factors: list[float] = []
+        parent_count: int = 1
+        node_count: int
+        for node_count in self.node_counts:
+            factors.append(node_count / parent_count if parent_count > 0 else 0.0)
+            parent_count = node_count
+        return factors
+
+
+class RingTraceSink(TraceSink):
+    """
+    This sink keeps only the most recent records.
+
+    Attributes:
+        records: the most recent records, oldest first.
+    """
+    records: deque[TraceRecord]
+
+    def __init__(self, capacity: int = DEFAULT_RING_CAPACITY) -> None:
+        """
+        Args:
+            capacity: the maximum number of records kept.
+
+        Raises:
+            ValueError: if capacity is not positive.
+        """
+        if capacity <= 0:
+            raise ValueError(f'Expected a positive capacity, got: {capacity}')
+        self.records = deque(maxlen=capacity)
+
+    def record(self, choice: Choice, action: Action) -> None:
+        self.records.append((choice, action))
+
+    def get_trace(self) -> Trace:
+        return list(self.records)
+
+
+class FullTraceSink(TraceSink):
+    """
+    This sink keeps every record.
+
+    Attributes:
+        records: every record, oldest first.
+    """
+    records: Trace
+
+    def __init__(self) -> None:
+        self.records = []
+
+    def record(self, choice: Choice, action: Action) -> None:
+        self.records.append((choice, action))
+
+    def get_trace(self) -> Trace:
+        return self.records
+
+
+def mk_trace_sink(mode: TraceMode, capacity: int = DEFAULT_RING_CAPACITY) -> TraceSink:
+    """
+    Makes the trace sink for a trace mode.
+
+    Args:
+        mode: the trace mode.
+        capacity: the capacity of a ring buffer trace, ignored by the other modes.
+
+    Returns:
+        the trace sink.
+    """
+    match mode:
+        case TraceMode.OFF:
+            return NullTraceSink()
+        case TraceMode.COUNTERS:
+            return CounterTraceSink()
+        case TraceMode.METRICS:
+            return SearchMetrics()
+        case TraceMode.RING:
+            return RingTraceSink(capacity)
+        case TraceMode.FULL:
+            return FullTraceSink()
+    raise ValueError(f'Invalid trace mode: {mode}')
+
+
+# A binary trace starts with this header and then stores each record in one byte.
+# From the high bit down, the byte holds the row index in 1 bit, the column index in 2 bits,
+# the axis index in 2 bits, and the action index in 3 bits.
+# The indices are positions in GRID_ROWS, GRID_COLUMNS, AxisLabel, and Action.
+BINARY_TRACE_HEADER: bytes = b'IIT\x01'
+
+_AXIS_LABELS: list[AxisLabel] = list(AxisLabel)
+_ACTIONS: list[Action] = list(Action)
+
+
+def encode_trace(trace: Trace) -> bytes:
+    """
+    Encodes a trace in the binary trace format.
+
+    Args:
+        trace: the trace.
+
+    Returns:
+        the binary trace.
+    """
+    data: bytearray = bytearray(BINARY_TRACE_HEADER)
+    choice: Choice
+    action: Action
+    for choice, action in trace:
+        row: GridRow
+        column: GridColumn
+        value: AxisLabel
+        row, column, value = choice
+        data.append(GRID_ROWS.index(row) << 7
+                    | GRID_COLUMNS.index(column) << 5
+                    | _AXIS_LABELS.index(value) << 3
+                    | _ACTIONS.index(action))
+    return bytes(data)
+
+
+def decode_trace(data: bytes) -> Trace:
+    """
+    Decodes a binary trace.
+
+    Args:
+        data: the binary trace.
+
+    Returns:
+        the trace.
+
+    Raises:
+        ValueError: if data does not start with the binary trace header or contains an invalid record.
+    """
+    if not data.startswith(BINARY_TRACE_HEADER):
+        raise ValueError('Expected a binary trace header')
+
+    trace: Trace = []
+    byte: int
+    for byte in data[len(BINARY_TRACE_HEADER):]:
+        axis_index: int = (byte >> 3) & 0b11
+        action_index: int = byte & 0b111
+        if axis_index >= len(_AXIS_LABELS) or action_index >= len(_ACTIONS):
+            raise ValueError(f'Invalid trace record: {byte:#04x}')
+        choice: Choice = (GRID_ROWS[byte >> 7], GRID_COLUMNS[(byte >> 5) & 0b11], _AXIS_LABELS[axis_index])
+        trace.append((choice, _ACTIONS[action_index]))
+    return trace
+
 # a spectrum counts the frequency of each possible face colour
 # a spectrum gives the total degree of each node in a subgraph of the opposite-face graph
 type Spectrum = dict[FaceColour, int]
@@ -67,14 +347,15 @@ class GraphSolver:
     puzzle: Puzzle
     colours: list[FaceColour]
     grid: dict[GridKey, GridValue]
-    trace: Trace
+    trace_sink: TraceSink
     solutions: list[Grid]
 
-    def __init__(self, puzzle: Puzzle) -> None:
+    def __init__(self, puzzle: Puzzle, trace_sink: TraceSink | None = None) -> None:
         """
 
         Args:
             puzzle: the puzzle.
+            trace_sink: the destination of the journal, by default a FullTraceSink.
         """
         self.puzzle = puzzle
         self.colours = puzzle.get_colours()
@@ -84,12 +365,15 @@ class GraphSolver:
                      for row in GRID_ROWS
                      for column in GRID_COLUMNS}
 
-        self.trace = []
+        self.trace_sink = FullTraceSink() if trace_sink is None else trace_sink
         self.solutions = []
 
+    @property
+    def trace(self) -> Trace:
+        return self.trace_sink.get_trace()
+
     def journal(self, choice: Choice, action: Action) -> None:
-        trace_record: TraceRecord = (choice, action)
-        self.trace.append(trace_record)
+        self.trace_sink.record(choice, action)
 
     def get_spectrum(self, cube_number: PuzzleCubeNumber, axis_label: AxisLabel) -> Spectrum:
         """
@@ -247,6 +531,52 @@ class GraphSolver:
         """
         Solve the puzzle.
         """
+        for _ in self.search():
+            self.save_solution()
+
+    def iter_solutions(self, limit: int | None = None) -> Iterator[Grid]:
+        """
+        Searches the puzzle and yields each solution as soon as it is found.
+        Unlike solve(), it neither saves nor prints the solutions.
+        The search stops as soon as the iterator is exhausted or closed,
+        and the grid is then left empty.
+
+        Args:
+            limit: the maximum number of solutions to yield, or None to search to the end.
+
+        Returns:
+            an iterator over copies of the solution grids.
+        """
+        if limit is not None and limit <= 0:
+            return
+
+        count: int = 0
+        solved_grid: Grid
+        for solved_grid in self.search():
+            yield solved_grid.copy()
+            count += 1
+            if count == limit:
+                return
+
+    def count_solutions(self) -> int:
+        """
+        Searches the puzzle and counts its solutions.
+        Unlike solve(), it neither copies, saves, nor prints the solutions.
+        See solution_counter for a counter that does not enumerate them at all.
+
+        Returns:
+            the number of solutions.
+        """
+        return sum(1 for _ in self.search())
+
+    def search(self) -> Iterator[Grid]:
+        """
+        Fills the grid from the first empty cell onwards.
+        Each time the grid is full, the grid itself is yielded, so it must be copied if it is kept.
+
+        Returns:
+            an iterator that yields the grid whenever it holds a solution.
+        """
         for row in GRID_ROWS:
             for column in GRID_COLUMNS:
                 grid_key: GridKey = (row, column)
@@ -255,14 +585,16 @@ class GraphSolver:
                         choice: Choice = (row, column, value)
                         if self.is_possible(choice):
                             self.grid[grid_key] = value
-                            self.journal(choice, Action.TRYING)
-                            self.solve()
+                            try:
+                                yield from self.search()
+                            finally:
+                                # empty the cell even if the caller stops the search early
+                                self.grid[grid_key] = None
                             if is_final_grid_key(grid_key):
                                 self.journal(choice, Action.SOLVED)
                             self.journal(choice, Action.BACKTRACKING)
-                            self.grid[grid_key] = None
                     return
-        self.save_solution()
+        yield self.grid
 
     def zero_spectrum(self) -> Spectrum:
         """
@@ -0,0 +1,364 @@
+"""
+This module implements a non-recursive backtracking solver that can be paused, checkpointed, and resumed.
+
+GraphSolver recurses once per grid cell and finds the next empty cell by scanning the grid from the top.
+IterativeEngine searches the same grid, in the same order and with the same rules as BitmaskEngine,
+but keeps its position in an explicit stack of the axes placed so far.
+The length of the stack is the cursor, which is the row-major index of the next cell to fill,
+so no scan is needed and the depth of the search is not limited by the recursion limit.
+
+The whole position of the search is the stack, the next axis to try in the cell at the cursor,
+and the number of nodes searched so far. It is captured by a SearchState, which can be written as JSON,
+so a long search can be stopped after a number of nodes, saved, and resumed later, even in another process.
+Resuming the search from a saved state finds exactly the solutions that were not yet found.
+
+A state can also have a floor, which is a number of placed axes that the search never backtracks over.
+A search that starts from a state whose placed axes are a prefix, and whose floor is its length,
+only searches the subtree of that prefix, which lets the subtrees of a puzzle be searched separately.
+"""
+import json
+from collections.abc import Iterator
+from dataclasses import dataclass, field
+
+from instant_insanity.core.general_puzzle import GeneralPuzzle
+from instant_insanity.core.puzzle import FaceColour, Puzzle, CARTEBLANCHE_PUZZLE, WINNING_MOVES_PUZZLE
+from instant_insanity.solvers.bitmask_solver import COUNTER_BITS, AxisIndex, CubeEdges, PackedSolution, \
+    PackedSpectrum, Z_AXIS_INDEX, mk_cube_edges, mk_grid, pack_counters
+from instant_insanity.solvers.general_solver import mk_general_cube_edges
+from instant_insanity.solvers.graph_solver import Grid, GRID_ROWS, GRID_COLUMNS
+
+# the number of axes of a cube
+N_AXES: int = 3
+
+# the number of rows of the grid
+N_ROWS: int = len(GRID_ROWS)
+
+
+@dataclass(frozen=True)
+class SearchState:
+    """
+    The position of a search.
+
+    Attributes:
+        n_cubes: the number of cubes of the puzzle.
+        axes: the axes placed so far, in row-major order.
+        next_axis: the next axis to try in the cell after the placed axes.
+        node_count: the number of nodes searched so far.
+        finished: whether the search is complete.
+        floor: the number of placed axes that the search never backtracks over.
+    """
+    n_cubes: int
+    axes: list[AxisIndex] = field(default_factory=list)
+    next_axis: AxisIndex = 0
+    node_count: int = 0
+    finished: bool = False
+    floor: int = 0
+
+    def to_json(self) -> str:
+        """
+        Writes the state as JSON.
+
+        Returns:
+            the JSON object.
+        """
+        return json.dumps({
+            'n_cubes': self.n_cubes,
+            'axes': self.axes,
+            'next_axis': self.next_axis,
+            'node_count': self.node_count,
+            'finished': self.finished,
+            'floor': self.floor,
+        })
+
+    @staticmethod
+    def from_json(text: str) -> 'SearchState':
+        """
+        Reads a state written by to_json().
+
+        Args:
+            text: the JSON object.
+
+        Returns:
+            the state.
+
+        Raises:
+            ValueError: if the text is not a JSON search state.
+        """
+        try:
+            data: dict = json.loads(text)
+            return SearchState(n_cubes=int(data['n_cubes']),
+                               axes=[int(axis) for axis in data['axes']],
+                               next_axis=int(data['next_axis']),
+                               node_count=int(data['node_count']),
+                               finished=bool(data['finished']),
+                               floor=int(data['floor']))
+        except (KeyError, TypeError, json.JSONDecodeError) as error:
+            raise ValueError(f'Expected a JSON search state, got: {text!r}') from error
+
+
+class IterativeEngine:
+    """
+    This class searches for solutions of a puzzle given as packed cube edges, without recursion.
+
+    Attributes:
+        cube_edges: the packed edges of each cube.
+        n_cubes: the number of cubes.
+        n_colours: the number of colours.
+        overflow_bias: the packed spectrum that adds 5 to every counter.
+        overflow_mask: the packed spectrum that selects the high bit of every counter.
+        axes: the stack of axes placed so far, in row-major order.
+        next_axis: the next axis to try in the cell at the cursor.
+        spectra: the packed spectrum of each row.
+        node_count: the number of choices placed in the grid since the search started.
+        finished: whether the search is complete.
+        floor: the number of placed axes that the search never backtracks over.
+    """
+    cube_edges: list[CubeEdges]
+    n_cubes: int
+    n_colours: int
+    overflow_bias: PackedSpectrum
+    overflow_mask: PackedSpectrum
+    axes: list[AxisIndex]
+    next_axis: AxisIndex
+    spectra: list[PackedSpectrum]
+    node_count: int
+    finished: bool
+    floor: int
+
+    def __init__(self, cube_edges: list[CubeEdges], n_colours: int) -> None:
+        """
+        Args:
+            cube_edges: the packed edges of each cube.
+            n_colours: the number of colours.
+
+        Raises:
+            ValueError: if the number of colours is not the number of cubes.
+        """
+        n_cubes: int = len(cube_edges)
+        if n_colours != n_cubes:
+            raise ValueError(f'Expected {n_cubes} colours, got: {n_colours}')
+
+        self.cube_edges = cube_edges
+        self.n_cubes = n_cubes
+        self.n_colours = n_colours
+        self.overflow_bias = pack_counters(n_colours, 5)
+        self.overflow_mask = pack_counters(n_colours, 1 << (COUNTER_BITS - 1))
+        self.reset()
+
+    def reset(self) -> None:
+        """
+        Moves the search back to its start.
+        """
+        self.axes = []
+        self.next_axis = 0
+        self.spectra = [0] * N_ROWS
+        self.node_count = 0
+        self.finished = False
+        self.floor = 0
+
+    def get_state(self) -> SearchState:
+        """
+        Gets the position of the search.
+
+        Returns:
+            a copy of the position.
+        """
+        return SearchState(n_cubes=self.n_cubes, axes=list(self.axes), next_axis=self.next_axis,
+                           node_count=self.node_count, finished=self.finished, floor=self.floor)
+
+    def set_state(self, state: SearchState) -> None:
+        """
+        Moves the search to a saved position.
+
+        Args:
+            state: the position, which must have been saved from a search of the same puzzle.
+
+        Raises:
+            ValueError: if the position is not one that a search of this puzzle can reach.
+        """
+        if state.n_cubes != self.n_cubes:
+            raise ValueError(f'Expected a state for {self.n_cubes} cubes, got: {state.n_cubes}')
+        if (len(state.axes) > N_ROWS * self.n_cubes or not 0 <= state.next_axis <= N_AXES
+                or not 0 <= state.floor <= len(state.axes)):
+            raise ValueError(f'Invalid search state: {state}')
+        self.reset()
+        axis: AxisIndex
+        for axis in state.axes:
+            if not self.is_possible(axis):
+                raise ValueError(f'Invalid search state: {state}')
+            self.push(axis)
+        self.next_axis = state.next_axis
+        self.node_count = state.node_count
+        self.finished = state.finished
+        self.floor = state.floor
+
+    def is_possible(self, axis: AxisIndex) -> bool:
+        """
+        Checks if an axis can be put in the cell at the cursor.
+
+        Args:
+            axis: the axis.
+
+        Returns:
+            True if the axis follows the rules and keeps every colour count of its row at most 2.
+        """
+        if not 0 <= axis < N_AXES:
+            return False
+        row: int
+        column: int
+        row, column = divmod(len(self.axes), self.n_cubes)
+        if row == 0:
+            # the rows can be swapped so the first cube never needs axis Z in the front row
+            if column == 0 and axis == Z_AXIS_INDEX:
+                return False
+        else:
+            front_axis: AxisIndex = self.axes[column]
+            # the first cube's axes are strictly ordered to avoid finding each solution twice
+            if column == 0 and axis < front_axis:
+                return False
+            # an axis can't be in both rows
+            if axis == front_axis:
+                return False
+        total: PackedSpectrum = self.spectra[row] + self.cube_edges[column][axis]
+        return not (total + self.overflow_bias) & self.overflow_mask
+
+    def push(self, axis: AxisIndex) -> None:
+        """
+        Puts an axis in the cell at the cursor and advances the cursor.
+
+        Args:
+            axis: the axis.
+        """
+        row: int
+        column: int
+        row, column = divmod(len(self.axes), self.n_cubes)
+        self.spectra[row] += self.cube_edges[column][axis]
+        self.axes.append(axis)
+        self.next_axis = 0
+
+    def pop(self) -> None:
+        """
+        Moves the cursor back one cell, empties it, and makes its next axis the one after the axis it held.
+        """
+        axis: AxisIndex = self.axes.pop()
+        row: int
+        column: int
+        row, column = divmod(len(self.axes), self.n_cubes)
+        self.spectra[row] -= self.cube_edges[column][axis]
+        self.next_axis = axis + 1
+
+    def iter_solutions(self, node_limit: int | None = None) -> Iterator[PackedSolution]:
+        """
+        Continues the search from its current position and yields each solution as soon as it is found.
+
+        The search pauses when the iterator is closed or when node_limit more nodes have been searched,
+        and the engine is then left at a position from which the search can be resumed.
+
+        Args:
+            node_limit: the maximum number of nodes to search before pausing, or None to search to the end.
+
+        Returns:
+            an iterator over the solutions found from the current position.
+        """
+        n_cells: int = N_ROWS * self.n_cubes
+        stop_count: int | None = None if node_limit is None else self.node_count + node_limit
+        while not self.finished:
+            if len(self.axes) == n_cells:
+                solution: PackedSolution = tuple(self.axes)
+                # backtrack before yielding so the position is consistent if the search is paused
+                if len(self.axes) == self.floor:
+                    self.finished = True
+                else:
+                    self.pop()
+                yield solution
+                continue
+
+            axis: AxisIndex = self.next_axis
+            while axis < N_AXES and not self.is_possible(axis):
+                axis += 1
+            if axis == N_AXES:
+                if len(self.axes) == self.floor:
+                    self.finished = True
+                else:
+                    self.pop()
+                continue
+
+            if self.node_count == stop_count:
+                self.next_axis = axis
+                return
+            self.node_count += 1
+            self.push(axis)
+
+
+def mk_iterative_engine(puzzle: GeneralPuzzle) -> IterativeEngine:
+    """
+    Makes an iterative engine for a generalised puzzle.
+
+    Args:
+        puzzle: the generalised puzzle.
+
+    Returns:
+        the engine.
+
+    Raises:
+        ValueError: if the number of colours is not the number of cubes.
+    """
+    return IterativeEngine(mk_general_cube_edges(puzzle), puzzle.n_colours)
+
+
+class IterativeSolver:
+    """
+    This class solves a Puzzle with an IterativeEngine.
+    It finds the same solutions as GraphSolver, in the same order.
+
+    Attributes:
+        puzzle: the puzzle.
+        engine: the search engine.
+        solutions: the solutions found by solve().
+    """
+    puzzle: Puzzle
+    engine: IterativeEngine
+    solutions: list[Grid]
+
+    def __init__(self, puzzle: Puzzle) -> None:
+        """
+        Args:
+            puzzle: the puzzle.
+
+        Raises:
+            ValueError: if the puzzle does not have four colours.
+        """
+        colours: list[FaceColour] = sorted(puzzle.get_colours(), key=list(FaceColour).index)
+        self.puzzle = puzzle
+        self.engine = IterativeEngine(mk_cube_edges(puzzle, colours), len(colours))
+        self.solutions = []
+
+    def solve(self, node_limit: int | None = None) -> bool:
+        """
+        Solve the puzzle, continuing from where the last call paused.
+
+        Args:
+            node_limit: the maximum number of nodes to search before pausing, or None to search to the end.
+
+        Returns:
+            True if the search is complete, False if it paused.
+        """
+        self.solutions.extend(mk_grid(solution) for solution in self.engine.iter_solutions(node_limit))
+        return self.engine.finished
+
+
+if __name__ == "__main__":
+    separator_line: str = '-' * 80
+    name: str
+    puzzle: Puzzle
+    for name, puzzle in [('Winning Moves', WINNING_MOVES_PUZZLE), ('Carteblanche', CARTEBLANCHE_PUZZLE)]:
+        print(separator_line)
+        print(f'Solving {name} puzzle ten nodes at a time.')
+        solver: IterativeSolver = IterativeSolver(puzzle)
+        while not solver.solve(node_limit=10):
+            print(f'Paused at {solver.engine.get_state().to_json()}')
+        for index, grid in enumerate(solver.solutions, start=1):
+            print(f'Solution #{index}:')
+            for grid_row in GRID_ROWS:
+                print(' '.join(str(grid[(grid_row, grid_column)]) for grid_column in GRID_COLUMNS))
+    print(separator_line)
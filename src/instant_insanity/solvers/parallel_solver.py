@@ -0,0 +1,220 @@
+"""
+This module searches a single puzzle in parallel by splitting its search tree into independent subtrees.
+
+The search tree is that of IterativeEngine, which fills the grid in row-major order.
+A prefix fixes the axes in the first k cells of the grid, where k is the split depth,
+and every prefix that the search would reach is listed, in the order the search would reach it.
+The subtree of each prefix is then searched by an IterativeEngine whose floor is the prefix,
+and the subtrees are spread over a ProcessPoolExecutor.
+
+The results are consumed in prefix order, so the solutions are found in exactly the order
+of a search in a single process, whatever the number of workers, and the node counts add up to
+the node count of that search. There are usually many more prefixes than workers,
+so a worker that finishes a small subtree takes the next one and the load stays balanced.
+"""
+import random
+import time
+from collections.abc import Iterator
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+
+from instant_insanity.core.general_puzzle import GeneralPuzzle, mk_random_general_puzzle_spec
+from instant_insanity.solvers.bitmask_solver import AxisIndex, CubeEdges, PackedSolution
+from instant_insanity.solvers.general_solver import mk_general_cube_edges
+from instant_insanity.solvers.iterative_solver import IterativeEngine, SearchState, N_AXES, N_ROWS
+
+# the default number of grid cells fixed by each prefix
+DEFAULT_SPLIT_DEPTH: int = 6
+
+type Prefix = list[AxisIndex]
+
+
+@dataclass(frozen=True)
+class SubtreeTask:
+    """
+    The search of the subtree of a prefix.
+
+    Attributes:
+        cube_edges: the packed edges of each cube.
+        n_colours: the number of colours.
+        prefix: the axes in the first cells of the grid.
+    """
+    cube_edges: list[CubeEdges]
+    n_colours: int
+    prefix: Prefix
+
+
+@dataclass(frozen=True)
+class SubtreeResult:
+    """
+    The result of the search of a subtree.
+
+    Attributes:
+        solutions: the solutions in the subtree, in the order they were found.
+        node_count: the number of nodes searched below the prefix.
+    """
+    solutions: list[PackedSolution]
+    node_count: int
+
+
+def search_subtree(task: SubtreeTask) -> SubtreeResult:
+    """
+    Searches the subtree of a prefix.
+
+    Args:
+        task: the task.
+
+    Returns:
+        the solutions and the node count of the subtree.
+    """
+    engine: IterativeEngine = IterativeEngine(task.cube_edges, task.n_colours)
+    engine.set_state(SearchState(n_cubes=engine.n_cubes, axes=task.prefix, floor=len(task.prefix)))
+    solutions: list[PackedSolution] = list(engine.iter_solutions())
+    return SubtreeResult(solutions=solutions, node_count=engine.node_count)
+
+
+def mk_prefixes(engine: IterativeEngine, split_depth: int) -> tuple[list[Prefix], int]:
+    """
+    Lists the prefixes of a search that fix a given number of cells.
+
+    Args:
+        engine: an engine at the start of its search, which is left there.
+        split_depth: the number of cells fixed by each prefix.
+
+    Returns:
+        the prefixes in search order, and the number of nodes in the tree above and including them.
+    """
+    prefixes: list[Prefix] = []
+    node_count: int = 0
+    # each entry of the stack is the next axis to try at its depth
+    next_axes: list[AxisIndex] = [0]
+    while next_axes:
+        axis: AxisIndex = next_axes.pop()
+        while axis < N_AXES and not engine.is_possible(axis):
+            axis += 1
+        if axis == N_AXES:
+            if engine.axes:
+                engine.pop()
+            continue
+        node_count += 1
+        engine.push(axis)
+        if len(engine.axes) == split_depth:
+            prefixes.append(list(engine.axes))
+            engine.pop()
+            next_axes.append(axis + 1)
+        else:
+            next_axes.extend([axis + 1, 0])
+    engine.reset()
+    return prefixes, node_count
+
+
+class ParallelEngine:
+    """
+    This class searches for the solutions of a puzzle given as packed cube edges, one subtree per task.
+    It finds the same solutions as IterativeEngine and BitmaskEngine, in the same order.
+
+    Attributes:
+        cube_edges: the packed edges of each cube.
+        n_colours: the number of colours.
+        split_depth: the number of cells fixed by each prefix.
+        max_workers: the number of worker processes, or None to search every subtree in this process.
+        prefix_count: the number of prefixes of the last search.
+        node_count: the number of nodes of the last search.
+    """
+    cube_edges: list[CubeEdges]
+    n_colours: int
+    split_depth: int
+    max_workers: int | None
+    prefix_count: int
+    node_count: int
+
+    def __init__(self, cube_edges: list[CubeEdges], n_colours: int, split_depth: int = DEFAULT_SPLIT_DEPTH,
+                 max_workers: int | None = None) -> None:
+        """
+        Args:
+            cube_edges: the packed edges of each cube.
+            n_colours: the number of colours.
+            split_depth: the number of cells fixed by each prefix, which is reduced to the number of cells.
+            max_workers: the number of worker processes, or None to search every subtree in this process.
+
+        Raises:
+            ValueError: if the number of colours is not the number of cubes or split_depth is not positive.
+        """
+        if n_colours != len(cube_edges):
+            raise ValueError(f'Expected {len(cube_edges)} colours, got: {n_colours}')
+        if split_depth <= 0:
+            raise ValueError(f'Expected a positive split depth, got: {split_depth}')
+        self.cube_edges = cube_edges
+        self.n_colours = n_colours
+        self.split_depth = min(split_depth, N_ROWS * len(cube_edges))
+        self.max_workers = max_workers
+        self.prefix_count = 0
+        self.node_count = 0
+
+    def iter_solutions(self) -> Iterator[PackedSolution]:
+        """
+        Searches the subtrees and yields the solutions of each subtree in prefix order.
+
+        Returns:
+            an iterator over the solutions, in the order of a search in a single process.
+        """
+        prefixes: list[Prefix]
+        prefixes, self.node_count = mk_prefixes(IterativeEngine(self.cube_edges, self.n_colours), self.split_depth)
+        self.prefix_count = len(prefixes)
+        tasks: list[SubtreeTask] = [SubtreeTask(self.cube_edges, self.n_colours, prefix) for prefix in prefixes]
+
+        if self.max_workers is None:
+            results: Iterator[SubtreeResult] = map(search_subtree, tasks)
+            yield from self._merge(results)
+            return
+
+        executor: ProcessPoolExecutor = ProcessPoolExecutor(max_workers=self.max_workers)
+        try:
+            yield from self._merge(executor.map(search_subtree, tasks))
+        finally:
+            executor.shutdown(cancel_futures=True)
+
+    def _merge(self, results: Iterator[SubtreeResult]) -> Iterator[PackedSolution]:
+        """
+        Adds up the node counts of the subtrees and yields their solutions.
+
+        Args:
+            results: the results of the subtrees in prefix order.
+
+        Returns:
+            an iterator over the solutions of the subtrees.
+        """
+        result: SubtreeResult
+        for result in results:
+            self.node_count += result.node_count
+            yield from result.solutions
+
+
+def mk_parallel_engine(puzzle: GeneralPuzzle, split_depth: int = DEFAULT_SPLIT_DEPTH,
+                       max_workers: int | None = None) -> ParallelEngine:
+    """
+    Makes a parallel engine for a generalised puzzle.
+
+    Args:
+        puzzle: the generalised puzzle.
+        split_depth: the number of cells fixed by each prefix.
+        max_workers: the number of worker processes, or None to search every subtree in this process.
+
+    Returns:
+        the engine.
+
+    Raises:
+        ValueError: if the number of colours is not the number of cubes or split_depth is not positive.
+    """
+    return ParallelEngine(mk_general_cube_edges(puzzle), puzzle.n_colours, split_depth, max_workers)
+
+
+if __name__ == "__main__":
+    demo_puzzle: GeneralPuzzle = GeneralPuzzle(mk_random_general_puzzle_spec(26, random.Random(0)))
+    workers: int | None
+    for workers in [None, 1, 2, 4]:
+        start: float = time.perf_counter()
+        parallel_engine: ParallelEngine = mk_parallel_engine(demo_puzzle, max_workers=workers)
+        solution_count: int = sum(1 for _ in parallel_engine.iter_solutions())
+        print(f'workers={workers}: {solution_count} solutions, {parallel_engine.node_count} nodes, '
+              f'{parallel_engine.prefix_count} prefixes, {time.perf_counter() - start:.2f} s')
@@ -0,0 +1,222 @@
+"""
+This module generates random puzzles that have exactly one solution.
+
+Puzzles are generated by rejection sampling. Each face of each cube is painted with one of four colours
+chosen uniformly at random, and the puzzle is accepted if it uses all four colours and has exactly one solution.
+About one random puzzle in 23 is accepted.
+
+The sampling is done in tasks. Each task draws a batch of puzzles with its own random number generator,
+solves them together with solve_many, and returns the ones it accepts.
+The generator of task i is seeded from the SeedSequence child with spawn key (i,) of the base seed,
+so every task is reproducible on its own. The tasks can run in worker processes, and their results are
+consumed in task order, so the output only depends on the seed and the batch size,
+and not on the number of workers.
+
+Puzzles that are equivalent to one already accepted, because they differ only by rotating cubes,
+reordering cubes, or renaming colours, can be skipped so that every accepted puzzle is genuinely different.
+Each task computes the canonical keys of the puzzles it accepts, so that the skipping only costs
+a set lookup in the process that consumes the results.
+
+The accepted puzzles are streamed as JSON Lines, one object per puzzle, holding the puzzle specification
+and its solution, with the front and top rows of the solution grid written as strings of axis labels.
+"""
+import json
+import os
+from collections.abc import Iterator
+from dataclasses import dataclass
+from itertools import count
+from multiprocessing.pool import Pool
+from typing import TextIO
+
+import numpy as np
+
+from instant_insanity.core.compact_puzzle import N_CUBES, N_FACES
+from instant_insanity.core.puzzle import FaceColour, PuzzleSpec
+from instant_insanity.core.puzzle_symmetry import get_canonical_key
+from instant_insanity.solvers.batch_solver import BatchSolution, solve_many
+from instant_insanity.solvers.bitmask_solver import AXIS_LABELS
+from instant_insanity.solvers.graph_solver import GRID_ROWS
+
+# the colours of the Winning Moves puzzle
+DEFAULT_GENERATOR_COLOURS: str = 'BGRW'
+
+# the default number of puzzles sampled by each task
+DEFAULT_GENERATOR_BATCH_SIZE: int = 4096
+
+# the number of tasks submitted to each worker process at a time
+ROUND_TASKS_PER_PROCESS: int = 4
+
+
+@dataclass(frozen=True)
+class GeneratedPuzzle:
+    """
+    A generated puzzle that has exactly one solution.
+
+    Attributes:
+        puzzle_spec: the puzzle specification.
+        solution: the axis labels of each row of the solution grid, front row first.
+    """
+    puzzle_spec: PuzzleSpec
+    solution: list[str]
+
+    def to_json(self) -> str:
+        """
+        Writes the puzzle as a line of JSON.
+
+        Returns:
+            the JSON object, with the rows of the solution keyed by their face planes.
+        """
+        return json.dumps({
+            'puzzle_spec': self.puzzle_spec,
+            'solution': {row.value: axes for row, axes in zip(GRID_ROWS, self.solution)},
+        })
+
+
+# an accepted puzzle and its canonical key, or None if the key is not needed
+type KeyedPuzzle = tuple[GeneratedPuzzle, str | None]
+
+
+@dataclass(frozen=True)
+class GeneratorTask:
+    """
+    A batch of random puzzles to sample.
+
+    Attributes:
+        seed: the base seed.
+        index: the index of the task, which is the spawn key of its seed.
+        batch_size: the number of puzzles to sample.
+        colours: the initials of the four colours.
+        distinct: if True, compute the canonical key of each accepted puzzle.
+    """
+    seed: int
+    index: int
+    batch_size: int
+    colours: str
+    distinct: bool
+
+
+def run_generator_task(task: GeneratorTask) -> list[KeyedPuzzle]:
+    """
+    Samples a batch of random puzzles and keeps those that have exactly one solution.
+
+    Args:
+        task: the task.
+
+    Returns:
+        the accepted puzzles and their canonical keys, in the order they were sampled.
+    """
+    rng: np.random.Generator = np.random.default_rng(np.random.SeedSequence(task.seed, spawn_key=(task.index,)))
+    colour_codes: np.ndarray = np.array([list(FaceColour).index(FaceColour.from_initial(initial))
+                                         for initial in task.colours], dtype=np.uint8)
+    puzzles: np.ndarray = colour_codes[rng.integers(0, len(colour_codes), (task.batch_size, N_CUBES, N_FACES))]
+
+    batch_solution: BatchSolution = solve_many(puzzles, block_size=task.batch_size)
+    initials: np.ndarray = np.array([colour.name[0] for colour in FaceColour])
+    accepted: list[KeyedPuzzle] = []
+    index: int
+    for index in np.flatnonzero(batch_solution.solution_counts == 1).tolist():
+        cube_initials: np.ndarray = initials[puzzles[index]]
+        axes: list[str] = [AXIS_LABELS[axis].value for axis in batch_solution.first_solutions[index]]
+        puzzle_spec: PuzzleSpec = [''.join(cube) for cube in cube_initials]
+        puzzle: GeneratedPuzzle = GeneratedPuzzle(
+            puzzle_spec=puzzle_spec,
+            solution=[''.join(axes[:N_CUBES]), ''.join(axes[N_CUBES:])],
+        )
+        accepted.append((puzzle, get_canonical_key(puzzle_spec) if task.distinct else None))
+    return accepted
+
+
+def generate_puzzles(n_puzzles: int, seed: int = 0, processes: int | None = 1,
+                     batch_size: int = DEFAULT_GENERATOR_BATCH_SIZE, colours: str = DEFAULT_GENERATOR_COLOURS,
+                     distinct: bool = True) -> Iterator[GeneratedPuzzle]:
+    """
+    Generates random puzzles that have exactly one solution.
+
+    Args:
+        n_puzzles: the number of puzzles to generate.
+        seed: the base seed.
+        processes: the number of worker processes, None for one per CPU, or 1 to work in this process.
+        batch_size: the number of puzzles sampled by each task.
+        colours: the initials of the four colours.
+        distinct: if True, skip puzzles that are equivalent to one already generated.
+
+    Returns:
+        an iterator over the puzzles, in an order that only depends on the seed and the batch size.
+
+    Raises:
+        ValueError: if the colours are not four distinct colour initials or batch_size is not positive.
+    """
+    if len({FaceColour.from_initial(initial) for initial in colours}) != N_CUBES or len(colours) != N_CUBES:
+        raise ValueError(f'Expected {N_CUBES} distinct colour initials, got: {colours!r}')
+    if batch_size <= 0:
+        raise ValueError(f'Expected a positive batch size, got: {batch_size}')
+    return _iter_puzzles(n_puzzles, seed, processes, batch_size, colours, distinct)
+
+
+def _iter_puzzles(n_puzzles: int, seed: int, processes: int | None, batch_size: int, colours: str,
+                  distinct: bool) -> Iterator[GeneratedPuzzle]:
+    """
+    Generates random puzzles that have exactly one solution, from arguments checked by generate_puzzles().
+
+    Args:
+        n_puzzles: the number of puzzles to generate.
+        seed: the base seed.
+        processes: the number of worker processes, None for one per CPU, or 1 to work in this process.
+        batch_size: the number of puzzles sampled by each task.
+        colours: the initials of the four colours.
+        distinct: if True, skip puzzles that are equivalent to one already generated.
+
+    Returns:
+        an iterator over the puzzles.
+    """
+    if n_puzzles <= 0:
+        return
+
+    # the pool reads its whole task list at once, so the tasks are submitted a round at a time
+    round_size: int = 1 if processes == 1 else ROUND_TASKS_PER_PROCESS * (processes or os.cpu_count() or 1)
+    pool: Pool | None = Pool(processes) if processes != 1 else None
+    seen_keys: set[str] = set()
+    n_generated: int = 0
+    try:
+        first_index: int
+        for first_index in count(step=round_size):
+            tasks: list[GeneratorTask] = [GeneratorTask(seed, index, batch_size, colours, distinct)
+                                          for index in range(first_index, first_index + round_size)]
+            batches: Iterator[list[KeyedPuzzle]] = pool.imap(run_generator_task, tasks) \
+                if pool is not None else map(run_generator_task, tasks)
+            batch: list[KeyedPuzzle]
+            for batch in batches:
+                puzzle: GeneratedPuzzle
+                key: str | None
+                for puzzle, key in batch:
+                    if key is not None:
+                        if key in seen_keys:
+                            continue
+                        seen_keys.add(key)
+                    yield puzzle
+                    n_generated += 1
+                    if n_generated == n_puzzles:
+                        return
+    finally:
+        if pool is not None:
+            pool.terminate()
+
+
+def write_puzzles(puzzles: Iterator[GeneratedPuzzle], file: TextIO) -> int:
+    """
+    Streams puzzles to a file as JSON Lines.
+
+    Args:
+        puzzles: the puzzles.
+        file: the text file.
+
+    Returns:
+        the number of puzzles written.
+    """
+    n_written: int = 0
+    puzzle: GeneratedPuzzle
+    for puzzle in puzzles:
+        file.write(puzzle.to_json() + '\n')
+        file.flush()
+        n_written += 1
+    return n_written
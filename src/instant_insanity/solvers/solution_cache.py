@@ -0,0 +1,262 @@
+"""
+This module caches puzzle solutions by the canonical form of the puzzle.
+
+Equivalent puzzles have the same solutions up to the changes that relate them,
+so the cache solves each equivalence class once, stores the solutions of its canonical puzzle,
+and maps them back to whichever specification was asked for.
+
+The cache has two tiers.
+The first is an in-memory store that keeps the most recently used classes and evicts the least recently used.
+The second is an optional SQLite database file that keeps every class solved so far,
+so the solutions survive from one run to the next.
+The canonical forms of the most recently looked up specifications are kept in front of both tiers,
+so looking up the same specification again is cheaper than solving it.
+Puzzles that do not use exactly four colours have no solutions and are never canonicalised.
+"""
+import sqlite3
+from collections import OrderedDict
+from types import TracebackType
+
+from instant_insanity.core.puzzle import AxisLabel, Puzzle, PuzzleSpec, PuzzleCubeSpec
+from instant_insanity.core.puzzle_symmetry import CanonicalForm, canonicalise, normalise_puzzle_spec
+from instant_insanity.solvers.bitmask_solver import BitmaskSolver, PackedSolution, AxisIndex, AXIS_LABELS, mk_grid
+from instant_insanity.solvers.graph_solver import Grid, GRID_COLUMNS
+
+# the default number of equivalence classes kept in memory
+DEFAULT_CACHE_CAPACITY: int = 4096
+
+# the number of colours needed for a solution
+N_SOLUTION_COLOURS: int = len(GRID_COLUMNS)
+
+
+def solve_canonical(form: CanonicalForm) -> list[PackedSolution]:
+    """
+    Solves the canonical puzzle of an equivalence class.
+
+    Args:
+        form: the canonical form.
+
+    Returns:
+        the packed solutions of the canonical puzzle.
+    """
+    # each row must show every colour once, which is impossible unless there are exactly four colours
+    if len(set(form.key)) != N_SOLUTION_COLOURS:
+        return []
+    return list(BitmaskSolver(Puzzle(form.puzzle_spec)).engine.iter_solutions())
+
+
+def map_solution(form: CanonicalForm, solution: PackedSolution) -> PackedSolution:
+    """
+    Maps a solution of the canonical puzzle back to the original puzzle.
+
+    Args:
+        form: the canonical form of the original puzzle.
+        solution: a packed solution of the canonical puzzle.
+
+    Returns:
+        the packed solution of the original puzzle, with the rows swapped if needed
+        so that the first cube's front axis precedes its top axis, as GraphSolver requires.
+    """
+    n_columns: int = len(GRID_COLUMNS)
+    original: list[AxisIndex] = [0] * (2 * n_columns)
+    column: int
+    for column in range(n_columns):
+        original_column: int = form.cube_indices[column]
+        row: int
+        for row in range(2):
+            axis_label: AxisLabel = form.get_original_axis(column, AXIS_LABELS[solution[row * n_columns + column]])
+            original[row * n_columns + original_column] = AXIS_LABELS.index(axis_label)
+    if original[0] > original[n_columns]:
+        original = original[n_columns:] + original[:n_columns]
+    return tuple(original)
+
+
+def encode_solutions(solutions: list[PackedSolution]) -> str:
+    """
+    Encodes packed solutions as text for the database.
+
+    Args:
+        solutions: the packed solutions.
+
+    Returns:
+        the axis index digits of each solution, separated by semicolons.
+    """
+    return ';'.join(''.join(str(axis) for axis in solution) for solution in solutions)
+
+
+def decode_solutions(text: str) -> list[PackedSolution]:
+    """
+    Decodes packed solutions from the text stored in the database.
+
+    Args:
+        text: the text made by encode_solutions.
+
+    Returns:
+        the packed solutions.
+    """
+    if text == '':
+        return []
+    return [tuple(int(digit) for digit in item) for item in text.split(';')]
+
+
+class SolutionCache:
+    """
+    This class caches the solutions of puzzles by their canonical form.
+
+    Attributes:
+        capacity: the maximum number of equivalence classes kept in memory.
+        forms: the canonical form of each specification looked up recently, least recently used first,
+            or None if the specification does not use exactly four colours.
+        entries: the packed canonical solutions of each class kept in memory, least recently used first.
+        connection: the database connection, or None if there is no database.
+        hits: the number of lookups answered by memory or the database.
+        misses: the number of lookups that had to solve the puzzle.
+    """
+    capacity: int
+    forms: OrderedDict[tuple[PuzzleCubeSpec, ...], CanonicalForm | None]
+    entries: OrderedDict[str, list[PackedSolution]]
+    connection: sqlite3.Connection | None
+    hits: int
+    misses: int
+
+    def __init__(self, capacity: int = DEFAULT_CACHE_CAPACITY, db_path: str | None = None) -> None:
+        """
+        Args:
+            capacity: the maximum number of equivalence classes kept in memory.
+            db_path: the path of the SQLite database file, or None to cache in memory only.
+
+        Raises:
+            ValueError: if capacity is not positive.
+        """
+        if capacity <= 0:
+            raise ValueError(f'Expected a positive capacity, got: {capacity}')
+        self.capacity = capacity
+        self.forms = OrderedDict()
+        self.entries = OrderedDict()
+        self.connection = None
+        self.hits = 0
+        self.misses = 0
+        if db_path is not None:
+            self.connection = sqlite3.connect(db_path)
+            self.connection.execute(
+                'CREATE TABLE IF NOT EXISTS solutions (key TEXT PRIMARY KEY, solutions TEXT NOT NULL)')
+            self.connection.commit()
+
+    def __enter__(self) -> 'SolutionCache':
+        return self
+
+    def __exit__(self, exc_type: type[BaseException] | None, exc_value: BaseException | None,
+                 traceback: TracebackType | None) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """
+        Closes the database connection, if any.
+        """
+        if self.connection is not None:
+            self.connection.close()
+            self.connection = None
+
+    def get_canonical_solutions(self, form: CanonicalForm) -> list[PackedSolution]:
+        """
+        Gets the packed solutions of a canonical puzzle, solving it only if neither tier has them.
+
+        Args:
+            form: the canonical form.
+
+        Returns:
+            the packed solutions of the canonical puzzle.
+        """
+        solutions: list[PackedSolution] | None = self.entries.get(form.key)
+        if solutions is not None:
+            self.entries.move_to_end(form.key)
+            self.hits += 1
+            return solutions
+
+        if self.connection is not None:
+            row: tuple[str] | None = self.connection.execute(
+                'SELECT solutions FROM solutions WHERE key = ?', (form.key,)).fetchone()
+            if row is not None:
+                solutions = decode_solutions(row[0])
+                self.hits += 1
+
+        if solutions is None:
+            solutions = solve_canonical(form)
+            self.misses += 1
+            if self.connection is not None:
+                self.connection.execute('INSERT OR REPLACE INTO solutions VALUES (?, ?)',
+                                        (form.key, encode_solutions(solutions)))
+                self.connection.commit()
+
+        self.entries[form.key] = solutions
+        if len(self.entries) > self.capacity:
+            self.entries.popitem(last=False)
+        return solutions
+
+    def get_canonical_form(self, puzzle_spec: PuzzleSpec) -> CanonicalForm | None:
+        """
+        Gets the canonical form of a puzzle, canonicalising it only if it was not looked up recently.
+
+        Args:
+            puzzle_spec: the puzzle specification.
+
+        Returns:
+            the canonical form, or None if the puzzle does not use exactly four colours and so has no solutions.
+
+        Raises:
+            ValueError: if the specification is not a valid PuzzleSpec.
+        """
+        spec_key: tuple[PuzzleCubeSpec, ...] = tuple(puzzle_spec)
+        if spec_key in self.forms:
+            self.forms.move_to_end(spec_key)
+            return self.forms[spec_key]
+
+        # puzzles without exactly four colours have no solutions, so there is no need to canonicalise them
+        form: CanonicalForm | None = None
+        if len(set(''.join(puzzle_spec).upper())) == N_SOLUTION_COLOURS:
+            form = canonicalise(puzzle_spec)
+        else:
+            normalise_puzzle_spec(puzzle_spec)
+
+        self.forms[spec_key] = form
+        if len(self.forms) > self.capacity:
+            self.forms.popitem(last=False)
+        return form
+
+    def get_solutions(self, puzzle_spec: PuzzleSpec) -> list[Grid]:
+        """
+        Gets the solutions of a puzzle.
+
+        Args:
+            puzzle_spec: the puzzle specification.
+
+        Returns:
+            the solution grids, in the order GraphSolver finds them.
+
+        Raises:
+            ValueError: if the specification is not a valid PuzzleSpec.
+        """
+        form: CanonicalForm | None = self.get_canonical_form(puzzle_spec)
+        if form is None:
+            return []
+        solutions: list[PackedSolution] = sorted(map_solution(form, solution)
+                                                 for solution in self.get_canonical_solutions(form))
+        return [mk_grid(solution) for solution in solutions]
+
+    def count_solutions(self, puzzle_spec: PuzzleSpec) -> int:
+        """
+        Counts the solutions of a puzzle.
+
+        Args:
+            puzzle_spec: the puzzle specification.
+
+        Returns:
+            the number of solutions.
+
+        Raises:
+            ValueError: if the specification is not a valid PuzzleSpec.
+        """
+        form: CanonicalForm | None = self.get_canonical_form(puzzle_spec)
+        if form is None:
+            return 0
+        return len(self.get_canonical_solutions(form))
@@ -0,0 +1,207 @@
+"""
+This module counts the solutions of a puzzle by dynamic programming, without enumerating them.
+
+A solution assigns each cube a front axis and a different top axis so that each row is a 2-factor.
+Whether the remaining cubes can complete a partial assignment only depends on the spectra of the two rows
+so far, so the cubes are processed one at a time, keeping a count of the partial assignments that reach
+each pair of spectra. The spectra are packed into integers as in BitmaskEngine.
+The number of solutions is the count of the pair of spectra in which every colour has degree 2.
+
+As in GraphSolver, the first cube's front axis must precede its top axis, so that the two rows
+are not counted again when they are swapped.
+
+A pair of spectra is dropped if a counter exceeds 2, or if some colour can no longer reach degree 2
+because the remaining cubes cannot supply enough of it. The second check compares each counter with
+the most that the remaining cubes can add to it, capped at 2, which is precomputed for each cube.
+
+The work depends on the number of distinct pairs of spectra rather than the number of solutions,
+so counting is much faster than enumerating for puzzles that have many solutions.
+"""
+from collections import Counter
+from collections.abc import Iterable
+
+from instant_insanity.core.general_puzzle import GeneralPuzzle
+from instant_insanity.core.puzzle import FaceColour, Puzzle, PuzzleSpec, CARTEBLANCHE_PUZZLE, WINNING_MOVES_PUZZLE
+from instant_insanity.solvers.bitmask_solver import COUNTER_BITS, CubeEdges, PackedSpectrum, mk_cube_edges, \
+    pack_counters, unpack_spectrum
+from instant_insanity.solvers.general_solver import mk_general_cube_edges
+from instant_insanity.solvers.graph_solver import GRID_COLUMNS
+
+# the axis pairs that a cube may have in the front and top rows
+AXIS_PAIRS: list[tuple[int, int]] = [(front, top) for front in range(3) for top in range(3) if front != top]
+
+# the axis pairs that the first cube may have
+FIRST_AXIS_PAIRS: list[tuple[int, int]] = [(front, top) for front, top in AXIS_PAIRS if front < top]
+
+# a state is the pair of packed spectra of the front and top rows
+type CounterState = tuple[PackedSpectrum, PackedSpectrum]
+
+
+def mk_suffix_bounds(cube_edges: list[CubeEdges], n_colours: int) -> list[PackedSpectrum]:
+    """
+    Makes the most that the cubes after each position can add to each counter of a row, capped at 2.
+
+    Args:
+        cube_edges: the packed edges of each cube.
+        n_colours: the number of colours.
+
+    Returns:
+        the packed bounds, where bound i is for the cubes from position i on, and the last bound is zero.
+    """
+    totals: list[int] = [0] * n_colours
+    bounds: list[PackedSpectrum] = [0]
+    edges: CubeEdges
+    for edges in reversed(cube_edges):
+        counts: list[list[int]] = [unpack_spectrum(edge, n_colours) for edge in edges]
+        colour: int
+        for colour in range(n_colours):
+            totals[colour] += max(count[colour] for count in counts)
+        bounds.append(sum(min(2, total) << (COUNTER_BITS * colour) for colour, total in enumerate(totals)))
+    bounds.reverse()
+    return bounds
+
+
+class SolutionCounter:
+    """
+    This class counts the solutions of a puzzle given as packed cube edges.
+
+    Attributes:
+        cube_edges: the packed edges of each cube.
+        n_colours: the number of colours.
+        overflow_bias: the packed spectrum that adds 5 to every counter.
+        reach_bias: the packed spectrum that adds 6 to every counter.
+        high_bits: the packed spectrum that selects the high bit of every counter.
+        suffix_bounds: the most that the cubes from each position on can add to each counter, capped at 2.
+        max_state_count: the largest number of states kept after any cube by the last count.
+    """
+    cube_edges: list[CubeEdges]
+    n_colours: int
+    overflow_bias: PackedSpectrum
+    reach_bias: PackedSpectrum
+    high_bits: PackedSpectrum
+    suffix_bounds: list[PackedSpectrum]
+    max_state_count: int
+
+    def __init__(self, cube_edges: list[CubeEdges], n_colours: int) -> None:
+        """
+        Args:
+            cube_edges: the packed edges of each cube.
+            n_colours: the number of colours.
+
+        Raises:
+            ValueError: if the number of colours is not the number of cubes.
+        """
+        if n_colours != len(cube_edges):
+            raise ValueError(f'Expected {len(cube_edges)} colours, got: {n_colours}')
+        self.cube_edges = cube_edges
+        self.n_colours = n_colours
+        self.overflow_bias = pack_counters(n_colours, 5)
+        self.reach_bias = pack_counters(n_colours, 6)
+        self.high_bits = pack_counters(n_colours, 1 << (COUNTER_BITS - 1))
+        self.suffix_bounds = mk_suffix_bounds(cube_edges, n_colours)
+        self.max_state_count = 0
+
+    def is_viable(self, spectrum: PackedSpectrum, bound: PackedSpectrum) -> bool:
+        """
+        Checks if a row spectrum can still be completed to a 2-factor.
+
+        Args:
+            spectrum: the packed spectrum of the row.
+            bound: the most that the remaining cubes can add to each counter, capped at 2.
+
+        Returns:
+            True if no counter exceeds 2 and every counter can still reach 2, False otherwise.
+        """
+        if (spectrum + self.overflow_bias) & self.high_bits:
+            return False
+        # a counter plus its bound is at most 4, and adding 6 sets its high bit exactly when it reaches 2
+        return (spectrum + bound + self.reach_bias) & self.high_bits == self.high_bits
+
+    def count(self) -> int:
+        """
+        Counts the solutions.
+
+        Returns:
+            the number of solutions.
+        """
+        states: dict[CounterState, int] = {(0, 0): 1}
+        self.max_state_count = 1
+        position: int
+        edges: CubeEdges
+        for position, edges in enumerate(self.cube_edges):
+            bound: PackedSpectrum = self.suffix_bounds[position + 1]
+            axis_pairs: list[tuple[int, int]] = FIRST_AXIS_PAIRS if position == 0 else AXIS_PAIRS
+            next_states: dict[CounterState, int] = {}
+            front_spectrum: PackedSpectrum
+            top_spectrum: PackedSpectrum
+            count: int
+            for (front_spectrum, top_spectrum), count in states.items():
+                front_axis: int
+                top_axis: int
+                for front_axis, top_axis in axis_pairs:
+                    front: PackedSpectrum = front_spectrum + edges[front_axis]
+                    if not self.is_viable(front, bound):
+                        continue
+                    top: PackedSpectrum = top_spectrum + edges[top_axis]
+                    if not self.is_viable(top, bound):
+                        continue
+                    next_states[(front, top)] = next_states.get((front, top), 0) + count
+            states = next_states
+            self.max_state_count = max(self.max_state_count, len(states))
+
+        full: PackedSpectrum = pack_counters(self.n_colours, 2)
+        return states.get((full, full), 0)
+
+
+def count_solutions(puzzle: Puzzle) -> int:
+    """
+    Counts the solutions of a puzzle.
+
+    Args:
+        puzzle: the puzzle.
+
+    Returns:
+        the number of solutions, which is zero unless the puzzle has four colours.
+    """
+    colours: list[FaceColour] = sorted(puzzle.get_colours(), key=list(FaceColour).index)
+    if len(colours) != len(GRID_COLUMNS):
+        return 0
+    return SolutionCounter(mk_cube_edges(puzzle, colours), len(colours)).count()
+
+
+def count_general_solutions(puzzle: GeneralPuzzle) -> int:
+    """
+    Counts the solutions of a generalised puzzle.
+
+    Args:
+        puzzle: the generalised puzzle.
+
+    Returns:
+        the number of solutions, which is zero unless the puzzle has as many colours as cubes.
+    """
+    if puzzle.n_colours != puzzle.n_cubes:
+        return 0
+    return SolutionCounter(mk_general_cube_edges(puzzle), puzzle.n_colours).count()
+
+
+def mk_solution_count_histogram(puzzle_specs: Iterable[PuzzleSpec]) -> Counter[int]:
+    """
+    Counts the solutions of each puzzle and tallies the puzzles that have each count.
+
+    Args:
+        puzzle_specs: the puzzle specifications, which may be streamed.
+
+    Returns:
+        maps each number of solutions to the number of puzzles that have it.
+
+    Raises:
+        ValueError: if any specification is not a valid PuzzleSpec.
+    """
+    return Counter(count_solutions(Puzzle(puzzle_spec)) for puzzle_spec in puzzle_specs)
+
+
+if __name__ == "__main__":
+    name: str
+    puzzle: Puzzle
+    for name, puzzle in [('Winning Moves', WINNING_MOVES_PUZZLE), ('Carteblanche', CARTEBLANCHE_PUZZLE)]:
+        print(f'The {name} puzzle has {count_solutions(puzzle)} solutions.')
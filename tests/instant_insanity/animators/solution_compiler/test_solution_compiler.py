@@ -0,0 +1,128 @@
+from random import Random
+
+import numpy as np
+import pytest
+
+from instant_insanity.animators.solution_compiler import (
+    CompiledSolution,
+    OrientationCombination,
+    RotationSegment,
+    compile_solution,
+    find_solution_orientations,
+    mk_rotation_animorphs,
+)
+from instant_insanity.core.cube import FACE_PLANE_TO_UNIT_NORMAL, FacePlane
+from instant_insanity.core.cube_rotations import (
+    IDENTITY_INDEX,
+    ORIENTATION_MAPPINGS,
+    SHORTEST_TURN_PATHS,
+    rotate_orientation,
+)
+from instant_insanity.core.projection import PerspectiveProjection
+from instant_insanity.core.puzzle import (
+    CARTEBLANCHE_PUZZLE,
+    WINNING_MOVES_PUZZLE,
+    Puzzle,
+    PuzzleCubeNumber,
+    FaceLabel,
+)
+from instant_insanity.mobjects.puzzle_3d import Puzzle3D
+from instant_insanity.solvers.brute_force_solver import ORIENTATION_AXES
+from instant_insanity.solvers.graph_solver import GRID_COLUMNS, GRID_ROWS, Grid, GraphSolver
+from instant_insanity.solvers.bitmask_solver import AXIS_LABELS
+
+PUZZLES: list[tuple[str, Puzzle]] = [
+    ("winning_moves", WINNING_MOVES_PUZZLE),
+    ("carteblanche", CARTEBLANCHE_PUZZLE),
+]
+
+
+def mk_solutions(puzzle: Puzzle) -> list[Grid]:
+    solver: GraphSolver = GraphSolver(puzzle)
+    solver.solve()
+    return solver.solutions
+
+
+def apply_segments(start: OrientationCombination, segments: list[RotationSegment]) -> OrientationCombination:
+    orientations: list[int] = list(start)
+    segment: RotationSegment
+    for segment in segments:
+        for index, cube_number in enumerate(PuzzleCubeNumber):
+            if segment.mask[cube_number]:
+                orientations[index] = rotate_orientation(orientations[index], segment.axis)
+    return tuple(orientations)
+
+
+@pytest.mark.parametrize("puzzle", [puzzle for _, puzzle in PUZZLES], ids=[name for name, _ in PUZZLES])
+def test_solution_orientations_show_grid(puzzle: Puzzle) -> None:
+    grid: Grid
+    for grid in mk_solutions(puzzle):
+        combinations: list[OrientationCombination] = find_solution_orientations(puzzle, grid)
+        assert len(combinations) >= 8
+        rows: list[list[int]] = [[AXIS_LABELS.index(grid[(row, column)]) for column in GRID_COLUMNS]
+                                 for row in GRID_ROWS]
+        for combination in combinations:
+            axes: list[list[int]] = ORIENTATION_AXES[list(combination)].T.tolist()
+            assert axes == rows or axes == rows[::-1]
+
+
+def test_winning_moves_needs_two_segments() -> None:
+    compiled: CompiledSolution = compile_solution(WINNING_MOVES_PUZZLE, mk_solutions(WINNING_MOVES_PUZZLE)[0])
+    assert len(compiled.segments) == 2
+
+
+@pytest.mark.parametrize("puzzle", [puzzle for _, puzzle in PUZZLES], ids=[name for name, _ in PUZZLES])
+def test_compiled_segments_reach_target(puzzle: Puzzle) -> None:
+    random: Random = Random(0)
+    grid: Grid
+    for grid in mk_solutions(puzzle):
+        targets: list[OrientationCombination] = find_solution_orientations(puzzle, grid)
+        for _ in range(5):
+            start: OrientationCombination = tuple(random.randrange(24) for _ in PuzzleCubeNumber)
+            compiled: CompiledSolution = compile_solution(puzzle, grid, start)
+            assert compiled.target_orientations in targets
+            assert apply_segments(start, compiled.segments) == compiled.target_orientations
+
+            # the segments can't be fewer than the turns of the cube that is furthest from every target
+            lower_bound: int = max(min(len(SHORTEST_TURN_PATHS[start_index][target[index]]) for target in targets)
+                                   for index, start_index in enumerate(start))
+            assert lower_bound <= len(compiled.segments)
+            for segment in compiled.segments:
+                assert any(segment.mask.values())
+
+
+def test_compile_solution_rejects_non_solution() -> None:
+    grid: Grid = mk_solutions(WINNING_MOVES_PUZZLE)[0]
+    with pytest.raises(ValueError):
+        compile_solution(CARTEBLANCHE_PUZZLE, grid)
+
+
+def test_find_solution_orientations_rejects_incomplete_grid() -> None:
+    grid: Grid = dict(mk_solutions(WINNING_MOVES_PUZZLE)[0])
+    grid[(GRID_ROWS[0], GRID_COLUMNS[0])] = None
+    with pytest.raises(ValueError, match='grid is not a complete solution'):
+        find_solution_orientations(WINNING_MOVES_PUZZLE, grid)
+
+
+def test_compile_solution_rejects_wrong_start_count() -> None:
+    grid: Grid = mk_solutions(WINNING_MOVES_PUZZLE)[0]
+    with pytest.raises(ValueError):
+        compile_solution(WINNING_MOVES_PUZZLE, grid, [IDENTITY_INDEX])
+
+
+def test_animorphs_rotate_puzzle3d_into_solution() -> None:
+    viewpoint: np.ndarray = np.array([2, 2, 6], dtype=np.float64)
+    puzzle3d: Puzzle3D = Puzzle3D(PerspectiveProjection(viewpoint, camera_z=2.0), WINNING_MOVES_PUZZLE)
+    compiled: CompiledSolution = compile_solution(WINNING_MOVES_PUZZLE, mk_solutions(WINNING_MOVES_PUZZLE)[0])
+    for animorph in mk_rotation_animorphs(puzzle3d, compiled.segments):
+        animorph.morph_to(1.0)
+        puzzle3d.checkpoint()
+
+    for cube_number, orientation_index in zip(PuzzleCubeNumber, compiled.target_orientations):
+        cube_centre: np.ndarray = puzzle3d.mk_cube_centre(cube_number, puzzle3d.puzzle_centre, puzzle3d.cube_delta)
+        plane: FacePlane
+        label: FaceLabel
+        for plane, label in ORIENTATION_MAPPINGS[orientation_index].items():
+            face_centre: np.ndarray = np.mean(puzzle3d.key_to_model_path[(cube_number, label)], axis=0)
+            direction: np.ndarray = face_centre - cube_centre
+            assert np.allclose(direction / np.linalg.norm(direction), FACE_PLANE_TO_UNIT_NORMAL[plane])
@@ -0,0 +1,7 @@
+import sys
+from pathlib import Path
+
+# the test files import the shared helpers in this directory
+TESTS_DIR: str = str(Path(__file__).parent)
+if TESTS_DIR not in sys.path:
+    sys.path.insert(0, TESTS_DIR)
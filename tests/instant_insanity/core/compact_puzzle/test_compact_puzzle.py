@@ -0,0 +1,71 @@
+import numpy as np
+import pytest
+
+from instant_insanity.core.compact_puzzle import CompactPuzzle, encode_puzzle_specs, load_compact_puzzles, \
+    mk_compact_puzzles
+from instant_insanity.core.puzzle import FaceColour, FaceLabel, Puzzle, PuzzleCubeNumber, PuzzleSpec, \
+    CARTEBLANCHE_PUZZLE_SPEC, WINNING_MOVES_PUZZLE_SPEC
+
+
+@pytest.mark.parametrize("puzzle_spec", [CARTEBLANCHE_PUZZLE_SPEC, WINNING_MOVES_PUZZLE_SPEC])
+def test_round_trip(puzzle_spec: PuzzleSpec) -> None:
+    puzzle: Puzzle = Puzzle(puzzle_spec)
+    compact_puzzle: CompactPuzzle = CompactPuzzle.from_puzzle(puzzle)
+    assert compact_puzzle == CompactPuzzle.from_spec(puzzle_spec)
+    assert compact_puzzle.to_spec() == puzzle_spec
+    round_trip: Puzzle = compact_puzzle.to_puzzle()
+    assert round_trip.number_to_cube == puzzle.number_to_cube
+    assert compact_puzzle.get_colours() == sorted(puzzle.get_colours(), key=list(FaceColour).index)
+
+
+def test_colour_codes() -> None:
+    compact_puzzle: CompactPuzzle = CompactPuzzle.from_spec(WINNING_MOVES_PUZZLE_SPEC)
+    colour_codes: np.ndarray = compact_puzzle.colour_codes
+    assert colour_codes.shape == (4, 6)
+    assert not colour_codes.flags.writeable
+    colours: list[FaceColour] = list(FaceColour)
+    puzzle: Puzzle = Puzzle(WINNING_MOVES_PUZZLE_SPEC)
+    for cube_index, cube_number in enumerate(PuzzleCubeNumber):
+        for face_index, face_label in enumerate(FaceLabel):
+            assert colours[colour_codes[cube_index, face_index]] == \
+                puzzle.number_to_cube[cube_number].face_label_to_colour[face_label]
+
+
+def test_equality_and_hash() -> None:
+    lower_case: PuzzleSpec = [cube_spec.lower() for cube_spec in WINNING_MOVES_PUZZLE_SPEC]
+    assert CompactPuzzle.from_spec(lower_case) == CompactPuzzle.from_spec(WINNING_MOVES_PUZZLE_SPEC)
+    assert CompactPuzzle.from_spec(WINNING_MOVES_PUZZLE_SPEC) != CompactPuzzle.from_spec(CARTEBLANCHE_PUZZLE_SPEC)
+    assert len({CompactPuzzle.from_spec(spec) for spec in [lower_case, WINNING_MOVES_PUZZLE_SPEC]}) == 1
+    assert not hasattr(CompactPuzzle.from_spec(WINNING_MOVES_PUZZLE_SPEC), '__dict__')
+
+
+def test_load_compact_puzzles() -> None:
+    puzzle_specs: list[PuzzleSpec] = [WINNING_MOVES_PUZZLE_SPEC, CARTEBLANCHE_PUZZLE_SPEC] * 3
+    compact_puzzles: list[CompactPuzzle] = load_compact_puzzles(puzzle_specs)
+    assert [compact_puzzle.to_spec() for compact_puzzle in compact_puzzles] == puzzle_specs
+    assert mk_compact_puzzles(encode_puzzle_specs(puzzle_specs)) == compact_puzzles
+
+
+@pytest.mark.parametrize(
+    "codes",
+    [bytes(23), bytes(25), bytes([7] * 24)]
+)
+def test_rejects_bad_codes(codes: bytes) -> None:
+    with pytest.raises(ValueError):
+        CompactPuzzle(codes)
+
+
+@pytest.mark.parametrize(
+    "puzzle_spec",
+    [['GWBRRR'] * 3, ['GWBRRR', 'RGBBWG', 'WRWBGR', 'BRGWB'], ['GWBRRR', 'RGBBWG', 'WRWBGR', 'BRGWBX']]
+)
+def test_from_spec_rejects_bad_specs(puzzle_spec: PuzzleSpec) -> None:
+    with pytest.raises(ValueError):
+        CompactPuzzle.from_spec(puzzle_spec)
+
+
+def test_mk_compact_puzzles_rejects_bad_arrays() -> None:
+    with pytest.raises(ValueError):
+        mk_compact_puzzles(np.zeros((2, 4, 5), dtype=np.uint8))
+    with pytest.raises(ValueError):
+        mk_compact_puzzles(np.full((2, 4, 6), 9, dtype=np.uint8))
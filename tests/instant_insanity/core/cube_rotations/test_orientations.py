@@ -0,0 +1,35 @@
+import pytest
+
+from instant_insanity.core.cube import FacePlane
+from instant_insanity.core.cube_rotations import CUBE_ORIENTATIONS, ORIENTATION_MAPPINGS, CubeOrientation, \
+    PlaneToLabelMapping
+from instant_insanity.core.puzzle import FaceLabel
+
+
+def test_there_are_24_orientations() -> None:
+    assert len(CUBE_ORIENTATIONS) == 24
+    assert len({(orientation.front, orientation.top) for orientation in CUBE_ORIENTATIONS}) == 24
+
+
+def test_mappings_are_distinct_rotations() -> None:
+    assert len(ORIENTATION_MAPPINGS) == 24
+    assert len({tuple(sorted(mapping.items())) for mapping in ORIENTATION_MAPPINGS}) == 24
+
+
+def test_mappings_match_orientations() -> None:
+    orientation: CubeOrientation
+    mapping: PlaneToLabelMapping
+    for orientation, mapping in zip(CUBE_ORIENTATIONS, ORIENTATION_MAPPINGS):
+        assert mapping[FacePlane.FRONT] == orientation.front
+        assert mapping[FacePlane.TOP] == orientation.top
+        for plane, label in orientation.get_face_plane_to_label_mapping().items():
+            assert mapping[plane] == label
+
+
+@pytest.mark.parametrize("front, top", [
+    (FaceLabel.X, FaceLabel.X),
+    (FaceLabel.X, FaceLabel.X_PRIME),
+])
+def test_orientation_rejects_non_adjacent_faces(front: FaceLabel, top: FaceLabel) -> None:
+    with pytest.raises(ValueError):
+        CubeOrientation(front, top)
@@ -0,0 +1,101 @@
+import numpy as np
+import pytest
+from manim import LEFT, RIGHT, UP, DOWN, IN, OUT
+from manim.typing import Vector3D
+
+from instant_insanity.core.cube_rotations import (
+    COMPOSITION_TABLE,
+    IDENTITY_INDEX,
+    INITIAL_PLANE_TO_LABEL_MAPPING,
+    INVERSE_TABLE,
+    ORIENTATION_MAPPINGS,
+    ORIENTATION_PERMUTATIONS,
+    QUARTER_TURN_AXES,
+    QUARTER_TURN_TABLE,
+    FACE_PLANES,
+    PlaneToLabelMapping,
+    apply_quarter_turns,
+    get_orientation_index,
+    rotate_by_vector,
+    rotate_orientation,
+)
+
+N_ORIENTATIONS: int = 24
+
+
+def apply_permutation(permutation: np.ndarray, mapping: PlaneToLabelMapping) -> PlaneToLabelMapping:
+    return {plane: mapping[FACE_PLANES[source]] for plane, source in zip(FACE_PLANES, permutation)}
+
+
+def test_identity_is_initial_mapping() -> None:
+    assert ORIENTATION_MAPPINGS[IDENTITY_INDEX] == INITIAL_PLANE_TO_LABEL_MAPPING
+    assert list(ORIENTATION_PERMUTATIONS[IDENTITY_INDEX]) == list(range(len(FACE_PLANES)))
+
+
+def test_permutations_give_mappings() -> None:
+    index: int
+    for index in range(N_ORIENTATIONS):
+        mapping: PlaneToLabelMapping = apply_permutation(ORIENTATION_PERMUTATIONS[index],
+                                                         INITIAL_PLANE_TO_LABEL_MAPPING)
+        assert mapping == ORIENTATION_MAPPINGS[index]
+        assert get_orientation_index(mapping) == index
+
+
+def test_composition_table_matches_permutations() -> None:
+    first: int
+    second: int
+    for first in range(N_ORIENTATIONS):
+        for second in range(N_ORIENTATIONS):
+            mapping: PlaneToLabelMapping = apply_permutation(ORIENTATION_PERMUTATIONS[second],
+                                                             ORIENTATION_MAPPINGS[first])
+            assert COMPOSITION_TABLE[first, second] == get_orientation_index(mapping)
+
+
+def test_composition_table_is_a_group() -> None:
+    assert np.all(COMPOSITION_TABLE[IDENTITY_INDEX] == np.arange(N_ORIENTATIONS))
+    assert np.all(COMPOSITION_TABLE[:, IDENTITY_INDEX] == np.arange(N_ORIENTATIONS))
+    row: np.ndarray
+    for row in COMPOSITION_TABLE:
+        assert sorted(row) == list(range(N_ORIENTATIONS))
+    # (i j) k == i (j k)
+    left: np.ndarray = COMPOSITION_TABLE[COMPOSITION_TABLE, :]
+    right: np.ndarray = COMPOSITION_TABLE[np.arange(N_ORIENTATIONS)[:, np.newaxis, np.newaxis], COMPOSITION_TABLE]
+    assert left.shape == (N_ORIENTATIONS, N_ORIENTATIONS, N_ORIENTATIONS)
+    assert np.array_equal(left, right)
+
+
+def test_inverse_table() -> None:
+    index: int
+    for index in range(N_ORIENTATIONS):
+        assert COMPOSITION_TABLE[index, INVERSE_TABLE[index]] == IDENTITY_INDEX
+        assert COMPOSITION_TABLE[INVERSE_TABLE[index], index] == IDENTITY_INDEX
+
+
+@pytest.mark.parametrize("vector", QUARTER_TURN_AXES, ids=["LEFT", "RIGHT", "UP", "DOWN", "OUT", "IN"])
+def test_quarter_turn_table_matches_rotate_by_vector(vector: Vector3D) -> None:
+    index: int
+    for index in range(N_ORIENTATIONS):
+        mapping: PlaneToLabelMapping = rotate_by_vector(vector, ORIENTATION_MAPPINGS[index])
+        assert rotate_orientation(index, vector) == get_orientation_index(mapping)
+
+
+def test_quarter_turn_table_shape() -> None:
+    assert QUARTER_TURN_TABLE.shape == (N_ORIENTATIONS, len(QUARTER_TURN_AXES))
+
+
+@pytest.mark.parametrize("vectors", [
+    [RIGHT, RIGHT, RIGHT, RIGHT],
+    [UP, DOWN],
+    [OUT, LEFT, IN, RIGHT, RIGHT, IN, LEFT, OUT],
+])
+def test_apply_quarter_turns(vectors: list[Vector3D]) -> None:
+    mapping: PlaneToLabelMapping = INITIAL_PLANE_TO_LABEL_MAPPING
+    vector: Vector3D
+    for vector in vectors:
+        mapping = rotate_by_vector(vector, mapping)
+    assert apply_quarter_turns(IDENTITY_INDEX, vectors) == get_orientation_index(mapping)
+
+
+def test_rotate_orientation_rejects_invalid_vector() -> None:
+    with pytest.raises(ValueError):
+        rotate_orientation(IDENTITY_INDEX, np.array([1.0, 1.0, 0.0]))
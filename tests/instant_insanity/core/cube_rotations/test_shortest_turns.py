@@ -0,0 +1,98 @@
+from collections import Counter
+
+import numpy as np
+import pytest
+from manim.typing import Vector3D
+from scipy.spatial.transform import Rotation
+
+from instant_insanity.core.cube import FacePlane, FACE_PLANE_TO_UNIT_NORMAL
+from instant_insanity.core.cube_rotations import (
+    CUBE_ORIENTATIONS,
+    IDENTITY_INDEX,
+    ORIENTATION_MAPPINGS,
+    QUARTER_TURN_AXES,
+    SHORTEST_TURN_PATHS,
+    PlaneToLabelMapping,
+    apply_quarter_turns,
+    get_shortest_turns,
+    get_shortest_turns_to_front,
+    mk_turns_rotation,
+    rotate_to_match_front,
+)
+from instant_insanity.core.puzzle import FaceLabel
+
+N_ORIENTATIONS: int = 24
+
+
+def get_label_plane(mapping: PlaneToLabelMapping, label: FaceLabel) -> FacePlane:
+    return next(plane for plane, plane_label in mapping.items() if plane_label == label)
+
+
+def test_shortest_turns_reach_target() -> None:
+    start: int
+    target: int
+    for start in range(N_ORIENTATIONS):
+        for target in range(N_ORIENTATIONS):
+            assert apply_quarter_turns(start, get_shortest_turns(start, target)) == target
+
+
+def test_shortest_turn_lengths() -> None:
+    # from any orientation: itself, 6 quarter turns, 11 at two turns, and 6 edge half turns at three
+    start: int
+    for start in range(N_ORIENTATIONS):
+        lengths: Counter[int] = Counter(len(path) for path in SHORTEST_TURN_PATHS[start])
+        assert lengths == Counter({0: 1, 1: 6, 2: 11, 3: 6})
+
+
+def test_shortest_turns_are_shortest() -> None:
+    # a path of n turns is shortest if no orientation within n - 1 turns is the target
+    start: int
+    for start in range(N_ORIENTATIONS):
+        # the orientations within length - 1 turns of the start
+        reached: set[int] = {start}
+        length: int
+        for length in range(1, 4):
+            targets: set[int] = {target for target in range(N_ORIENTATIONS)
+                                 if len(SHORTEST_TURN_PATHS[start][target]) == length}
+            assert targets.isdisjoint(reached)
+            reached |= {apply_quarter_turns(index, [axis]) for index in reached for axis in QUARTER_TURN_AXES}
+
+
+@pytest.mark.parametrize("target_front", list(FaceLabel))
+def test_shortest_turns_to_front(target_front: FaceLabel) -> None:
+    start: int
+    for start in range(N_ORIENTATIONS):
+        turns: list[Vector3D] = get_shortest_turns_to_front(start, target_front)
+        assert CUBE_ORIENTATIONS[apply_quarter_turns(start, turns)].front == target_front
+        assert len(turns) <= 2
+        if CUBE_ORIENTATIONS[start].front == target_front:
+            assert turns == []
+
+
+def test_turns_rotation_moves_labels_with_the_cube() -> None:
+    start: int
+    target: int
+    for start in range(N_ORIENTATIONS):
+        for target in range(N_ORIENTATIONS):
+            rotation: Rotation = mk_turns_rotation(get_shortest_turns(start, target))
+            label: FaceLabel
+            for label in FaceLabel:
+                before: FacePlane = get_label_plane(ORIENTATION_MAPPINGS[start], label)
+                after: FacePlane = get_label_plane(ORIENTATION_MAPPINGS[target], label)
+                assert np.allclose(rotation.apply(FACE_PLANE_TO_UNIT_NORMAL[before]),
+                                   FACE_PLANE_TO_UNIT_NORMAL[after])
+
+
+@pytest.mark.parametrize("target_front", list(FaceLabel))
+def test_rotate_to_match_front(target_front: FaceLabel) -> None:
+    index: int
+    for index in range(N_ORIENTATIONS):
+        rotation: Rotation = rotate_to_match_front(CUBE_ORIENTATIONS[index], target_front)
+        plane: FacePlane = get_label_plane(ORIENTATION_MAPPINGS[index], target_front)
+        assert np.allclose(rotation.apply(FACE_PLANE_TO_UNIT_NORMAL[plane]),
+                           FACE_PLANE_TO_UNIT_NORMAL[FacePlane.FRONT])
+
+
+def test_rotate_to_match_front_is_identity_when_matched() -> None:
+    rotation: Rotation = rotate_to_match_front(CUBE_ORIENTATIONS[IDENTITY_INDEX], FaceLabel.X)
+    assert np.allclose(rotation.as_matrix(), np.eye(3))
@@ -0,0 +1,57 @@
+import numpy as np
+import pytest
+
+from instant_insanity.core.depth_sort import DepthSort, find_overlapping_boxes
+from instant_insanity.core.projection import Projection, OrthographicProjection
+from instant_insanity.core.geometry_types import Point3D_Array, PolygonKeyToVertexPathMapping
+
+
+def mk_brute_force_pairs(bounds: np.ndarray) -> list[tuple[int, int]]:
+    return [(i, j)
+            for i in range(len(bounds))
+            for j in range(i + 1, len(bounds))
+            if bounds[i, 0] <= bounds[j, 2] and bounds[j, 0] <= bounds[i, 2]
+            and bounds[i, 1] <= bounds[j, 3] and bounds[j, 1] <= bounds[i, 3]]
+
+
+@pytest.mark.parametrize("seed", [0, 1, 2])
+def test_find_overlapping_boxes_matches_brute_force(seed: int) -> None:
+    rng: np.random.Generator = np.random.default_rng(seed)
+    # round the corners so that many boxes touch
+    corners: np.ndarray = np.round(rng.uniform(0.0, 10.0, size=(60, 2)))
+    sizes: np.ndarray = np.round(rng.uniform(0.0, 3.0, size=(60, 2)))
+    bounds: np.ndarray = np.hstack([corners, corners + sizes])
+    pairs: np.ndarray = find_overlapping_boxes(bounds)
+    assert [tuple(pair) for pair in pairs.tolist()] == mk_brute_force_pairs(bounds)
+
+
+def test_find_overlapping_boxes_of_no_boxes() -> None:
+    assert find_overlapping_boxes(np.zeros((0, 4))).shape == (0, 2)
+
+
+def test_find_overlapping_boxes_rejects_bad_shape() -> None:
+    with pytest.raises(ValueError):
+        find_overlapping_boxes(np.zeros((3, 3)))
+
+
+def test_depth_sort_of_separated_stacks() -> None:
+    u: np.ndarray = np.array([0, 0, 1], dtype=np.float64)
+    projection: Projection = OrthographicProjection(u, camera_z=0.0)
+    triangle: Point3D_Array = np.array([
+        [0, 0, 0],
+        [1, 0, 0],
+        [1, 1, 0],
+    ], dtype=np.float64)
+
+    # each stack is three overlapping triangles at decreasing depths, far from the other stacks
+    paths: PolygonKeyToVertexPathMapping[tuple[int, int]] = {
+        (stack, level): triangle + np.array([3.0 * stack, 0.2 * level, -float(level)])
+        for stack in range(10)
+        for level in range(3)
+    }
+    sorted_keys: list[tuple[int, int]] = list(DepthSort(projection).depth_sort(paths).keys())
+    assert len(sorted_keys) == len(paths)
+    stack: int
+    for stack in range(10):
+        levels: list[int] = [level for key_stack, level in sorted_keys if key_stack == stack]
+        assert levels == [2, 1, 0]
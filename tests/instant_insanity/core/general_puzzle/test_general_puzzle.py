@@ -0,0 +1,35 @@
+import random
+
+import pytest
+
+from instant_insanity.core.general_puzzle import GeneralPuzzle, mk_random_general_puzzle_spec
+from instant_insanity.core.puzzle import AxisLabel, WINNING_MOVES_PUZZLE
+
+
+def test_general_puzzle_colours() -> None:
+    puzzle: GeneralPuzzle = GeneralPuzzle(['ABCDEA', 'EEDDCB', 'aBCDEE', 'ABCDEE', 'ABCDEE'])
+    assert puzzle.colours == ['A', 'B', 'C', 'D', 'E', 'a']
+    assert puzzle.n_cubes == 5
+    assert puzzle.n_colours == 6
+    assert puzzle.get_axis_colour_pair(0, AxisLabel.X) == (0, 1)
+    assert puzzle.get_axis_colour_pair(0, AxisLabel.Z) == (4, 0)
+    assert puzzle.get_axis_colour_pair(2, AxisLabel.X) == (5, 1)
+
+
+@pytest.mark.parametrize("puzzle_spec", [[], ['ABCDE'], ['ABCDEFG'], [123456]])
+def test_general_puzzle_invalid(puzzle_spec) -> None:
+    with pytest.raises(ValueError):
+        GeneralPuzzle(puzzle_spec)
+
+
+def test_from_puzzle() -> None:
+    puzzle: GeneralPuzzle = GeneralPuzzle.from_puzzle(WINNING_MOVES_PUZZLE)
+    assert puzzle.puzzle_spec == ['GWBRRR', 'RGBBWG', 'WRWBGR', 'BRGWBW']
+    assert puzzle.colours == ['B', 'G', 'R', 'W']
+
+
+@pytest.mark.parametrize("n_cubes", [1, 5, 12])
+def test_mk_random_general_puzzle_spec(n_cubes: int) -> None:
+    puzzle: GeneralPuzzle = GeneralPuzzle(mk_random_general_puzzle_spec(n_cubes, random.Random(n_cubes)))
+    assert puzzle.n_cubes == n_cubes
+    assert puzzle.n_colours == n_cubes
@@ -0,0 +1,67 @@
+import numpy as np
+import pytest
+
+from instant_insanity.core.convex_planar_polygon import ConvexPlanarPolygon
+from instant_insanity.core.projection import (
+    OrthographicProjection,
+    PerspectiveProjection,
+    Projection,
+    mk_standard_orthographic_projection,
+    stack_planes,
+)
+
+
+def mk_projections() -> list[Projection]:
+    u: np.ndarray = np.array([1.0, 2.0, 5.0], dtype=np.float64)
+    return [
+        mk_standard_orthographic_projection(),
+        OrthographicProjection(u / np.linalg.norm(u), camera_z=0.5, scene_x=1.0, scene_per_model=2.0),
+        PerspectiveProjection(np.array([2.0, 2.0, 6.0], dtype=np.float64), camera_z=2.0),
+        PerspectiveProjection(np.array([-1.0, 3.0, 8.0], dtype=np.float64), camera_z=1.0, scene_y=-2.0,
+                              scene_per_model=0.5),
+    ]
+
+
+def mk_polygons(n: int) -> list[ConvexPlanarPolygon]:
+    rng: np.random.Generator = np.random.default_rng(0)
+    triangle: np.ndarray = np.array([[0.0, 0.0, 0.0], [1.0, 0.0, 0.0], [0.0, 1.0, 0.0]])
+    polygons: list[ConvexPlanarPolygon] = []
+    for _ in range(n):
+        # tilt the triangle a little and move it behind the camera planes
+        tilt: np.ndarray = np.array([[1.0, 0.0, 0.0], [0.0, 1.0, 0.0], rng.uniform(-0.3, 0.3, 3)])
+        polygons.append(ConvexPlanarPolygon(triangle @ tilt.T + rng.uniform(-1.0, 1.0, 3) - [0.0, 0.0, 2.0]))
+    return polygons
+
+
+@pytest.mark.parametrize("projection", mk_projections(), ids=lambda projection: type(projection).__name__)
+def test_polygons_t_matches_polygon_t(projection: Projection) -> None:
+    polygons: list[ConvexPlanarPolygon] = mk_polygons(50)
+    xy: np.ndarray = np.random.default_rng(1).uniform(-1.0, 1.0, size=(len(polygons), 2))
+    expected: list[float] = [projection.polygon_t(polygon, x, y) for polygon, (x, y) in zip(polygons, xy)]
+    actual: np.ndarray = projection.polygons_t(stack_planes(polygons), xy)
+    assert actual.shape == (len(polygons),)
+    assert np.allclose(actual, expected)
+
+
+def test_stack_planes() -> None:
+    polygons: list[ConvexPlanarPolygon] = mk_polygons(3)
+    planes: np.ndarray = stack_planes(polygons)
+    assert planes.shape == (3, 2, 3)
+    for plane, polygon in zip(planes, polygons):
+        assert np.array_equal(plane[0], polygon.get_point())
+        assert np.array_equal(plane[1], polygon.get_normal())
+
+
+def test_polygons_t_of_no_pairs() -> None:
+    projection: Projection = mk_standard_orthographic_projection()
+    assert projection.polygons_t(np.zeros((0, 2, 3)), np.zeros((0, 2))).shape == (0,)
+
+
+@pytest.mark.parametrize("planes, xy", [
+    (np.zeros((2, 3)), np.zeros((2, 2))),
+    (np.zeros((2, 2, 3)), np.zeros((3, 2))),
+    (np.zeros((2, 2, 3)), np.zeros((2, 3))),
+])
+def test_polygons_t_rejects_mismatched_shapes(planes: np.ndarray, xy: np.ndarray) -> None:
+    with pytest.raises(ValueError):
+        mk_standard_orthographic_projection().polygons_t(planes, xy)
@@ -0,0 +1,61 @@
+import numpy as np
+import pytest
+
+from instant_insanity.core.projection import (
+    OrthographicProjection,
+    PerspectiveProjection,
+    Projection,
+    mk_standard_orthographic_projection,
+)
+
+
+def mk_projections() -> list[Projection]:
+    u: np.ndarray = np.array([1.0, 2.0, 5.0], dtype=np.float64)
+    return [
+        mk_standard_orthographic_projection(),
+        OrthographicProjection(u / np.linalg.norm(u), camera_z=0.5, scene_x=1.0, scene_per_model=2.0),
+        PerspectiveProjection(np.array([2.0, 2.0, 6.0], dtype=np.float64), camera_z=2.0),
+        PerspectiveProjection(np.array([-1.0, 3.0, 8.0], dtype=np.float64), camera_z=1.0, scene_y=-2.0,
+                              scene_per_model=0.5),
+    ]
+
+
+PROJECTIONS: list[Projection] = mk_projections()
+
+
+@pytest.mark.parametrize("projection", PROJECTIONS, ids=lambda projection: type(projection).__name__)
+@pytest.mark.parametrize("shape", [(1, 3), (96, 3), (24, 4, 3), (2, 1, 3)])
+def test_project_points_matches_project_point(projection: Projection, shape: tuple[int, ...]) -> None:
+    model_points: np.ndarray = np.random.default_rng(0).uniform(-2.0, 2.0, size=shape)
+    actual: np.ndarray = projection.project_points(model_points)
+    assert actual.shape == model_points.shape
+    expected: np.ndarray = np.array([projection.project_point(model_point)
+                                     for model_point in model_points.reshape(-1, 3)]).reshape(shape)
+    assert np.allclose(actual, expected)
+
+
+@pytest.mark.parametrize("projection", PROJECTIONS, ids=lambda projection: type(projection).__name__)
+def test_project_points_does_not_modify_input(projection: Projection) -> None:
+    model_points: np.ndarray = np.random.default_rng(1).uniform(-2.0, 2.0, size=(8, 3))
+    original: np.ndarray = model_points.copy()
+    projection.project_points(model_points)
+    assert np.array_equal(model_points, original)
+
+
+@pytest.mark.parametrize("model_points", [
+    [[1.0, 2.0, 3.0]],                                   # not a numpy array
+    np.array([[1, 2, 3]], dtype=np.int64),               # wrong dtype
+    np.array([1.0, 2.0, 3.0], dtype=np.float64),         # wrong ndim
+    np.zeros((2, 2, 2, 3), dtype=np.float64),            # wrong ndim
+    np.zeros((4, 2), dtype=np.float64),                  # wrong shape
+])
+def test_project_points_rejects_invalid_input(model_points) -> None:
+    with pytest.raises((TypeError, ValueError)):
+        PROJECTIONS[0].project_points(model_points)
+
+
+def test_perspective_project_points_rejects_viewpoint() -> None:
+    viewpoint: np.ndarray = np.array([0.0, 0.0, 5.0], dtype=np.float64)
+    projection: PerspectiveProjection = PerspectiveProjection(viewpoint, camera_z=1.0)
+    with pytest.raises(ValueError):
+        projection.project_points(np.array([[0.0, 0.0, 0.0], viewpoint]))
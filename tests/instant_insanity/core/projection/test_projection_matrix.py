@@ -0,0 +1,63 @@
+import numpy as np
+import pytest
+
+from instant_insanity.core.projection import (
+    OrthographicProjection,
+    PerspectiveProjection,
+    Projection,
+    apply_projection_matrix,
+    mk_standard_orthographic_projection,
+)
+from instant_insanity.core.transformation import RigidMotion, transform_vertex_path
+
+
+def mk_projections() -> list[Projection]:
+    u: np.ndarray = np.array([1.0, 2.0, 5.0], dtype=np.float64)
+    return [
+        mk_standard_orthographic_projection(),
+        OrthographicProjection(u / np.linalg.norm(u), camera_z=0.5, scene_x=1.0, scene_z=-1.0, scene_per_model=2.0),
+        PerspectiveProjection(np.array([2.0, 2.0, 6.0], dtype=np.float64), camera_z=2.0),
+        PerspectiveProjection(np.array([-1.0, 3.0, 8.0], dtype=np.float64), camera_z=1.0, scene_y=-2.0,
+                              scene_z=0.5, scene_per_model=0.5),
+    ]
+
+
+PROJECTIONS: list[Projection] = mk_projections()
+
+
+@pytest.mark.parametrize("projection", PROJECTIONS, ids=lambda projection: type(projection).__name__)
+def test_matrix_matches_project_point(projection: Projection) -> None:
+    model_points: np.ndarray = np.random.default_rng(0).uniform(-2.0, 2.0, size=(24, 3))
+    assert projection.matrix.shape == (4, 4)
+    expected: np.ndarray = np.array([projection.project_point(model_point) for model_point in model_points])
+    assert np.allclose(apply_projection_matrix(projection.matrix, model_points), expected)
+
+
+@pytest.mark.parametrize("projection", PROJECTIONS, ids=lambda projection: type(projection).__name__)
+def test_matrix_keeps_exact_depth(projection: Projection) -> None:
+    model_points: np.ndarray = np.random.default_rng(1).uniform(-2.0, 2.0, size=(16, 3))
+    scene_points: np.ndarray = apply_projection_matrix(projection.matrix, model_points)
+    conversion = projection.conversion
+    expected_z: np.ndarray = (model_points[:, 2] - conversion.scene_origin[2]) * conversion.scene_per_model
+    assert np.allclose(scene_points[:, 2], expected_z)
+
+
+def test_orthographic_matrix_is_affine() -> None:
+    projection: Projection = mk_standard_orthographic_projection()
+    assert np.array_equal(projection.matrix[3], [0.0, 0.0, 0.0, 1.0])
+
+
+@pytest.mark.parametrize("projection", PROJECTIONS, ids=lambda projection: type(projection).__name__)
+def test_project_transformed_points(projection: Projection) -> None:
+    model_points: np.ndarray = np.random.default_rng(2).uniform(-1.0, 1.0, size=(6, 4, 3))
+    motion: RigidMotion = RigidMotion(np.array([0.3, -0.2, 0.5]), np.array([0.1, 0.2, -0.3]))
+    transformed: np.ndarray = transform_vertex_path(motion.rotation, motion.translation, model_points.reshape(-1, 3))
+    expected: np.ndarray = np.array([projection.project_point(point) for point in transformed])
+    actual: np.ndarray = projection.project_transformed_points(motion.mk_matrix(), model_points)
+    assert np.allclose(actual, expected.reshape(model_points.shape))
+
+
+def test_perspective_matrix_rejects_point_level_with_viewpoint() -> None:
+    projection: PerspectiveProjection = PerspectiveProjection(np.array([0.0, 0.0, 5.0]), camera_z=1.0)
+    with pytest.raises(ValueError, match='level with the viewpoint'):
+        apply_projection_matrix(projection.matrix, np.array([[1.0, 1.0, 5.0]]))
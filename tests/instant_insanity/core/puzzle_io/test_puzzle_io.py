@@ -0,0 +1,97 @@
+from collections.abc import Iterator
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from instant_insanity.core.compact_puzzle import encode_puzzle_specs
+from instant_insanity.core.puzzle import PuzzleSpec, CARTEBLANCHE_PUZZLE_SPEC, WINNING_MOVES_PUZZLE_SPEC
+from instant_insanity.core.puzzle_io import BINARY_PUZZLE_HEADER, BINARY_RECORD_SIZE, PuzzleFileFormat, \
+    iter_puzzle_batches, read_puzzle_file, write_puzzle_file
+from instant_insanity.solvers.batch_solver import BatchSolution, solve_many, solve_puzzle_file
+
+
+def mk_random_colour_codes(n_puzzles: int, seed: int = 0) -> np.ndarray:
+    return np.random.default_rng(seed).integers(0, 7, (n_puzzles, 4, 6), dtype=np.uint8)
+
+
+@pytest.mark.parametrize("file_format", list(PuzzleFileFormat))
+def test_round_trip(tmp_path: Path, file_format: PuzzleFileFormat) -> None:
+    colour_codes: np.ndarray = mk_random_colour_codes(1000)
+    path: Path = tmp_path / 'puzzles'
+    assert write_puzzle_file(path, colour_codes, file_format) == 1000
+    assert np.array_equal(read_puzzle_file(path), colour_codes)
+    batches: list[np.ndarray] = list(iter_puzzle_batches(path, batch_size=300))
+    assert [len(batch) for batch in batches] == [300, 300, 300, 100]
+    assert np.array_equal(np.concatenate(batches), colour_codes)
+
+
+def test_file_sizes(tmp_path: Path) -> None:
+    puzzle_specs: list[PuzzleSpec] = [WINNING_MOVES_PUZZLE_SPEC, CARTEBLANCHE_PUZZLE_SPEC]
+    text_path: Path = tmp_path / 'puzzles.txt'
+    binary_path: Path = tmp_path / 'puzzles.bin'
+    write_puzzle_file(text_path, puzzle_specs)
+    write_puzzle_file(binary_path, puzzle_specs, PuzzleFileFormat.BINARY)
+    assert text_path.read_text() == ''.join(''.join(puzzle_spec) + '\n' for puzzle_spec in puzzle_specs)
+    assert binary_path.stat().st_size == len(BINARY_PUZZLE_HEADER) + 2 * BINARY_RECORD_SIZE
+
+
+def test_read_text_file_variants(tmp_path: Path) -> None:
+    path: Path = tmp_path / 'puzzles.txt'
+    path.write_text(''.join(WINNING_MOVES_PUZZLE_SPEC).lower() + '\n' + ''.join(CARTEBLANCHE_PUZZLE_SPEC))
+    assert np.array_equal(read_puzzle_file(path), encode_puzzle_specs([WINNING_MOVES_PUZZLE_SPEC,
+                                                                       CARTEBLANCHE_PUZZLE_SPEC]))
+    path.write_text('')
+    assert read_puzzle_file(path).shape == (0, 4, 6)
+
+
+@pytest.mark.parametrize(
+    "text",
+    [
+        'GWBRRRRGBBWGWRWBGRBRGWBX\n',
+        'GWBRRRRGBBWGWRWBGRBRGWB\n',
+        'GWBRRRRGBBWGWRWBGRBRGWBWW\n',
+    ]
+)
+def test_read_rejects_bad_text(tmp_path: Path, text: str) -> None:
+    path: Path = tmp_path / 'puzzles.txt'
+    path.write_text(''.join(CARTEBLANCHE_PUZZLE_SPEC) + '\n' + text)
+    with pytest.raises(ValueError):
+        read_puzzle_file(path)
+
+
+def test_read_rejects_bad_binary(tmp_path: Path) -> None:
+    path: Path = tmp_path / 'puzzles.bin'
+    path.write_bytes(BINARY_PUZZLE_HEADER + bytes([0xff] * BINARY_RECORD_SIZE))
+    with pytest.raises(ValueError):
+        read_puzzle_file(path)
+    path.write_bytes(BINARY_PUZZLE_HEADER + bytes(BINARY_RECORD_SIZE + 1))
+    with pytest.raises(ValueError):
+        read_puzzle_file(path)
+
+
+def test_write_rejects_bad_colour_codes(tmp_path: Path) -> None:
+    with pytest.raises(ValueError):
+        write_puzzle_file(tmp_path / 'puzzles.txt', np.full((1, 4, 6), 7, dtype=np.uint8))
+
+
+def test_stopping_early_releases_the_file(tmp_path: Path) -> None:
+    path: Path = tmp_path / 'puzzles.bin'
+    write_puzzle_file(path, mk_random_colour_codes(100), PuzzleFileFormat.BINARY)
+    batches: Iterator = iter_puzzle_batches(path, batch_size=10)
+    next(batches)
+    batches.close()
+
+
+@pytest.mark.parametrize("file_format", list(PuzzleFileFormat))
+def test_solve_puzzle_file(tmp_path: Path, file_format: PuzzleFileFormat) -> None:
+    colour_codes: np.ndarray = mk_random_colour_codes(500, seed=1) % 4
+    path: Path = tmp_path / 'puzzles'
+    write_puzzle_file(path, colour_codes, file_format)
+    expected: BatchSolution = solve_many(colour_codes)
+    solutions: list[BatchSolution] = list(solve_puzzle_file(path, batch_size=128))
+    assert len(solutions) == 4
+    assert np.array_equal(np.concatenate([solution.solution_counts for solution in solutions]),
+                          expected.solution_counts)
+    assert np.array_equal(np.concatenate([solution.first_solutions for solution in solutions]),
+                          expected.first_solutions)
@@ -0,0 +1,50 @@
+import random
+
+import pytest
+
+from instant_insanity.core.puzzle import PuzzleSpec, CARTEBLANCHE_PUZZLE_SPEC, WINNING_MOVES_PUZZLE_SPEC
+from instant_insanity.core.puzzle_symmetry import CanonicalForm, canonicalise, get_canonical_key, rotate_cube_spec
+
+from equivalent_puzzle_specs import mk_equivalent_puzzle_spec
+
+
+@pytest.mark.parametrize("seed", range(20))
+@pytest.mark.parametrize("puzzle_spec", [CARTEBLANCHE_PUZZLE_SPEC, WINNING_MOVES_PUZZLE_SPEC])
+def test_key_is_invariant(puzzle_spec: PuzzleSpec, seed: int) -> None:
+    equivalent: PuzzleSpec = mk_equivalent_puzzle_spec(puzzle_spec, random.Random(seed))
+    assert get_canonical_key(equivalent) == get_canonical_key(puzzle_spec)
+
+
+def test_key_distinguishes_puzzles() -> None:
+    assert get_canonical_key(CARTEBLANCHE_PUZZLE_SPEC) != get_canonical_key(WINNING_MOVES_PUZZLE_SPEC)
+
+
+def test_key_ignores_case() -> None:
+    lower: PuzzleSpec = [cube_spec.lower() for cube_spec in WINNING_MOVES_PUZZLE_SPEC]
+    assert get_canonical_key(lower) == get_canonical_key(WINNING_MOVES_PUZZLE_SPEC)
+
+
+@pytest.mark.parametrize("puzzle_spec", [CARTEBLANCHE_PUZZLE_SPEC, WINNING_MOVES_PUZZLE_SPEC])
+def test_canonical_form_is_idempotent(puzzle_spec: PuzzleSpec) -> None:
+    form: CanonicalForm = canonicalise(puzzle_spec)
+    assert canonicalise(form.puzzle_spec).key == form.key
+    assert ''.join(form.puzzle_spec) == form.key
+
+
+@pytest.mark.parametrize(
+    "puzzle_spec",
+    [CARTEBLANCHE_PUZZLE_SPEC, WINNING_MOVES_PUZZLE_SPEC, ['BGRWOY', 'GRWOYB', 'RWOYBG', 'WOYBGR']]
+)
+def test_canonical_form_records_its_changes(puzzle_spec: PuzzleSpec) -> None:
+    form: CanonicalForm = canonicalise(puzzle_spec)
+    table: dict[int, int] = str.maketrans(form.colour_map)
+    index: int
+    for index, canonical_cube_spec in enumerate(form.puzzle_spec):
+        original_cube_spec: str = puzzle_spec[form.cube_indices[index]].upper()
+        rotated: str = rotate_cube_spec(original_cube_spec, form.orientation_indices[index])
+        assert rotated.translate(table) == canonical_cube_spec
+
+
+def test_rejects_invalid_spec() -> None:
+    with pytest.raises(ValueError):
+        canonicalise(['BGRWBG', 'BGRWBG', 'BGRWBG'])
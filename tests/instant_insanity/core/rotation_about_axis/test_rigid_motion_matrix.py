@@ -0,0 +1,51 @@
+import numpy as np
+import pytest
+
+from instant_insanity.core.transformation import (
+    RigidMotion,
+    apply_homogeneous_matrix,
+    mk_rigid_motion_matrix,
+    mk_translation_matrix,
+    transform_vertex_path,
+)
+
+MOTIONS: list[tuple[np.ndarray, np.ndarray]] = [
+    (np.zeros(3), np.zeros(3)),
+    (np.array([0.0, 0.0, np.pi / 2.0]), np.zeros(3)),
+    (np.array([0.3, -0.2, 0.5]), np.array([0.1, 0.2, -0.3])),
+    (np.array([-1.0, 0.5, 2.0]), np.array([3.0, -1.0, 0.5])),
+]
+
+
+@pytest.mark.parametrize("rotation, translation", MOTIONS)
+def test_rigid_motion_matrix_matches_transform_vertex_path(rotation: np.ndarray, translation: np.ndarray) -> None:
+    points: np.ndarray = np.random.default_rng(0).uniform(-2.0, 2.0, size=(8, 3))
+    actual: np.ndarray = apply_homogeneous_matrix(mk_rigid_motion_matrix(rotation, translation), points)
+    assert np.allclose(actual, transform_vertex_path(rotation, translation, points))
+    assert np.allclose(RigidMotion(rotation, translation).mk_matrix(), mk_rigid_motion_matrix(rotation, translation))
+
+
+def test_apply_homogeneous_matrix_keeps_shape() -> None:
+    points: np.ndarray = np.random.default_rng(1).uniform(-2.0, 2.0, size=(6, 4, 3))
+    translation: np.ndarray = np.array([1.0, 2.0, 3.0])
+    actual: np.ndarray = apply_homogeneous_matrix(mk_translation_matrix(translation), points)
+    assert actual.shape == points.shape
+    assert np.allclose(actual, points + translation)
+
+
+@pytest.mark.parametrize("first", MOTIONS)
+@pytest.mark.parametrize("second", MOTIONS)
+def test_compose(first: tuple[np.ndarray, np.ndarray], second: tuple[np.ndarray, np.ndarray]) -> None:
+    motion_1: RigidMotion = RigidMotion(*first)
+    motion_2: RigidMotion = RigidMotion(*second)
+    composed: RigidMotion = motion_1.compose(motion_2)
+    assert np.allclose(composed.mk_matrix(), motion_2.mk_matrix() @ motion_1.mk_matrix())
+    points: np.ndarray = np.random.default_rng(2).uniform(-2.0, 2.0, size=(8, 3))
+    assert np.allclose(composed.transform_path(points), motion_2.transform_path(motion_1.transform_path(points)))
+
+
+def test_apply_homogeneous_matrix_rejects_bad_shapes() -> None:
+    with pytest.raises(ValueError):
+        apply_homogeneous_matrix(np.eye(3), np.zeros((2, 3)))
+    with pytest.raises(ValueError):
+        apply_homogeneous_matrix(np.eye(4), np.zeros((2, 2)))
@@ -0,0 +1,77 @@
+import numpy as np
+import pytest
+from sympy import Matrix, Rational
+
+from instant_insanity.core import projection as numeric_projection
+from instant_insanity.core.symbolic_projection import CompiledProjection, PERSPECTIVE_PARAMETERS, \
+    ORTHOGRAPHIC_PARAMETERS, compile_perspective_projection, compile_orthographic_projection, \
+    get_compiled_projection, mk_standard_orthographic_projection
+
+
+def mk_numeric_projections() -> list[numeric_projection.Projection]:
+    u: np.ndarray = np.array([1.0, 2.0, 5.0], dtype=np.float64)
+    return [
+        numeric_projection.mk_standard_orthographic_projection(),
+        numeric_projection.OrthographicProjection(u / np.linalg.norm(u), camera_z=0.5, scene_x=1.0, scene_z=-1.0,
+                                                  scene_per_model=2.0),
+        numeric_projection.PerspectiveProjection(np.array([2.0, 2.0, 6.0], dtype=np.float64), camera_z=2.0),
+        numeric_projection.PerspectiveProjection(np.array([-1.0, 3.0, 8.0], dtype=np.float64), camera_z=1.0,
+                                                 scene_y=-2.0, scene_z=0.5, scene_per_model=0.5),
+    ]
+
+
+NUMERIC_PROJECTIONS: list[numeric_projection.Projection] = mk_numeric_projections()
+
+
+def projection_id(projection: numeric_projection.Projection) -> str:
+    return type(projection).__name__
+
+
+@pytest.mark.parametrize("projection", NUMERIC_PROJECTIONS, ids=projection_id)
+def test_project_points_matches_numeric(projection: numeric_projection.Projection) -> None:
+    compiled: CompiledProjection
+    values: list[float]
+    compiled, values = get_compiled_projection(projection)
+    model_points: np.ndarray = np.random.default_rng(0).uniform(-1.0, 1.0, size=(5, 7, 3))
+    actual: np.ndarray = compiled.project_points(values, model_points)
+    assert actual.shape == model_points.shape
+    assert np.allclose(actual, projection.project_points(model_points))
+
+
+@pytest.mark.parametrize("projection", NUMERIC_PROJECTIONS, ids=projection_id)
+def test_polygons_t_matches_numeric(projection: numeric_projection.Projection) -> None:
+    compiled: CompiledProjection
+    values: list[float]
+    compiled, values = get_compiled_projection(projection)
+    rng: np.random.Generator = np.random.default_rng(1)
+    planes: np.ndarray = rng.uniform(-1.0, 1.0, size=(20, 2, 3))
+    # keep the planes well away from parallel to the rays
+    planes[:, 1, 2] += 3.0
+    xy: np.ndarray = rng.uniform(-1.0, 1.0, size=(20, 2))
+    assert np.allclose(compiled.polygons_t(values, planes, xy), projection.polygons_t(planes, xy))
+
+
+def test_compiled_projections_are_cached() -> None:
+    assert compile_perspective_projection() is compile_perspective_projection()
+    assert compile_perspective_projection().parameters == PERSPECTIVE_PARAMETERS
+    assert compile_orthographic_projection().parameters == ORTHOGRAPHIC_PARAMETERS
+
+
+def test_symbolic_standard_projection_matches_numeric() -> None:
+    model_point: Matrix = Matrix([Rational(1, 3), Rational(-1, 2), Rational(3, 4)])
+    expected: np.ndarray = numeric_projection.mk_standard_orthographic_projection().project_point(
+        np.array([1 / 3, -1 / 2, 3 / 4], dtype=np.float64))
+    actual: Matrix = mk_standard_orthographic_projection().project_point(model_point)
+    assert np.allclose(np.array(actual, dtype=np.float64).ravel(), expected)
+
+
+def test_kernels_reject_bad_arguments() -> None:
+    compiled: CompiledProjection
+    values: list[float]
+    compiled, values = get_compiled_projection(NUMERIC_PROJECTIONS[0])
+    with pytest.raises(ValueError):
+        compiled.project_points(values[:-1], np.zeros((2, 3)))
+    with pytest.raises(ValueError):
+        compiled.project_points(values, np.zeros((2, 2)))
+    with pytest.raises(ValueError):
+        compiled.polygons_t(values, np.zeros((2, 2, 3)), np.zeros((3, 2)))
@@ -1,6 +1,6 @@
 import pytest
 import numpy as np
-from instant_insanity.core.type_check import check_vector3_float64, check_matrix_nx3_float64
+from instant_insanity.core.type_check import check_vector3_float64, check_matrix_nx3_float64, check_point_array_float64
 
 # -------- Tests for check_vector3_float64 --------
 
@@ -33,4 +33,24 @@ def test_valid_matrix_nx3_float64():
 ])
 def test_invalid_matrix_nx3_float64(m):
     with pytest.raises((TypeError, ValueError)):
-        check_matrix_nx3_float64(m)
\ No newline at end of file
+        check_matrix_nx3_float64(m)
+
+# -------- Tests for check_point_array_float64 --------
+
+@pytest.mark.parametrize("a", [
+    np.zeros((2, 3), dtype=np.float64),
+    np.zeros((4, 2, 3), dtype=np.float64),
+])
+def test_valid_point_array_float64(a):
+    check_point_array_float64(a)  # Should not raise
+
+@pytest.mark.parametrize("a", [
+    [[1.0, 2.0, 3.0]],                              # not a numpy array
+    np.zeros((2, 3), dtype=np.float32),             # wrong dtype
+    np.zeros(3, dtype=np.float64),                  # wrong ndim
+    np.zeros((1, 2, 2, 3), dtype=np.float64),       # wrong ndim
+    np.zeros((4, 2, 2), dtype=np.float64),          # wrong shape
+])
+def test_invalid_point_array_float64(a):
+    with pytest.raises((TypeError, ValueError)):
+        check_point_array_float64(a)
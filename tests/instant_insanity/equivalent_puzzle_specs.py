@@ -0,0 +1,27 @@
+"""
+Equivalent puzzle specifications shared by the tests of the canonical form and the solution cache.
+"""
+import random
+
+from instant_insanity.core.puzzle import PuzzleSpec
+from instant_insanity.core.puzzle_symmetry import CANONICAL_COLOUR_SYMBOLS, SPEC_PERMUTATIONS, rotate_cube_spec
+
+
+def mk_equivalent_puzzle_spec(puzzle_spec: PuzzleSpec, rng: random.Random) -> PuzzleSpec:
+    """
+    Makes a random specification that is equivalent to a puzzle specification.
+
+    Args:
+        puzzle_spec: the puzzle specification.
+        rng: the random number generator.
+
+    Returns:
+        the specification with its colours renamed, its cubes rotated, and its cubes reordered at random.
+    """
+    symbols: str = ''.join(sorted(set(''.join(puzzle_spec).upper())))
+    renamed: str = ''.join(rng.sample(CANONICAL_COLOUR_SYMBOLS, len(symbols)))
+    table: dict[int, int] = str.maketrans(symbols, renamed)
+    cube_specs: PuzzleSpec = [rotate_cube_spec(cube_spec.upper(), rng.randrange(len(SPEC_PERMUTATIONS)))
+                              for cube_spec in puzzle_spec]
+    rng.shuffle(cube_specs)
+    return [cube_spec.translate(table) for cube_spec in cube_specs]
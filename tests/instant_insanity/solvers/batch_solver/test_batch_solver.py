@@ -0,0 +1,67 @@
+import numpy as np
+import pytest
+
+from instant_insanity.core.puzzle import Puzzle, PuzzleSpec, CARTEBLANCHE_PUZZLE_SPEC, WINNING_MOVES_PUZZLE_SPEC
+from instant_insanity.solvers.batch_solver import BatchSolution, encode_puzzle_specs, solve_many
+from instant_insanity.solvers.graph_solver import GraphSolver
+
+from random_puzzle_specs import RANDOM_PUZZLE_SPECS
+
+
+PUZZLE_SPECS: list[PuzzleSpec] = [CARTEBLANCHE_PUZZLE_SPEC, WINNING_MOVES_PUZZLE_SPEC] + RANDOM_PUZZLE_SPECS
+
+
+@pytest.mark.parametrize("block_size", [1, 7, 4096])
+def test_same_solutions_as_graph_solver(block_size: int) -> None:
+    batch_solution: BatchSolution = solve_many(PUZZLE_SPECS, block_size=block_size)
+    index: int
+    puzzle_spec: PuzzleSpec
+    for index, puzzle_spec in enumerate(PUZZLE_SPECS):
+        graph_solver: GraphSolver = GraphSolver(Puzzle(puzzle_spec))
+        graph_solver.solve()
+        assert batch_solution.solution_counts[index] == len(graph_solver.solutions)
+        expected_grid = graph_solver.solutions[0] if graph_solver.solutions else None
+        assert batch_solution.get_first_grid(index) == expected_grid
+
+
+def test_process_pool_gives_same_results() -> None:
+    in_process: BatchSolution = solve_many(PUZZLE_SPECS, block_size=10)
+    pooled: BatchSolution = solve_many(PUZZLE_SPECS, block_size=10, max_workers=2)
+    assert np.array_equal(pooled.solution_counts, in_process.solution_counts)
+    assert np.array_equal(pooled.first_solutions, in_process.first_solutions)
+
+
+def test_accepts_colour_codes() -> None:
+    colour_codes: np.ndarray = encode_puzzle_specs(PUZZLE_SPECS)
+    assert colour_codes.shape == (len(PUZZLE_SPECS), 4, 6)
+    assert colour_codes.dtype == np.uint8
+    assert np.array_equal(solve_many(colour_codes).solution_counts, solve_many(PUZZLE_SPECS).solution_counts)
+
+
+def test_accepts_lower_case() -> None:
+    lower: PuzzleSpec = [cube_spec.lower() for cube_spec in CARTEBLANCHE_PUZZLE_SPEC]
+    assert solve_many([lower]).solution_counts.tolist() == [2]
+
+
+@pytest.mark.parametrize("puzzle_spec", [
+    ['BGRBGR', 'BGRBGR', 'BGRBGR', 'BGRBGR'],
+    ['BGRWYB', 'GRWYBG', 'RWYBGR', 'WYBGRW'],
+])
+def test_wrong_number_of_colours_has_no_solutions(puzzle_spec: PuzzleSpec) -> None:
+    batch_solution: BatchSolution = solve_many([puzzle_spec])
+    assert batch_solution.solution_counts.tolist() == [0]
+    assert batch_solution.get_first_grid(0) is None
+
+
+@pytest.mark.parametrize("puzzle_spec", [
+    ['BGRWBG', 'BGRWBG', 'BGRWBG'],
+    ['BGRWBG', 'BGRWBG', 'BGRWBG', 'BGRWB'],
+    ['BGRWBG', 'BGRWBG', 'BGRWBG', 'BGRWBX'],
+])
+def test_rejects_invalid_specs(puzzle_spec: PuzzleSpec) -> None:
+    with pytest.raises(ValueError):
+        solve_many([puzzle_spec])
+
+
+def test_empty_batch() -> None:
+    assert len(solve_many([]).solution_counts) == 0
@@ -0,0 +1,16 @@
+import pytest
+
+from instant_insanity.solvers.benchmarks import BENCHMARK_ENGINES, BenchmarkResult, format_results, run_benchmark
+
+
+@pytest.mark.parametrize("n_cubes", [4, 6])
+def test_engines_agree(n_cubes: int) -> None:
+    results: list[BenchmarkResult] = run_benchmark(n_cubes, n_puzzles=10)
+    assert [result.engine_name for result in results] == list(BENCHMARK_ENGINES)
+    assert len({result.solution_count for result in results}) == 1
+    assert all(result.node_count > 0 for result in results)
+
+
+def test_format_results() -> None:
+    results: list[BenchmarkResult] = run_benchmark(4, n_puzzles=2)
+    assert len(format_results(results).splitlines()) == len(results) + 1
@@ -0,0 +1,32 @@
+import pytest
+
+from instant_insanity.core.puzzle import Puzzle, PuzzleSpec, CARTEBLANCHE_PUZZLE_SPEC, WINNING_MOVES_PUZZLE_SPEC
+from instant_insanity.solvers.bitmask_solver import BitmaskSolver, BitmaskEngine, pack_edge, pack_counters, \
+    unpack_spectrum
+from instant_insanity.solvers.graph_solver import GraphSolver
+
+from random_puzzle_specs import RANDOM_PUZZLE_SPECS
+
+
+@pytest.mark.parametrize(
+    "puzzle_spec",
+    [CARTEBLANCHE_PUZZLE_SPEC, WINNING_MOVES_PUZZLE_SPEC] + RANDOM_PUZZLE_SPECS
+)
+def test_same_solutions_as_graph_solver(puzzle_spec: PuzzleSpec) -> None:
+    puzzle: Puzzle = Puzzle(puzzle_spec)
+    graph_solver: GraphSolver = GraphSolver(puzzle)
+    graph_solver.solve()
+    bitmask_solver: BitmaskSolver = BitmaskSolver(puzzle)
+    bitmask_solver.solve()
+    assert bitmask_solver.solutions == graph_solver.solutions
+
+
+def test_pack_edge() -> None:
+    assert unpack_spectrum(pack_edge(0, 2), 4) == [1, 0, 1, 0]
+    assert unpack_spectrum(pack_edge(3, 3), 4) == [0, 0, 0, 2]
+    assert unpack_spectrum(pack_counters(4, 2), 4) == [2, 2, 2, 2]
+
+
+def test_engine_rejects_colour_mismatch() -> None:
+    with pytest.raises(ValueError):
+        BitmaskEngine([(pack_edge(0, 1), pack_edge(0, 1), pack_edge(0, 1))], 2)
@@ -0,0 +1,40 @@
+import pytest
+
+from instant_insanity.core.puzzle import Puzzle, PuzzleSpec, CARTEBLANCHE_PUZZLE_SPEC, WINNING_MOVES_PUZZLE_SPEC
+from instant_insanity.solvers.brute_force_solver import BruteForceSolver
+from instant_insanity.solvers.graph_solver import GraphSolver
+
+from random_puzzle_specs import RANDOM_PUZZLE_SPECS
+
+
+@pytest.mark.parametrize(
+    "puzzle_spec",
+    [CARTEBLANCHE_PUZZLE_SPEC, WINNING_MOVES_PUZZLE_SPEC] + RANDOM_PUZZLE_SPECS
+)
+def test_same_solutions_as_graph_solver(puzzle_spec: PuzzleSpec) -> None:
+    puzzle: Puzzle = Puzzle(puzzle_spec)
+    graph_solver: GraphSolver = GraphSolver(puzzle)
+    graph_solver.solve()
+    brute_force_solver: BruteForceSolver = BruteForceSolver(puzzle)
+    brute_force_solver.solve()
+    assert brute_force_solver.solutions == graph_solver.solutions
+
+
+@pytest.mark.parametrize(
+    "puzzle_spec",
+    [CARTEBLANCHE_PUZZLE_SPEC, WINNING_MOVES_PUZZLE_SPEC] + RANDOM_PUZZLE_SPECS[:5]
+)
+def test_reduced_check_covers_every_orbit(puzzle_spec: PuzzleSpec) -> None:
+    solver: BruteForceSolver = BruteForceSolver(Puzzle(puzzle_spec))
+    assert len(solver.find_orientations(reduced=False)) == 8 * len(solver.find_orientations())
+
+
+def test_winning_moves_orientation_count() -> None:
+    # the single solution can be shown in each of the 8 ways to turn the whole stack
+    solver: BruteForceSolver = BruteForceSolver(Puzzle(WINNING_MOVES_PUZZLE_SPEC))
+    assert len(solver.find_orientations(reduced=False)) == 8
+
+
+def test_rejects_wrong_number_of_colours() -> None:
+    with pytest.raises(ValueError):
+        BruteForceSolver(Puzzle(['BGRBGR', 'BGRBGR', 'BGRBGR', 'BGRBGR']))
@@ -0,0 +1,7 @@
+import sys
+from pathlib import Path
+
+# the test files of the solvers import the shared helpers in this directory
+SOLVERS_TESTS_DIR: str = str(Path(__file__).parent)
+if SOLVERS_TESTS_DIR not in sys.path:
+    sys.path.insert(0, SOLVERS_TESTS_DIR)
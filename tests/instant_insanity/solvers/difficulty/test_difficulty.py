@@ -0,0 +1,43 @@
+import math
+
+import pytest
+
+from instant_insanity.core.puzzle import Puzzle, PuzzleSpec, CARTEBLANCHE_PUZZLE_SPEC, WINNING_MOVES_PUZZLE_SPEC
+from instant_insanity.solvers.difficulty import difficulty, get_difficulty, mk_search_metrics, rate_puzzles
+from instant_insanity.solvers.graph_solver import Action, GraphSolver, SearchMetrics, Trace, TraceMode, \
+    mk_trace_sink, PRUNE_ACTIONS
+
+
+@pytest.mark.parametrize("puzzle_spec", [CARTEBLANCHE_PUZZLE_SPEC, WINNING_MOVES_PUZZLE_SPEC])
+def test_metrics_match_trace(puzzle_spec: PuzzleSpec) -> None:
+    solver: GraphSolver = GraphSolver(Puzzle(puzzle_spec))
+    solver.count_solutions()
+    trace: Trace = solver.trace
+    metrics: SearchMetrics = mk_search_metrics(Puzzle(puzzle_spec))
+    assert metrics.get_node_count() == sum(1 for _, action in trace if action == Action.TRYING)
+    assert metrics.solution_count == sum(1 for _, action in trace if action == Action.SOLVED)
+    for action in PRUNE_ACTIONS:
+        assert metrics.get_prune_count(action) == sum(1 for _, traced_action in trace if traced_action == action)
+
+
+def test_winning_moves_metrics() -> None:
+    metrics: SearchMetrics = mk_search_metrics(Puzzle(WINNING_MOVES_PUZZLE_SPEC))
+    assert metrics.node_counts == [2, 5, 8, 3, 4, 6, 2, 1]
+    assert metrics.prune_counts[Action.EXCEEDS_COLOUR_LIMITS] == [0, 1, 7, 21, 0, 2, 10, 3]
+    assert metrics.get_branching_factors()[:3] == [2.0, 2.5, 1.6]
+    assert get_difficulty(metrics) == 31.0
+
+
+def test_difficulty() -> None:
+    assert difficulty(Puzzle(CARTEBLANCHE_PUZZLE_SPEC)) == 21.5
+    assert difficulty(Puzzle(['BBBBBB', 'BBBBBB', 'GRWGRW', 'GRWGRW'])) == math.inf
+    assert rate_puzzles([WINNING_MOVES_PUZZLE_SPEC, CARTEBLANCHE_PUZZLE_SPEC]) == [31.0, 21.5]
+
+
+def test_difficulty_rejects_three_colours() -> None:
+    with pytest.raises(ValueError):
+        difficulty(Puzzle(['BBBBBB', 'GGGGGG', 'RRRRRR', 'RRRRRR']))
+
+
+def test_mk_trace_sink_metrics() -> None:
+    assert isinstance(mk_trace_sink(TraceMode.METRICS), SearchMetrics)
@@ -0,0 +1,58 @@
+from pathlib import Path
+
+import pytest
+
+from instant_insanity.core.puzzle import PuzzleSpec, CARTEBLANCHE_PUZZLE_SPEC, WINNING_MOVES_PUZZLE_SPEC
+from instant_insanity.core.puzzle_symmetry import get_canonical_key
+from instant_insanity.solvers.enumeration import EnumerationResults, Shard, enumerate_shard, \
+    get_canonical_cube_classes, get_cube_class_tables, load_results, mk_shards, run_enumeration
+from instant_insanity.solvers.solution_cache import SolutionCache
+
+from random_puzzle_specs import RANDOM_PUZZLE_SPECS
+
+
+# some shards that are small enough to classify in a test
+SMALL_SHARDS: list[Shard] = [(69, 69), (69, 84), (71, 73)]
+
+
+def test_there_are_240_cube_classes() -> None:
+    assert get_cube_class_tables().n_classes == 240
+
+
+@pytest.mark.parametrize(
+    "puzzle_spec",
+    [CARTEBLANCHE_PUZZLE_SPEC, WINNING_MOVES_PUZZLE_SPEC] + RANDOM_PUZZLE_SPECS[:20]
+)
+def test_canonical_puzzle_is_enumerated(puzzle_spec: PuzzleSpec) -> None:
+    cube_classes: tuple[int, int, int, int] = get_canonical_cube_classes(puzzle_spec)
+    shard: Shard = (cube_classes[0], cube_classes[1])
+    assert shard in mk_shards()
+    assert cube_classes in [tuple(row) for row in enumerate_shard(shard).tolist()]
+
+
+def test_shards_have_no_equivalent_puzzles() -> None:
+    shard: Shard
+    for shard in SMALL_SHARDS:
+        puzzle_specs: list[PuzzleSpec] = [[get_cube_class_tables().cube_specs[c] for c in row]
+                                          for row in enumerate_shard(shard).tolist()]
+        keys: set[str] = {get_canonical_key(puzzle_spec) for puzzle_spec in puzzle_specs}
+        assert len(keys) == len(puzzle_specs)
+
+
+def test_run_enumeration_resumes(tmp_path: Path) -> None:
+    assert run_enumeration(tmp_path, processes=1, shards=SMALL_SHARDS[:1]) == 1
+    assert run_enumeration(tmp_path, processes=1, shards=SMALL_SHARDS) == len(SMALL_SHARDS) - 1
+    assert run_enumeration(tmp_path, processes=1, shards=SMALL_SHARDS) == 0
+
+    results: EnumerationResults = load_results(tmp_path, SMALL_SHARDS)
+    assert results.cube_classes.shape == (27 + 10 + 21, 4)
+    cache: SolutionCache = SolutionCache()
+    index: int
+    for index in range(len(results.solution_counts)):
+        assert results.solution_counts[index] == cache.count_solutions(results.get_puzzle_spec(index))
+    assert sum(results.get_histogram().values()) == len(results.solution_counts)
+
+
+def test_load_results_rejects_missing_shard(tmp_path: Path) -> None:
+    with pytest.raises(ValueError):
+        load_results(tmp_path, SMALL_SHARDS)
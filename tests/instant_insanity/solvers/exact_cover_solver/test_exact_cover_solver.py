@@ -0,0 +1,47 @@
+import random
+
+import pytest
+
+from instant_insanity.core.general_puzzle import GeneralPuzzle, mk_random_general_puzzle_spec
+from instant_insanity.core.puzzle import Puzzle, PuzzleSpec, CARTEBLANCHE_PUZZLE_SPEC, WINNING_MOVES_PUZZLE_SPEC
+from instant_insanity.solvers.exact_cover_solver import ExactCoverEngine, ExactCoverSolver
+from instant_insanity.solvers.general_solver import GeneralGraphSolver
+from instant_insanity.solvers.graph_solver import GraphSolver
+
+from random_puzzle_specs import RANDOM_PUZZLE_SPECS
+
+
+@pytest.mark.parametrize(
+    "puzzle_spec",
+    [CARTEBLANCHE_PUZZLE_SPEC, WINNING_MOVES_PUZZLE_SPEC] + RANDOM_PUZZLE_SPECS
+)
+def test_same_solutions_as_graph_solver(puzzle_spec: PuzzleSpec) -> None:
+    puzzle: Puzzle = Puzzle(puzzle_spec)
+    graph_solver: GraphSolver = GraphSolver(puzzle)
+    graph_solver.solve()
+    exact_cover_solver: ExactCoverSolver = ExactCoverSolver(puzzle)
+    exact_cover_solver.solve()
+    assert exact_cover_solver.solutions == graph_solver.solutions
+
+
+@pytest.mark.parametrize("n_cubes", [3, 5, 6, 8])
+@pytest.mark.parametrize("seed", range(10))
+def test_same_solutions_as_general_solver(n_cubes: int, seed: int) -> None:
+    puzzle: GeneralPuzzle = GeneralPuzzle(mk_random_general_puzzle_spec(n_cubes, random.Random(seed), 'ABCDEFGH'))
+    expected: list[tuple[int, ...]] = list(GeneralGraphSolver(puzzle).engine.iter_solutions())
+    engine: ExactCoverEngine = ExactCoverEngine(puzzle)
+    solutions: list[tuple[int, ...]] = list(engine.iter_solutions())
+    assert len(solutions) == len(set(solutions))
+    assert sorted(solutions) == expected
+
+
+def test_search_restores_state() -> None:
+    engine: ExactCoverEngine = ExactCoverEngine(GeneralPuzzle(CARTEBLANCHE_PUZZLE_SPEC))
+    assert len(list(engine.iter_solutions())) == 2
+    assert all(engine.is_active)
+    assert engine.demands == [1] * 8 + [2] * 8
+
+
+def test_rejects_colour_mismatch() -> None:
+    with pytest.raises(ValueError):
+        ExactCoverEngine(GeneralPuzzle(['AAAAAA', 'BBBBBB', 'AAAAAA']))
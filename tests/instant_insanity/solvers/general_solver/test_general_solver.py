@@ -0,0 +1,56 @@
+import random
+
+import pytest
+
+from instant_insanity.core.general_puzzle import GeneralPuzzle, mk_random_general_puzzle_spec
+from instant_insanity.core.puzzle import Puzzle, PuzzleSpec, AxisLabel, CARTEBLANCHE_PUZZLE_SPEC, \
+    WINNING_MOVES_PUZZLE_SPEC
+from instant_insanity.solvers.general_solver import GeneralGraphSolver, GeneralGrid
+from instant_insanity.solvers.graph_solver import GraphSolver, GRID_ROWS
+
+
+@pytest.mark.parametrize("puzzle_spec", [CARTEBLANCHE_PUZZLE_SPEC, WINNING_MOVES_PUZZLE_SPEC])
+def test_same_solutions_as_graph_solver(puzzle_spec: PuzzleSpec) -> None:
+    puzzle: Puzzle = Puzzle(puzzle_spec)
+    graph_solver: GraphSolver = GraphSolver(puzzle)
+    graph_solver.solve()
+    general_solver: GeneralGraphSolver = GeneralGraphSolver(GeneralPuzzle.from_puzzle(puzzle))
+    general_solver.solve()
+    assert general_solver.solutions == graph_solver.solutions
+
+
+def test_single_cube() -> None:
+    # one cube with one colour has every pair of distinct axes as a solution
+    solver: GeneralGraphSolver = GeneralGraphSolver(GeneralPuzzle(['AAAAAA']))
+    solver.solve()
+    front, top = GRID_ROWS
+    assert [(grid[(front, 1)], grid[(top, 1)]) for grid in solver.solutions] == [
+        (AxisLabel.X, AxisLabel.Y),
+        (AxisLabel.X, AxisLabel.Z),
+        (AxisLabel.Y, AxisLabel.Z),
+    ]
+
+
+@pytest.mark.parametrize("n_cubes", [5, 6, 7])
+def test_solutions_are_two_factors(n_cubes: int) -> None:
+    rng: random.Random = random.Random(n_cubes)
+    for _ in range(10):
+        puzzle: GeneralPuzzle = GeneralPuzzle(mk_random_general_puzzle_spec(n_cubes, rng))
+        solver: GeneralGraphSolver = GeneralGraphSolver(puzzle)
+        solver.solve()
+        assert solver.count_solutions() == len(solver.solutions)
+        grid: GeneralGrid
+        for grid in solver.solutions:
+            for row in GRID_ROWS:
+                degrees: list[int] = [0] * n_cubes
+                for cube_number in range(1, n_cubes + 1):
+                    for colour in puzzle.get_axis_colour_pair(cube_number - 1, grid[(row, cube_number)]):
+                        degrees[colour] += 1
+                assert degrees == [2] * n_cubes
+            for cube_number in range(1, n_cubes + 1):
+                assert grid[(GRID_ROWS[0], cube_number)] != grid[(GRID_ROWS[1], cube_number)]
+
+
+def test_colour_mismatch() -> None:
+    with pytest.raises(ValueError):
+        GeneralGraphSolver(GeneralPuzzle(['ABCDEF', 'ABCDEF']))
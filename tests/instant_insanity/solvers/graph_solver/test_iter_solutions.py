@@ -0,0 +1,41 @@
+import pytest
+
+from instant_insanity.core.puzzle import Puzzle, PuzzleSpec, CARTEBLANCHE_PUZZLE_SPEC, WINNING_MOVES_PUZZLE_SPEC
+from instant_insanity.solvers.graph_solver import GraphSolver, Grid
+
+
+@pytest.mark.parametrize("puzzle_spec", [CARTEBLANCHE_PUZZLE_SPEC, WINNING_MOVES_PUZZLE_SPEC])
+def test_iter_solutions_matches_solve(puzzle_spec: PuzzleSpec, capsys) -> None:
+    puzzle: Puzzle = Puzzle(puzzle_spec)
+    iterated: list[Grid] = list(GraphSolver(puzzle).iter_solutions())
+    assert capsys.readouterr().out == ''
+
+    solver: GraphSolver = GraphSolver(puzzle)
+    solver.solve()
+    assert iterated == solver.solutions
+
+
+def test_iter_solutions_limit(capsys) -> None:
+    solver: GraphSolver = GraphSolver(Puzzle(CARTEBLANCHE_PUZZLE_SPEC))
+    all_solutions: list[Grid] = list(solver.iter_solutions())
+    assert len(all_solutions) == 2
+
+    first: list[Grid] = list(solver.iter_solutions(limit=1))
+    assert first == all_solutions[:1]
+    assert list(solver.iter_solutions(limit=0)) == []
+    assert solver.solutions == []
+    assert capsys.readouterr().out == ''
+
+
+def test_iter_solutions_early_stop_empties_grid() -> None:
+    solver: GraphSolver = GraphSolver(Puzzle(CARTEBLANCHE_PUZZLE_SPEC))
+    solutions = solver.iter_solutions()
+    first: Grid = next(solutions)
+    assert all(value is not None for value in first.values())
+    solutions.close()
+    assert all(value is None for value in solver.grid.values())
+
+    # abandoning the iterator part way through must leave the solver reusable
+    assert next(solver.iter_solutions()) == first
+    solver.iter_solutions().close()
+    assert list(solver.iter_solutions()) == list(GraphSolver(Puzzle(CARTEBLANCHE_PUZZLE_SPEC)).iter_solutions())
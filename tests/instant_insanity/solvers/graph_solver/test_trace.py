@@ -0,0 +1,89 @@
+import pytest
+
+from instant_insanity.core.puzzle import Puzzle, CARTEBLANCHE_PUZZLE_SPEC, WINNING_MOVES_PUZZLE_SPEC
+from instant_insanity.solvers.graph_solver import GraphSolver, Action, Trace, TraceMode, TraceSink, \
+    CounterTraceSink, RingTraceSink, FullTraceSink, NullTraceSink, mk_trace_sink, encode_trace, decode_trace, \
+    BINARY_TRACE_HEADER
+
+
+def mk_full_trace() -> Trace:
+    solver: GraphSolver = GraphSolver(Puzzle(CARTEBLANCHE_PUZZLE_SPEC))
+    list(solver.iter_solutions())
+    return solver.trace
+
+
+def test_default_trace_is_full() -> None:
+    trace: Trace = mk_full_trace()
+    assert len(trace) > 0
+    sink: FullTraceSink = FullTraceSink()
+    solver: GraphSolver = GraphSolver(Puzzle(CARTEBLANCHE_PUZZLE_SPEC), sink)
+    list(solver.iter_solutions())
+    assert sink.records == trace
+
+
+def test_each_choice_is_tried_once() -> None:
+    trace: Trace = mk_full_trace()
+    # every TRYING record is followed by a deeper choice, a solution, or its own backtrack
+    # but never by the same choice being tried again
+    for (choice_1, action_1), (choice_2, action_2) in zip(trace, trace[1:]):
+        assert not (action_1 == action_2 == Action.TRYING and choice_1 == choice_2)
+    tried: int = sum(1 for _, action in trace if action == Action.TRYING)
+    backtracked: int = sum(1 for _, action in trace if action == Action.BACKTRACKING)
+    assert tried == backtracked
+
+
+def test_null_trace_sink() -> None:
+    solver: GraphSolver = GraphSolver(Puzzle(CARTEBLANCHE_PUZZLE_SPEC), NullTraceSink())
+    assert len(list(solver.iter_solutions())) == 2
+    assert solver.trace == []
+
+
+def test_counter_trace_sink() -> None:
+    trace: Trace = mk_full_trace()
+    sink: CounterTraceSink = CounterTraceSink()
+    list(GraphSolver(Puzzle(CARTEBLANCHE_PUZZLE_SPEC), sink).iter_solutions())
+    for action in Action:
+        assert sink.action_counts[action] == sum(1 for _, traced_action in trace if traced_action == action)
+
+
+@pytest.mark.parametrize("capacity", [1, 10, 100000])
+def test_ring_trace_sink(capacity: int) -> None:
+    trace: Trace = mk_full_trace()
+    sink: RingTraceSink = RingTraceSink(capacity)
+    solver: GraphSolver = GraphSolver(Puzzle(CARTEBLANCHE_PUZZLE_SPEC), sink)
+    list(solver.iter_solutions())
+    assert solver.trace == trace[-capacity:]
+
+
+def test_ring_trace_sink_rejects_bad_capacity() -> None:
+    with pytest.raises(ValueError):
+        RingTraceSink(0)
+
+
+@pytest.mark.parametrize(
+    "mode, sink_type",
+    [
+        (TraceMode.OFF, NullTraceSink),
+        (TraceMode.COUNTERS, CounterTraceSink),
+        (TraceMode.RING, RingTraceSink),
+        (TraceMode.FULL, FullTraceSink),
+    ]
+)
+def test_mk_trace_sink(mode: TraceMode, sink_type: type[TraceSink]) -> None:
+    assert isinstance(mk_trace_sink(mode), sink_type)
+
+
+@pytest.mark.parametrize("puzzle_spec", [CARTEBLANCHE_PUZZLE_SPEC, WINNING_MOVES_PUZZLE_SPEC])
+def test_binary_trace_round_trip(puzzle_spec) -> None:
+    solver: GraphSolver = GraphSolver(Puzzle(puzzle_spec))
+    solver.solve()
+    data: bytes = encode_trace(solver.trace)
+    assert len(data) == len(BINARY_TRACE_HEADER) + len(solver.trace)
+    assert decode_trace(data) == solver.trace
+
+
+def test_decode_trace_rejects_bad_data() -> None:
+    with pytest.raises(ValueError):
+        decode_trace(b'nope')
+    with pytest.raises(ValueError):
+        decode_trace(BINARY_TRACE_HEADER + bytes([0b00011000]))
@@ -0,0 +1,75 @@
+import random
+
+import pytest
+
+from instant_insanity.core.general_puzzle import GeneralPuzzle, mk_random_general_puzzle_spec
+from instant_insanity.core.puzzle import Puzzle, PuzzleSpec, CARTEBLANCHE_PUZZLE_SPEC, WINNING_MOVES_PUZZLE_SPEC
+from instant_insanity.solvers.general_solver import GeneralGraphSolver
+from instant_insanity.solvers.graph_solver import GraphSolver
+from instant_insanity.solvers.iterative_solver import IterativeEngine, IterativeSolver, SearchState, \
+    mk_iterative_engine
+
+
+@pytest.mark.parametrize("puzzle_spec", [CARTEBLANCHE_PUZZLE_SPEC, WINNING_MOVES_PUZZLE_SPEC])
+def test_same_solutions_as_graph_solver(puzzle_spec: PuzzleSpec) -> None:
+    puzzle: Puzzle = Puzzle(puzzle_spec)
+    graph_solver: GraphSolver = GraphSolver(puzzle)
+    graph_solver.solve()
+    iterative_solver: IterativeSolver = IterativeSolver(puzzle)
+    assert iterative_solver.solve()
+    assert iterative_solver.solutions == graph_solver.solutions
+
+
+@pytest.mark.parametrize("n_cubes", [3, 5, 8])
+@pytest.mark.parametrize("seed", range(10))
+def test_same_search_as_general_solver(n_cubes: int, seed: int) -> None:
+    puzzle: GeneralPuzzle = GeneralPuzzle(mk_random_general_puzzle_spec(n_cubes, random.Random(seed), 'ABCDEFGH'))
+    general_solver: GeneralGraphSolver = GeneralGraphSolver(puzzle)
+    expected: list[tuple[int, ...]] = list(general_solver.engine.iter_solutions())
+    engine: IterativeEngine = mk_iterative_engine(puzzle)
+    assert list(engine.iter_solutions()) == expected
+    assert engine.node_count == general_solver.engine.node_count
+    assert engine.finished
+
+
+@pytest.mark.parametrize("node_limit", [1, 7, 50])
+def test_pause_and_resume(node_limit: int) -> None:
+    puzzle: GeneralPuzzle = GeneralPuzzle(mk_random_general_puzzle_spec(6, random.Random(2)))
+    expected: list[tuple[int, ...]] = list(mk_iterative_engine(puzzle).iter_solutions())
+    assert len(expected) == 2
+
+    solutions: list[tuple[int, ...]] = []
+    state: SearchState = mk_iterative_engine(puzzle).get_state()
+    while not state.finished:
+        # resume each slice of the search in a fresh engine from the serialised state
+        engine: IterativeEngine = mk_iterative_engine(puzzle)
+        engine.set_state(SearchState.from_json(state.to_json()))
+        solutions.extend(engine.iter_solutions(node_limit))
+        assert engine.node_count - state.node_count <= node_limit
+        state = engine.get_state()
+    assert solutions == expected
+
+
+def test_closing_the_iterator_pauses_the_search() -> None:
+    engine: IterativeEngine = mk_iterative_engine(GeneralPuzzle(CARTEBLANCHE_PUZZLE_SPEC))
+    first: tuple[int, ...] = next(engine.iter_solutions())
+    rest: list[tuple[int, ...]] = list(engine.iter_solutions())
+    assert [first] + rest == list(mk_iterative_engine(GeneralPuzzle(CARTEBLANCHE_PUZZLE_SPEC)).iter_solutions())
+
+
+def test_large_puzzle_node_limit() -> None:
+    puzzle: GeneralPuzzle = GeneralPuzzle(mk_random_general_puzzle_spec(26, random.Random(0)))
+    engine: IterativeEngine = mk_iterative_engine(puzzle)
+    list(engine.iter_solutions(node_limit=5000))
+    assert engine.node_count == 5000
+    assert not engine.finished
+
+
+def test_set_state_rejects_bad_states() -> None:
+    engine: IterativeEngine = mk_iterative_engine(GeneralPuzzle(CARTEBLANCHE_PUZZLE_SPEC))
+    with pytest.raises(ValueError):
+        engine.set_state(SearchState(n_cubes=5))
+    with pytest.raises(ValueError):
+        engine.set_state(SearchState(n_cubes=4, axes=[2]))
+    with pytest.raises(ValueError):
+        SearchState.from_json('{"axes": []}')
@@ -0,0 +1,72 @@
+import random
+
+import pytest
+
+from instant_insanity.core.general_puzzle import GeneralPuzzle, mk_random_general_puzzle_spec
+from instant_insanity.core.puzzle import Puzzle, PuzzleSpec, CARTEBLANCHE_PUZZLE_SPEC, WINNING_MOVES_PUZZLE_SPEC
+from instant_insanity.solvers.general_solver import GeneralGraphSolver
+from instant_insanity.solvers.graph_solver import GraphSolver
+from instant_insanity.solvers.ordered_solver import CellOrder, IndexValueOrder, LeastConstrainingValueOrder, \
+    MostConstrainedCellOrder, OrderedEngine, OrderedSolver, RowMajorCellOrder, ValueOrder, mk_ordered_engine
+
+CELL_ORDERS: list[type[CellOrder]] = [RowMajorCellOrder, MostConstrainedCellOrder]
+VALUE_ORDERS: list[type[ValueOrder]] = [IndexValueOrder, LeastConstrainingValueOrder]
+
+
+@pytest.mark.parametrize("cell_order", CELL_ORDERS)
+@pytest.mark.parametrize("value_order", VALUE_ORDERS)
+@pytest.mark.parametrize("puzzle_spec", [CARTEBLANCHE_PUZZLE_SPEC, WINNING_MOVES_PUZZLE_SPEC])
+def test_same_solutions_as_graph_solver(cell_order: type[CellOrder], value_order: type[ValueOrder],
+                                        puzzle_spec: PuzzleSpec) -> None:
+    puzzle: Puzzle = Puzzle(puzzle_spec)
+    graph_solver: GraphSolver = GraphSolver(puzzle)
+    graph_solver.solve()
+    ordered_solver: OrderedSolver = OrderedSolver(puzzle, cell_order(), value_order())
+    ordered_solver.solve()
+    assert ordered_solver.solutions == graph_solver.solutions
+
+
+@pytest.mark.parametrize("cell_order", CELL_ORDERS)
+@pytest.mark.parametrize("value_order", VALUE_ORDERS)
+@pytest.mark.parametrize("n_cubes", [3, 4, 6])
+@pytest.mark.parametrize("seed", range(10))
+def test_same_solutions_as_general_solver(cell_order: type[CellOrder], value_order: type[ValueOrder],
+                                          n_cubes: int, seed: int) -> None:
+    puzzle: GeneralPuzzle = GeneralPuzzle(mk_random_general_puzzle_spec(n_cubes, random.Random(seed), 'ABCDEF'))
+    expected: list[tuple[int, ...]] = list(GeneralGraphSolver(puzzle).engine.iter_solutions())
+    solutions: list[tuple[int, ...]] = list(mk_ordered_engine(puzzle, cell_order(), value_order()).iter_solutions())
+    assert len(solutions) == len(set(solutions))
+    assert sorted(solutions) == expected
+
+
+@pytest.mark.parametrize("n_cubes", [4, 8])
+def test_node_counts(n_cubes: int) -> None:
+    rng: random.Random = random.Random(0)
+    puzzles: list[GeneralPuzzle] = [GeneralPuzzle(mk_random_general_puzzle_spec(n_cubes, rng)) for _ in range(20)]
+    row_major_nodes: int = 0
+    most_constrained_nodes: int = 0
+    puzzle: GeneralPuzzle
+    for puzzle in puzzles:
+        general_solver: GeneralGraphSolver = GeneralGraphSolver(puzzle)
+        general_solver.count_solutions()
+        row_major: OrderedEngine = mk_ordered_engine(puzzle, RowMajorCellOrder(), IndexValueOrder())
+        list(row_major.iter_solutions())
+        # the fixed order searches exactly the same tree as BitmaskEngine
+        assert row_major.node_count == general_solver.engine.node_count
+        most_constrained: OrderedEngine = mk_ordered_engine(puzzle)
+        list(most_constrained.iter_solutions())
+        row_major_nodes += row_major.node_count
+        most_constrained_nodes += most_constrained.node_count
+    assert most_constrained_nodes < row_major_nodes
+
+
+def test_search_restores_state() -> None:
+    engine: OrderedEngine = mk_ordered_engine(GeneralPuzzle(CARTEBLANCHE_PUZZLE_SPEC))
+    assert len(list(engine.iter_solutions())) == 2
+    assert engine.axes == [None] * 8
+    assert engine.spectra == [0, 0]
+
+
+def test_rejects_colour_mismatch() -> None:
+    with pytest.raises(ValueError):
+        mk_ordered_engine(GeneralPuzzle(['AAAAAA', 'BBBBBB', 'AAAAAA']))
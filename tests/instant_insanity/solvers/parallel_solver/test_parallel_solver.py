@@ -0,0 +1,44 @@
+import random
+
+import pytest
+
+from instant_insanity.core.general_puzzle import GeneralPuzzle, mk_random_general_puzzle_spec
+from instant_insanity.core.puzzle import CARTEBLANCHE_PUZZLE_SPEC
+from instant_insanity.solvers.iterative_solver import IterativeEngine, mk_iterative_engine
+from instant_insanity.solvers.parallel_solver import ParallelEngine, mk_parallel_engine, mk_prefixes
+
+
+@pytest.mark.parametrize("split_depth", [1, 3, 6, 12, 100])
+@pytest.mark.parametrize("n_cubes, seed", [(4, 0), (4, 3), (6, 2), (8, 0)])
+def test_same_search_as_iterative_engine(split_depth: int, n_cubes: int, seed: int) -> None:
+    puzzle: GeneralPuzzle = GeneralPuzzle(mk_random_general_puzzle_spec(n_cubes, random.Random(seed)))
+    iterative_engine: IterativeEngine = mk_iterative_engine(puzzle)
+    expected: list[tuple[int, ...]] = list(iterative_engine.iter_solutions())
+    parallel_engine: ParallelEngine = mk_parallel_engine(puzzle, split_depth)
+    assert list(parallel_engine.iter_solutions()) == expected
+    assert parallel_engine.node_count == iterative_engine.node_count
+
+
+def test_worker_processes() -> None:
+    puzzle: GeneralPuzzle = GeneralPuzzle(mk_random_general_puzzle_spec(6, random.Random(2)))
+    expected: list[tuple[int, ...]] = list(mk_iterative_engine(puzzle).iter_solutions())
+    parallel_engine: ParallelEngine = mk_parallel_engine(puzzle, split_depth=4, max_workers=2)
+    assert list(parallel_engine.iter_solutions()) == expected
+    assert parallel_engine.prefix_count > 2
+
+
+def test_prefixes_are_in_search_order() -> None:
+    engine: IterativeEngine = mk_iterative_engine(GeneralPuzzle(CARTEBLANCHE_PUZZLE_SPEC))
+    prefixes: list[list[int]]
+    prefixes, _ = mk_prefixes(engine, 3)
+    assert prefixes == sorted(prefixes)
+    assert all(len(prefix) == 3 for prefix in prefixes)
+    assert all(prefix[0] != 2 for prefix in prefixes)
+    assert engine.axes == []
+
+
+def test_rejects_bad_arguments() -> None:
+    with pytest.raises(ValueError):
+        mk_parallel_engine(GeneralPuzzle(CARTEBLANCHE_PUZZLE_SPEC), split_depth=0)
+    with pytest.raises(ValueError):
+        mk_parallel_engine(GeneralPuzzle(['AAAAAA', 'BBBBBB', 'AAAAAA']))
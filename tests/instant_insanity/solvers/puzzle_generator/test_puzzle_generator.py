@@ -0,0 +1,65 @@
+import io
+import json
+
+import pytest
+
+from instant_insanity.core.puzzle import Puzzle
+from instant_insanity.core.puzzle_symmetry import get_canonical_key
+from instant_insanity.solvers.graph_solver import GraphSolver, Grid, GRID_ROWS, GRID_COLUMNS
+from instant_insanity.solvers.puzzle_generator import GeneratedPuzzle, GeneratorTask, KeyedPuzzle, generate_puzzles, \
+    run_generator_task, write_puzzles
+
+
+def test_puzzles_have_one_solution() -> None:
+    puzzle: GeneratedPuzzle
+    for puzzle in generate_puzzles(10, seed=1, batch_size=256):
+        graph_solver: GraphSolver = GraphSolver(Puzzle(puzzle.puzzle_spec))
+        graph_solver.solve()
+        assert len(graph_solver.solutions) == 1
+        grid: Grid = graph_solver.solutions[0]
+        assert puzzle.solution == [''.join(grid[(row, column)].value for column in GRID_COLUMNS) for row in GRID_ROWS]
+
+
+def test_puzzles_are_reproducible() -> None:
+    first: list[GeneratedPuzzle] = list(generate_puzzles(10, seed=2, batch_size=256))
+    second: list[GeneratedPuzzle] = list(generate_puzzles(10, seed=2, batch_size=256))
+    pooled: list[GeneratedPuzzle] = list(generate_puzzles(10, seed=2, batch_size=256, processes=2))
+    assert first == second == pooled
+    assert first != list(generate_puzzles(10, seed=3, batch_size=256))
+
+
+def test_puzzles_are_distinct() -> None:
+    puzzles: list[GeneratedPuzzle] = list(generate_puzzles(50, seed=4, batch_size=64))
+    assert len({get_canonical_key(puzzle.puzzle_spec) for puzzle in puzzles}) == 50
+
+
+@pytest.mark.parametrize("distinct", [False, True])
+def test_task_computes_canonical_keys(distinct: bool) -> None:
+    accepted: list[KeyedPuzzle] = run_generator_task(GeneratorTask(6, 0, 256, 'BGRW', distinct))
+    assert len(accepted) > 0
+    puzzle: GeneratedPuzzle
+    key: str | None
+    for puzzle, key in accepted:
+        assert key == (get_canonical_key(puzzle.puzzle_spec) if distinct else None)
+
+
+def test_write_puzzles() -> None:
+    file: io.StringIO = io.StringIO()
+    assert write_puzzles(generate_puzzles(3, seed=5, batch_size=256), file) == 3
+    lines: list[str] = file.getvalue().splitlines()
+    assert len(lines) == 3
+    record: dict = json.loads(lines[0])
+    assert len(record['puzzle_spec']) == 4
+    assert set(record['solution']) == {'front', 'top'}
+
+
+@pytest.mark.parametrize("colours", ['BGR', 'BGRR', 'BGRX'])
+def test_rejects_invalid_colours(colours: str) -> None:
+    # the arguments are checked when generate_puzzles is called, before any puzzle is requested
+    with pytest.raises(ValueError):
+        generate_puzzles(1, colours=colours)
+
+
+def test_rejects_non_positive_batch_size() -> None:
+    with pytest.raises(ValueError):
+        generate_puzzles(1, batch_size=0)
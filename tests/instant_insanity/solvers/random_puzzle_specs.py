@@ -0,0 +1,26 @@
+"""
+Random puzzle specifications shared by the tests that cross-check the solvers against GraphSolver.
+"""
+import random
+
+from instant_insanity.core.puzzle import PuzzleSpec
+
+
+def mk_random_puzzle_spec(rng: random.Random) -> PuzzleSpec:
+    """
+    Makes a random specification of a puzzle that uses exactly four colours.
+
+    Args:
+        rng: the random number generator.
+
+    Returns:
+        the puzzle specification.
+    """
+    while True:
+        puzzle_spec: PuzzleSpec = [''.join(rng.choice('BGRW') for _ in range(6)) for _ in range(4)]
+        if len(set(''.join(puzzle_spec))) == 4:
+            return puzzle_spec
+
+
+# the random puzzle specifications, one per seed
+RANDOM_PUZZLE_SPECS: list[PuzzleSpec] = [mk_random_puzzle_spec(random.Random(seed)) for seed in range(40)]
@@ -0,0 +1,94 @@
+import random
+import timeit
+from pathlib import Path
+
+import pytest
+
+from instant_insanity.core.puzzle import Puzzle, PuzzleSpec, CARTEBLANCHE_PUZZLE_SPEC, WINNING_MOVES_PUZZLE_SPEC
+from instant_insanity.solvers.bitmask_solver import BitmaskSolver
+from instant_insanity.solvers.graph_solver import GraphSolver
+from instant_insanity.solvers.solution_cache import SolutionCache
+
+from equivalent_puzzle_specs import mk_equivalent_puzzle_spec
+from random_puzzle_specs import RANDOM_PUZZLE_SPECS
+
+
+def solve_with_graph_solver(puzzle_spec: PuzzleSpec) -> GraphSolver:
+    solver: GraphSolver = GraphSolver(Puzzle(puzzle_spec))
+    solver.solve()
+    return solver
+
+
+@pytest.mark.parametrize(
+    "puzzle_spec",
+    [CARTEBLANCHE_PUZZLE_SPEC, WINNING_MOVES_PUZZLE_SPEC] + RANDOM_PUZZLE_SPECS[:20]
+)
+def test_same_solutions_as_graph_solver(puzzle_spec: PuzzleSpec) -> None:
+    cache: SolutionCache = SolutionCache()
+    rng: random.Random = random.Random(0)
+    spec: PuzzleSpec
+    for spec in [puzzle_spec] + [mk_equivalent_puzzle_spec(puzzle_spec, rng) for _ in range(5)]:
+        assert cache.get_solutions(spec) == solve_with_graph_solver(spec).solutions
+    assert cache.misses == 1
+    assert cache.hits == 5
+
+
+def test_fewer_colours_have_no_solutions() -> None:
+    cache: SolutionCache = SolutionCache()
+    assert cache.get_solutions(['BGRBGR', 'BGRBGR', 'BGRBGR', 'BGRBGR']) == []
+
+
+def test_more_colours_are_not_canonicalised() -> None:
+    cache: SolutionCache = SolutionCache()
+    assert cache.count_solutions(['BGRWOY', 'BGRWOY', 'BGRWOY', 'BGRWOY']) == 0
+    assert cache.forms[('BGRWOY', 'BGRWOY', 'BGRWOY', 'BGRWOY')] is None
+    assert cache.misses == 0
+
+
+def test_rejects_invalid_spec() -> None:
+    cache: SolutionCache = SolutionCache()
+    with pytest.raises(ValueError):
+        cache.count_solutions(['BGRWBG', 'BGRWBG', 'BGRWBG'])
+
+
+def solve_with_bitmask_solver(puzzle_spec: PuzzleSpec) -> BitmaskSolver:
+    solver: BitmaskSolver = BitmaskSolver(Puzzle(puzzle_spec))
+    solver.solve()
+    return solver
+
+
+def test_hit_is_cheaper_than_solve() -> None:
+    cache: SolutionCache = SolutionCache()
+    cache.get_solutions(WINNING_MOVES_PUZZLE_SPEC)
+    hit_time: float = min(timeit.repeat(lambda: cache.get_solutions(WINNING_MOVES_PUZZLE_SPEC),
+                                        number=100, repeat=5))
+    solve_time: float = min(timeit.repeat(lambda: solve_with_bitmask_solver(WINNING_MOVES_PUZZLE_SPEC),
+                                          number=100, repeat=5))
+    assert hit_time < solve_time
+
+
+def test_least_recently_used_is_evicted() -> None:
+    cache: SolutionCache = SolutionCache(capacity=1)
+    cache.count_solutions(CARTEBLANCHE_PUZZLE_SPEC)
+    cache.count_solutions(WINNING_MOVES_PUZZLE_SPEC)
+    cache.count_solutions(CARTEBLANCHE_PUZZLE_SPEC)
+    assert len(cache.forms) == 1
+    assert len(cache.entries) == 1
+    assert cache.misses == 3
+
+
+def test_database_persists(tmp_path: Path) -> None:
+    db_path: str = str(tmp_path / 'solutions.sqlite')
+    with SolutionCache(db_path=db_path) as cache:
+        assert cache.count_solutions(CARTEBLANCHE_PUZZLE_SPEC) == 2
+        assert cache.misses == 1
+    with SolutionCache(db_path=db_path) as cache:
+        assert cache.get_solutions(CARTEBLANCHE_PUZZLE_SPEC) == \
+               solve_with_graph_solver(CARTEBLANCHE_PUZZLE_SPEC).solutions
+        assert cache.misses == 0
+        assert cache.hits == 1
+
+
+def test_rejects_non_positive_capacity() -> None:
+    with pytest.raises(ValueError):
+        SolutionCache(capacity=0)
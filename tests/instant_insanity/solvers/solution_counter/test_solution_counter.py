@@ -0,0 +1,50 @@
+import random
+from collections import Counter
+
+import pytest
+
+from instant_insanity.core.general_puzzle import GeneralPuzzle, mk_random_general_puzzle_spec
+from instant_insanity.core.puzzle import Puzzle, PuzzleSpec, CARTEBLANCHE_PUZZLE_SPEC, WINNING_MOVES_PUZZLE_SPEC
+from instant_insanity.solvers.general_solver import GeneralGraphSolver
+from instant_insanity.solvers.graph_solver import GraphSolver, NullTraceSink
+from instant_insanity.solvers.solution_counter import count_general_solutions, count_solutions, \
+    mk_solution_count_histogram
+
+from random_puzzle_specs import RANDOM_PUZZLE_SPECS
+
+
+# a puzzle with the most solutions, since every cube axis joins a colour to itself
+MANY_SOLUTIONS_PUZZLE_SPEC: PuzzleSpec = ['BBBBBB', 'GGGGGG', 'OOOOOO', 'PPPPPP']
+
+
+@pytest.mark.parametrize(
+    "puzzle_spec",
+    [CARTEBLANCHE_PUZZLE_SPEC, WINNING_MOVES_PUZZLE_SPEC, MANY_SOLUTIONS_PUZZLE_SPEC] + RANDOM_PUZZLE_SPECS
+)
+def test_same_count_as_graph_solver(puzzle_spec: PuzzleSpec) -> None:
+    graph_solver: GraphSolver = GraphSolver(Puzzle(puzzle_spec))
+    graph_solver.solve()
+    assert count_solutions(Puzzle(puzzle_spec)) == len(graph_solver.solutions)
+    assert GraphSolver(Puzzle(puzzle_spec), NullTraceSink()).count_solutions() == len(graph_solver.solutions)
+
+
+@pytest.mark.parametrize("n_cubes", [3, 5, 7, 9])
+@pytest.mark.parametrize("seed", range(10))
+def test_same_count_as_general_solver(n_cubes: int, seed: int) -> None:
+    puzzle: GeneralPuzzle = GeneralPuzzle(mk_random_general_puzzle_spec(n_cubes, random.Random(seed)))
+    assert count_general_solutions(puzzle) == GeneralGraphSolver(puzzle).count_solutions()
+
+
+def test_most_solutions() -> None:
+    assert count_solutions(Puzzle(MANY_SOLUTIONS_PUZZLE_SPEC)) == 648
+
+
+def test_wrong_number_of_colours_has_no_solutions() -> None:
+    assert count_solutions(Puzzle(['BGRBGR', 'BGRBGR', 'BGRBGR', 'BGRBGR'])) == 0
+    assert count_general_solutions(GeneralPuzzle(['AAAAAA', 'BBBBBB', 'AAAAAA'])) == 0
+
+
+def test_histogram() -> None:
+    histogram: Counter[int] = mk_solution_count_histogram(iter([CARTEBLANCHE_PUZZLE_SPEC, WINNING_MOVES_PUZZLE_SPEC,
+                                                                 CARTEBLANCHE_PUZZLE_SPEC]))
+    assert histogram == Counter({2: 2, 1: 1})